@@ -1,10 +1,26 @@
 DROP INDEX IF EXISTS ix_movie_id;
 DROP INDEX IF EXISTS ix_movie_imdb_id;
+DROP INDEX IF EXISTS ix_movie_title_id;
+DROP INDEX IF EXISTS ix_movie_title_prefix;
+DROP INDEX IF EXISTS ix_movie_title_trgm;
+DROP INDEX IF EXISTS ix_movie_search_vector;
+DROP INDEX IF EXISTS ix_movie_year_id;
+DROP INDEX IF EXISTS ix_movie_type_year_id;
+DROP INDEX IF EXISTS ix_movie_imdb_rating_id;
+DROP INDEX IF EXISTS ix_movie_metascore_id;
+DROP INDEX IF EXISTS ix_movie_imdb_votes_id;
+DROP INDEX IF EXISTS ix_movie_runtime_minutes_id;
+DROP INDEX IF EXISTS ix_movie_box_office_cents_id;
+DROP INDEX IF EXISTS ix_rating_source_score;
+DROP TABLE IF EXISTS movie_genre;
+DROP TABLE IF EXISTS movie_person;
 DROP TABLE IF EXISTS rating;
 DROP TABLE IF EXISTS movie;
 DROP TABLE IF EXISTS member;
 
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE IF NOT EXISTS movie (
     id SERIAL PRIMARY KEY,
     title VARCHAR NOT NULL,
@@ -29,24 +45,121 @@ CREATE TABLE IF NOT EXISTS movie (
     dvd VARCHAR,
     box_office VARCHAR,
     production VARCHAR,
-    website VARCHAR
+    website VARCHAR,
+    runtime_minutes INTEGER,
+    box_office_cents BIGINT,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(actors, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(plot, '')), 'C')
+    ) STORED
 );
 
 CREATE INDEX IF NOT EXISTS ix_movie_id ON movie(id);
 CREATE INDEX IF NOT EXISTS ix_movie_imdb_id ON movie(imdb_id);
+CREATE INDEX IF NOT EXISTS ix_movie_title_id ON movie(title, id);
+CREATE INDEX IF NOT EXISTS ix_movie_title_prefix ON movie(lower(title) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_movie_title_trgm ON movie USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_movie_search_vector ON movie USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_movie_year_id ON movie(year, id);
+CREATE INDEX IF NOT EXISTS ix_movie_type_year_id ON movie(type, year, id);
+CREATE INDEX IF NOT EXISTS ix_movie_imdb_rating_id ON movie(imdb_rating DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_metascore_id ON movie(metascore DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_imdb_votes_id ON movie(imdb_votes DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_runtime_minutes_id
+    ON movie(runtime_minutes DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_box_office_cents_id
+    ON movie(box_office_cents DESC NULLS LAST, id DESC);
+
+-- One row per genre, director and actor of every movie, so they are filtered with index seeks
+CREATE TABLE IF NOT EXISTS movie_genre (
+    genre VARCHAR NOT NULL,
+    movie_id INTEGER NOT NULL REFERENCES movie(id) ON DELETE CASCADE,
+    PRIMARY KEY (genre, movie_id)
+);
+CREATE INDEX IF NOT EXISTS ix_movie_genre_movie_id ON movie_genre(movie_id);
+
+CREATE TABLE IF NOT EXISTS movie_person (
+    role VARCHAR NOT NULL,
+    name VARCHAR NOT NULL,
+    movie_id INTEGER NOT NULL REFERENCES movie(id) ON DELETE CASCADE,
+    PRIMARY KEY (role, name, movie_id)
+);
+CREATE INDEX IF NOT EXISTS ix_movie_person_movie_id ON movie_person(movie_id);
+
+-- Every write path (single inserts, bulk upserts and COPY loads) goes through this trigger
+CREATE OR REPLACE FUNCTION sync_movie_facets() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM movie_genre WHERE movie_id = NEW.id;
+        DELETE FROM movie_person WHERE movie_id = NEW.id;
+    END IF;
+    INSERT INTO movie_genre (genre, movie_id)
+    SELECT DISTINCT lower(trim(name)), NEW.id
+    FROM unnest(string_to_array(NEW.genre, ',')) AS name
+    WHERE trim(name) <> ''
+    ON CONFLICT DO NOTHING;
+    INSERT INTO movie_person (role, name, movie_id)
+    SELECT DISTINCT people.role, lower(trim(people.name)), NEW.id
+    FROM (
+        SELECT 'director' AS role, unnest(string_to_array(NEW.director, ',')) AS name
+        UNION ALL
+        SELECT 'actor' AS role, unnest(string_to_array(NEW.actors, ',')) AS name
+    ) AS people
+    WHERE trim(people.name) <> ''
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movie_facets ON movie;
+CREATE TRIGGER movie_facets AFTER INSERT OR UPDATE OF genre, director, actors ON movie
+FOR EACH ROW EXECUTE FUNCTION sync_movie_facets();
+
+-- Tells the listening app processes which movies changed, once per statement. The notifications
+-- are delivered when the transaction commits. Too many ids for a payload are sent as '*'.
+CREATE OR REPLACE FUNCTION notify_movie_changes() RETURNS trigger AS $$
+DECLARE
+    changed_ids TEXT;
+BEGIN
+    SELECT CASE WHEN count(*) > 500 THEN '*' ELSE string_agg(id::text, ',') END
+    INTO changed_ids FROM changed_movies;
+    IF changed_ids IS NOT NULL THEN
+        PERFORM pg_notify('catalog_changes', changed_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow a single event per trigger
+DROP TRIGGER IF EXISTS movie_changes_insert ON movie;
+CREATE TRIGGER movie_changes_insert AFTER INSERT ON movie
+REFERENCING NEW TABLE AS changed_movies
+FOR EACH STATEMENT EXECUTE FUNCTION notify_movie_changes();
+DROP TRIGGER IF EXISTS movie_changes_update ON movie;
+CREATE TRIGGER movie_changes_update AFTER UPDATE ON movie
+REFERENCING NEW TABLE AS changed_movies
+FOR EACH STATEMENT EXECUTE FUNCTION notify_movie_changes();
+DROP TRIGGER IF EXISTS movie_changes_delete ON movie;
+CREATE TRIGGER movie_changes_delete AFTER DELETE ON movie
+REFERENCING OLD TABLE AS changed_movies
+FOR EACH STATEMENT EXECUTE FUNCTION notify_movie_changes();
 
 CREATE TABLE IF NOT EXISTS rating (
     id SERIAL PRIMARY KEY,
     movie_id INTEGER REFERENCES movie(id) ON DELETE CASCADE,
     source TEXT,
     value TEXT,
+    score DOUBLE PRECISION,
     UNIQUE(movie_id, source, value)
 );
+CREATE INDEX IF NOT EXISTS ix_rating_source_score ON rating(source, score, movie_id);
 
 CREATE TABLE IF NOT EXISTS member (
     id SERIAL PRIMARY KEY,
     username VARCHAR NOT NULL,
     hashed_password VARCHAR NOT NULL,
     is_admin BOOLEAN NOT NULL,
+    tokens_valid_after TIMESTAMPTZ,
     CONSTRAINT username_unique UNIQUE (username)
 );
\ No newline at end of file
@@ -0,0 +1,73 @@
+-- Adds the structured filters and sorts to an existing database without losing its data, and
+-- fills the genres and people of the movies already stored. It can be run again safely.
+CREATE INDEX IF NOT EXISTS ix_movie_year_id ON movie(year, id);
+CREATE INDEX IF NOT EXISTS ix_movie_type_year_id ON movie(type, year, id);
+CREATE INDEX IF NOT EXISTS ix_movie_imdb_rating_id ON movie(imdb_rating DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_metascore_id ON movie(metascore DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_imdb_votes_id ON movie(imdb_votes DESC NULLS LAST, id DESC);
+
+CREATE TABLE IF NOT EXISTS movie_genre (
+    genre VARCHAR NOT NULL,
+    movie_id INTEGER NOT NULL REFERENCES movie(id) ON DELETE CASCADE,
+    PRIMARY KEY (genre, movie_id)
+);
+CREATE INDEX IF NOT EXISTS ix_movie_genre_movie_id ON movie_genre(movie_id);
+
+CREATE TABLE IF NOT EXISTS movie_person (
+    role VARCHAR NOT NULL,
+    name VARCHAR NOT NULL,
+    movie_id INTEGER NOT NULL REFERENCES movie(id) ON DELETE CASCADE,
+    PRIMARY KEY (role, name, movie_id)
+);
+CREATE INDEX IF NOT EXISTS ix_movie_person_movie_id ON movie_person(movie_id);
+
+-- Same trigger as scripts/database_creation.sql
+CREATE OR REPLACE FUNCTION sync_movie_facets() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM movie_genre WHERE movie_id = NEW.id;
+        DELETE FROM movie_person WHERE movie_id = NEW.id;
+    END IF;
+    INSERT INTO movie_genre (genre, movie_id)
+    SELECT DISTINCT lower(trim(name)), NEW.id
+    FROM unnest(string_to_array(NEW.genre, ',')) AS name
+    WHERE trim(name) <> ''
+    ON CONFLICT DO NOTHING;
+    INSERT INTO movie_person (role, name, movie_id)
+    SELECT DISTINCT people.role, lower(trim(people.name)), NEW.id
+    FROM (
+        SELECT 'director' AS role, unnest(string_to_array(NEW.director, ',')) AS name
+        UNION ALL
+        SELECT 'actor' AS role, unnest(string_to_array(NEW.actors, ',')) AS name
+    ) AS people
+    WHERE trim(people.name) <> ''
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movie_facets ON movie;
+CREATE TRIGGER movie_facets AFTER INSERT OR UPDATE OF genre, director, actors ON movie
+FOR EACH ROW EXECUTE FUNCTION sync_movie_facets();
+
+-- The movies stored before the trigger existed
+INSERT INTO movie_genre (genre, movie_id)
+SELECT DISTINCT lower(trim(name)), movie.id
+FROM movie, unnest(string_to_array(movie.genre, ',')) AS name
+WHERE trim(name) <> ''
+ON CONFLICT DO NOTHING;
+
+INSERT INTO movie_person (role, name, movie_id)
+SELECT DISTINCT people.role, lower(trim(people.name)), people.movie_id
+FROM (
+    SELECT 'director' AS role, unnest(string_to_array(director, ',')) AS name, id AS movie_id
+    FROM movie
+    UNION ALL
+    SELECT 'actor' AS role, unnest(string_to_array(actors, ',')) AS name, id AS movie_id
+    FROM movie
+) AS people
+WHERE trim(people.name) <> ''
+ON CONFLICT DO NOTHING;
+
+ANALYZE movie_genre;
+ANALYZE movie_person;
@@ -0,0 +1,11 @@
+-- Adds the numeric columns to an existing database without losing its data.
+-- Fill them afterwards with: python -m app.backfill
+ALTER TABLE movie ADD COLUMN IF NOT EXISTS runtime_minutes INTEGER;
+ALTER TABLE movie ADD COLUMN IF NOT EXISTS box_office_cents BIGINT;
+ALTER TABLE rating ADD COLUMN IF NOT EXISTS score DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS ix_movie_runtime_minutes_id
+    ON movie(runtime_minutes DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_movie_box_office_cents_id
+    ON movie(box_office_cents DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ix_rating_source_score ON rating(source, score, movie_id);
@@ -0,0 +1,2 @@
+-- Adds the revocation of tokens to an existing database without losing its data.
+ALTER TABLE member ADD COLUMN IF NOT EXISTS tokens_valid_after TIMESTAMPTZ;
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+
+from logger import logger
+from repositories.database.movie import MovieDatabaseRepository
+from repositories.database.session_factory import get_session, EngineManager
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def backfill(batch_size: int):
+    """
+    Fills the numeric columns parsed from the text ones for every stored movie, one committed
+    batch at a time. It can be stopped and run again at any moment.
+    :param batch_size: Number of movies updated per transaction.
+    """
+    async for session in get_session():
+        after_id = 0
+        while (
+            last_id := await MovieDatabaseRepository.backfill_numeric_columns(
+                session=session, after_id=after_id, limit=batch_size
+            )
+        ) is not None:
+            logger.info(f"Numeric columns backfilled up to the movie {last_id}")
+            after_id = last_id
+    MovieDatabaseRepository.invalidate_counts()
+    await EngineManager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Parses runtime_minutes, box_office_cents and the rating scores of the movies stored "
+            "before these columns existed. Run scripts/numeric_columns.sql first."
+        )
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Movies updated per transaction.",
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import json
+import os
+
+from fastapi import status
+
+from config import MAX_TOTAL_PAGES, INGEST_BATCH_SIZE
+from exceptions.omdb_repository_exceptions import OmdbRepositoryException
+from logger import logger
+from repositories.database.session_factory import get_session, EngineManager
+from repositories.external.omdb import OmdbRepository, RequestScheduler
+from services.ingest import IngestPipeline
+
+DEFAULT_CHECKPOINT_PATH = "ingest_checkpoint.jsonl"
+
+
+class IngestCheckpoint:
+    """
+    Progress of a bulk ingest. Every committed batch and every completed search term is appended
+    to a JSON lines file, so an interrupted run resumes without fetching them again.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the checkpoint file, it's created if it doesn't exist.
+        """
+        self.path = path
+        self.completed_terms: set[str] = set()
+        self.ingested_imdb_ids: set[str] = set()
+        if os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    if line.strip():
+                        self._apply(json.loads(line))
+
+    def _apply(self, entry: dict):
+        if "term" in entry:
+            self.completed_terms.add(entry["term"])
+        self.ingested_imdb_ids.update(entry.get("imdb_ids", []))
+
+    def _append(self, entry: dict):
+        with open(self.path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._apply(entry)
+
+    def mark_ingested(self, imdb_ids: list[str]):
+        """Records the imdb_ids of a committed batch."""
+        self._append({"imdb_ids": imdb_ids})
+
+    def mark_term_completed(self, search_term: str):
+        """Records a search term whose movies are all ingested."""
+        self._append({"term": search_term})
+
+
+async def ingest(
+    search_terms: list[str],
+    checkpoint: IngestCheckpoint,
+    max_pages: int,
+    quota: int | None,
+    batch_size: int = INGEST_BATCH_SIZE,
+):
+    """
+    Ingests the movies of every search term that is not completed yet.
+    :param search_terms: Terms to search within movie titles.
+    :param checkpoint: Progress of previous runs, it's updated while ingesting.
+    :param max_pages: Maximum number of search pages to fetch for every search term.
+    :param quota: Maximum number of requests to send to OMDB in this run.
+    :param batch_size: Number of movies committed at once, large batches are loaded with COPY.
+    """
+    pending_terms = [term for term in search_terms if term not in checkpoint.completed_terms]
+    logger.info(
+        f"Ingesting {len(pending_terms)} of {len(search_terms)} search terms, "
+        f"{len(checkpoint.ingested_imdb_ids)} movies already ingested"
+    )
+    async with OmdbRepository.create_client() as client:
+        OmdbRepository.set_client(client=client)
+        OmdbRepository.set_scheduler(RequestScheduler(request_budget=quota))
+        async for session in get_session():
+            for search_term in pending_terms:
+                failed_status_codes: list[int] = []
+                pipeline = IngestPipeline(
+                    session=session,
+                    max_pages=max_pages,
+                    batch_size=batch_size,
+                    skip_imdb_ids=checkpoint.ingested_imdb_ids,
+                    on_batch_written=checkpoint.mark_ingested,
+                )
+                try:
+                    report = await pipeline.run(search_terms=[search_term])
+                    failed_status_codes.extend(failure.status_code for failure in report.failures)
+                except* OmdbRepositoryException as error_group:
+                    failed_status_codes.extend(
+                        error.status_code for error in error_group.exceptions
+                    )
+
+                if status.HTTP_429_TOO_MANY_REQUESTS in failed_status_codes:
+                    logger.warning("The OMDB quota is spent, run the command again to resume")
+                    break
+                # A term without results or with missing movies won't improve on the next run
+                if any(code != status.HTTP_404_NOT_FOUND for code in failed_status_codes):
+                    logger.warning(f"Search term {search_term} is incomplete, it will be resumed")
+                    continue
+                checkpoint.mark_term_completed(search_term)
+                logger.info(f"Search term {search_term} completed")
+        OmdbRepository.set_client(client=None)
+    await EngineManager.dispose()
+
+
+def read_search_terms(terms: list[str] | None, terms_file: str | None) -> list[str]:
+    """
+    Collects the search terms from the arguments and from a file with one term per line.
+    Empty lines and lines starting with # are ignored.
+    """
+    search_terms: list[str] = list(terms or [])
+    if terms_file:
+        with open(terms_file) as file:
+            search_terms.extend(
+                line.strip() for line in file if line.strip() and not line.startswith("#")
+            )
+    # Keep the order but remove duplicates
+    return list(dict.fromkeys(search_terms))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingests the OMDB movies found for many search terms, resuming previous runs."
+    )
+    parser.add_argument("--terms", nargs="*", help="Search terms to ingest.")
+    parser.add_argument("--terms-file", help="File with one search term per line.")
+    parser.add_argument(
+        "--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Path of the checkpoint file."
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=MAX_TOTAL_PAGES,
+        help="Maximum number of search pages (10 results each) to fetch for every term.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=INGEST_BATCH_SIZE,
+        help="Movies committed at once, batches over INGEST_COPY_THRESHOLD are loaded with COPY.",
+    )
+    parser.add_argument(
+        "--quota", type=int, default=None, help="Maximum number of requests to send to OMDB."
+    )
+    args = parser.parse_args()
+
+    search_terms = read_search_terms(terms=args.terms, terms_file=args.terms_file)
+    if not search_terms:
+        parser.error("Provide at least one search term with --terms or --terms-file")
+    asyncio.run(
+        ingest(
+            search_terms=search_terms,
+            checkpoint=IngestCheckpoint(path=args.checkpoint),
+            max_pages=args.max_pages,
+            quota=args.quota,
+            batch_size=args.batch_size,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
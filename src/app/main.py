@@ -4,9 +4,12 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from app.initialization import populate_data
+from core.security import password_hasher
 from exceptions.omdb_repository_exceptions import OmdbRepositoryException
 from logger import logger
-from repositories.database.session_factory import get_session
+from repositories.database.notifications import catalog_listener
+from repositories.database.session_factory import get_session, EngineManager
+from repositories.external.omdb import OmdbRepository
 from routers.movie import router as movie_router
 from routers.user import router as user_router
 from routers.health import router as health_router
@@ -16,9 +19,20 @@ from routers.health import router as health_router
 async def startup(app: FastAPI):
     """App startup logic"""
     logger.info("Starting the app.")
-    async for session in get_session():
-        await populate_data(session=session)
-    yield
+    await EngineManager.warm_up()
+    catalog_listener.start()
+    try:
+        async with OmdbRepository.create_client() as client:
+            OmdbRepository.set_client(client=client)
+            async for session in get_session():
+                await populate_data(session=session)
+            yield
+            logger.info("Shutting down the app.")
+            OmdbRepository.set_client(client=None)
+    finally:
+        await catalog_listener.stop()
+        await EngineManager.dispose()
+        password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=startup)
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi import FastAPI, Query, status
+from fastapi.responses import JSONResponse
+
+from config import MOVIES_SEARCH_TERM, RESULTS_PER_PAGE, TYPE_MOVIE
+from repositories.external.omdb_cache import OMDB_NOT_FOUND_ERROR
+
+RATE_LIMIT_ERROR = "Request limit reached!"
+_WORDS = ("Return", "Rise", "Age", "Dawn", "Legacy", "Revenge", "Origins", "Quest", "Fall", "Saga")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def generate_corpus(size: int, search_terms: list[str], seed: int = 0) -> list[dict]:
+    """
+    Generates movie bodies with the same shape as the ones returned by OMDB.
+    :param size: Number of movies.
+    :param search_terms: Every title contains one of these terms, assigned round-robin.
+    :param seed: Seed of the random values, the same seed generates the same corpus.
+    :return: Bodies of the movies, the imdb_ids are tt0000000, tt0000001...
+    """
+    generator = random.Random(seed)
+    corpus: list[dict] = []
+    for number in range(size):
+        search_term = search_terms[number % len(search_terms)]
+        rating = round(generator.uniform(1, 10), 1)
+        metascore = generator.randint(1, 100)
+        corpus.append(
+            {
+                "Title": f"{search_term}: {generator.choice(_WORDS)} {number}",
+                "Year": str(generator.randint(1950, 2024)),
+                "Rated": generator.choice(("G", "PG", "PG-13", "R", "N/A")),
+                "Released": (
+                    f"{generator.randint(1, 28):02d} {generator.choice(_MONTHS)} "
+                    f"{generator.randint(1950, 2024)}"
+                ),
+                "Runtime": f"{generator.randint(70, 200)} min",
+                "Genre": "Action, Adventure, Sci-Fi",
+                "Director": "Jane Doe",
+                "Writer": "John Doe, Richard Roe",
+                "Actors": "Actor One, Actor Two, Actor Three",
+                "Plot": " ".join(generator.choices(_WORDS, k=30)),
+                "Language": "English",
+                "Country": "United States",
+                "Awards": "N/A",
+                "Poster": f"https://example.com/posters/{number}.jpg",
+                "Ratings": [
+                    {"Source": "Internet Movie Database", "Value": f"{rating}/10"},
+                    {"Source": "Metacritic", "Value": f"{metascore}/100"},
+                ],
+                "Metascore": str(metascore),
+                "imdbRating": str(rating),
+                "imdbVotes": f"{generator.randint(1, 2_000_000):,}",
+                "imdbID": f"tt{number:07d}",
+                "Type": TYPE_MOVIE,
+                "DVD": "N/A",
+                "BoxOffice": f"${generator.randint(1, 900_000_000):,}",
+                "Production": "N/A",
+                "Website": "N/A",
+                "Response": "True",
+            }
+        )
+    return corpus
+
+
+class RateLimiter:
+    """Token bucket that rejects the requests over the limit instead of delaying them."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens: float = capacity
+        self.updated_at = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def create_app(
+    corpus: list[dict],
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    requests_per_second: float | None = None,
+    seed: int = 0,
+) -> FastAPI:
+    """
+    Creates a stand-in of OMDB that answers the s=, i= and t= queries from a corpus.
+    :param corpus: Movie bodies to serve, e.g. from generate_corpus.
+    :param latency: Seconds added to every response.
+    :param jitter: Maximum random seconds added on top of the latency.
+    :param error_rate: Probability of answering with a 503, between 0 and 1.
+    :param requests_per_second: Requests allowed per second, the rest get a 429. No limit if None.
+    :param seed: Seed of the latency jitter and of the errors.
+    :return: The FastAPI app, it can be served with uvicorn or mounted with an ASGITransport.
+    """
+    generator = random.Random(seed)
+    by_imdb_id = {movie["imdbID"]: movie for movie in corpus}
+    by_title = {movie["Title"].lower(): movie for movie in corpus}
+    rate_limiter = (
+        RateLimiter(rate=requests_per_second, capacity=max(int(requests_per_second), 1))
+        if requests_per_second
+        else None
+    )
+    app = FastAPI(title="Fake OMDB")
+    app.state.requests = 0
+
+    def error(status_code: int, message: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=status_code, content={"Response": "False", "Error": message}
+        )
+
+    @app.get("/")
+    async def omdb(
+        s: str | None = None,
+        i: str | None = None,
+        t: str | None = None,
+        page: int = Query(default=1, ge=1),
+    ):
+        app.state.requests += 1
+        if latency or jitter:
+            await asyncio.sleep(latency + generator.uniform(0, jitter))
+        if rate_limiter and not rate_limiter.allow():
+            return error(status.HTTP_429_TOO_MANY_REQUESTS, RATE_LIMIT_ERROR)
+        if generator.random() < error_rate:
+            return error(status.HTTP_503_SERVICE_UNAVAILABLE, "Service unavailable")
+
+        if s is not None:
+            matches = [movie for movie in corpus if s.lower() in movie["Title"].lower()]
+            start = (page - 1) * RESULTS_PER_PAGE
+            if start >= len(matches):
+                return error(status.HTTP_200_OK, OMDB_NOT_FOUND_ERROR)
+            return {
+                "Search": [
+                    {key: movie[key] for key in ("Title", "Year", "imdbID", "Type", "Poster")}
+                    for movie in matches[start : start + RESULTS_PER_PAGE]
+                ],
+                "totalResults": str(len(matches)),
+                "Response": "True",
+            }
+        movie = by_imdb_id.get(i) if i is not None else by_title.get((t or "").lower())
+        if movie is None:
+            return error(status.HTTP_200_OK, OMDB_NOT_FOUND_ERROR)
+        return movie
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serves a local stand-in of the OMDB API.")
+    parser.add_argument("--port", type=int, default=8001, help="Port to listen on.")
+    parser.add_argument("--movies", type=int, default=1000, help="Size of the generated corpus.")
+    parser.add_argument(
+        "--terms", nargs="*", default=[MOVIES_SEARCH_TERM], help="Terms found in the titles."
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503.")
+    parser.add_argument("--rps", type=float, default=None, help="Requests per second allowed.")
+    args = parser.parse_args()
+
+    app = create_app(
+        corpus=generate_corpus(size=args.movies, search_terms=args.terms),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        requests_per_second=args.rps,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
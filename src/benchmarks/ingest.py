@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Awaitable, Callable
+
+from httpx import AsyncBaseTransport, ASGITransport, AsyncClient, Request, Response
+from sqlalchemy import text
+
+from app.main import app
+from benchmarks.fake_omdb import create_app, generate_corpus
+from config import API_V1, MOVIES_SEARCH_TERM, OMDB_MAX_CONCURRENCY
+from core.deps import get_current_user
+from repositories.database.movie import MovieDatabaseRepository
+from repositories.database.session_factory import get_session, EngineManager
+from repositories.external.omdb import OmdbRepository, RequestScheduler
+from schemas.shared.user import UserData
+from services.start import StartService
+
+# Titles of these movies are not found by the seeding search, they are inserted one by one
+INSERT_SEARCH_TERM = "Benchmark"
+
+
+class TimedTransport(AsyncBaseTransport):
+    """Transport that records how long every request takes."""
+
+    def __init__(self, transport: AsyncBaseTransport):
+        self.transport = transport
+        self.latencies: list[float] = []
+
+    async def handle_async_request(self, request: Request) -> Response:
+        started_at = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.latencies.append(time.perf_counter() - started_at)
+        return response
+
+
+class BenchmarkResult:
+    """Throughput, latency percentiles and peak memory of a scenario."""
+
+    def __init__(self, name: str, movies: int, elapsed: float, latencies: list[float], peak: int):
+        self.name = name
+        self.movies = movies
+        self.elapsed = elapsed
+        self.latencies = latencies
+        self.peak = peak
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percent - 1]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.movies} movies in {self.elapsed:.2f}s "
+            f"({self.movies / self.elapsed if self.elapsed else 0:.1f} movies/s), "
+            f"p50 {self.percentile(50) * 1000:.1f} ms, p99 {self.percentile(99) * 1000:.1f} ms "
+            f"over {len(self.latencies)} requests, peak memory {self.peak / 2**20:.1f} MiB"
+        )
+
+
+async def measure(name: str, scenario: Callable[[], Awaitable[tuple[int, list[float]]]]):
+    """
+    Runs a scenario tracking the memory allocated meanwhile.
+    :param name: Name of the scenario.
+    :param scenario: Coroutine function returning the movies stored and the request latencies.
+    :return: Result of the scenario.
+    """
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    try:
+        movies, latencies = await scenario()
+        elapsed = time.perf_counter() - started_at
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(
+        name=name, movies=movies, elapsed=elapsed, latencies=latencies, peak=peak
+    )
+
+
+async def reset_database():
+    """Removes every movie and user, only for throwaway databases."""
+    async for session in get_session():
+        await session.execute(text("TRUNCATE movie, rating, member RESTART IDENTITY CASCADE"))
+        await session.commit()
+
+
+async def seed(omdb_transport: TimedTransport) -> tuple[int, list[float]]:
+    """Seeds the empty database through StartService.save_initial_data."""
+    async for session in get_session():
+        if await MovieDatabaseRepository.count(session=session):
+            raise RuntimeError("The database must be empty, use --reset with a throwaway database")
+        await StartService.save_initial_data(session=session)
+        return await MovieDatabaseRepository.count(session=session), omdb_transport.latencies
+
+
+async def insert(titles: list[str], concurrency: int) -> tuple[int, list[float]]:
+    """Inserts every title through POST /api/v1/movies, with the given concurrent requests."""
+    app.dependency_overrides[get_current_user] = lambda: UserData(
+        username="benchmark", hashed_password="", is_admin=True
+    )
+    transport = TimedTransport(ASGITransport(app=app))
+    pending = iter(titles)
+    inserted: list[str] = []
+
+    async def worker(client: AsyncClient):
+        for title in pending:
+            response = await client.post(f"/api/{API_V1}/movies", json={"title": title})
+            if response.status_code == 201:
+                inserted.append(title)
+
+    try:
+        async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(concurrency):
+                    task_group.create_task(worker(client))
+    finally:
+        app.dependency_overrides.clear()
+    return len(inserted), transport.latencies
+
+
+async def run(args: argparse.Namespace):
+    corpus = generate_corpus(
+        size=args.movies, search_terms=[MOVIES_SEARCH_TERM, INSERT_SEARCH_TERM]
+    )
+    fake_omdb = create_app(
+        corpus=corpus,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        requests_per_second=args.omdb_rps,
+    )
+    omdb_transport = TimedTransport(ASGITransport(app=fake_omdb))
+    if args.reset:
+        await reset_database()
+
+    async with AsyncClient(transport=omdb_transport) as client:
+        OmdbRepository.set_client(client=client)
+        # Every request must reach the fake OMDB to measure the full path
+        OmdbRepository.set_cache(None)
+        OmdbRepository.set_scheduler(
+            RequestScheduler(
+                max_concurrency=args.concurrency,
+                requests_per_second=args.client_rps,
+                burst_size=args.concurrency,
+            )
+        )
+        results = [await measure("save_initial_data", lambda: seed(omdb_transport))]
+        titles = [movie["Title"] for movie in corpus if INSERT_SEARCH_TERM in movie["Title"]]
+        results.append(
+            await measure(
+                "POST /movies",
+                lambda: insert(titles[: args.inserts], concurrency=args.insert_concurrency),
+            )
+        )
+        OmdbRepository.set_client(client=None)
+    await EngineManager.dispose()
+
+    for result in results:
+        print(result)
+    print(f"fake OMDB answered {fake_omdb.state.requests} requests")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "End-to-end ingest benchmark against a local stand-in of OMDB. It needs the database "
+            "of the app, use a throwaway one."
+        )
+    )
+    parser.add_argument("--reset", action="store_true", help="Empty the database before running.")
+    parser.add_argument("--movies", type=int, default=1000, help="Size of the fake OMDB corpus.")
+    parser.add_argument("--inserts", type=int, default=200, help="Titles inserted one by one.")
+    parser.add_argument("--insert-concurrency", type=int, default=10, help="Concurrent inserts.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per OMDB response.")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Maximum extra random seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503.")
+    parser.add_argument("--omdb-rps", type=float, default=None, help="Rate limit of the fake OMDB.")
+    parser.add_argument(
+        "--concurrency", type=int, default=OMDB_MAX_CONCURRENCY, help="Concurrent OMDB requests."
+    )
+    parser.add_argument(
+        "--client-rps", type=float, default=1000, help="Requests per second sent to OMDB."
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from core.security import PasswordHasher, Security, EXECUTOR_PROCESS, EXECUTOR_THREAD
+
+PASSWORD = "1234"
+
+
+def create_app(hashed_password: str, hasher: PasswordHasher | None) -> FastAPI:
+    """
+    Serves a login that verifies a bcrypt password and a cheap read.
+    :param hashed_password: Hash the logins are verified against.
+    :param hasher: Hasher of the logins, None verifies them in the event loop as it used to be.
+    """
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login() -> dict:
+        if hasher is None:
+            return {"valid": Security.verify_password(PASSWORD, hashed_password)}
+        return {"valid": await hasher.verify(PASSWORD, hashed_password)}
+
+    @app.get("/read")
+    async def read() -> dict:
+        return {"id": 1, "title": "Spiderman"}
+
+    return app
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[percent - 1]
+
+
+async def storm(
+    app: FastAPI, logins: int, concurrency: int, duration: float, read_interval: float
+) -> str:
+    """
+    Reads on a fixed schedule while a burst of concurrent logins is sent. The latency of a read
+    counts from the moment it was due, so the time the event loop was blocked before sending it
+    is measured too.
+    :param app: App under test.
+    :param logins: Logins sent in total, 0 only measures the reads.
+    :param concurrency: Logins in flight at the same time.
+    :param duration: Seconds the reads run at least.
+    :param read_interval: Seconds between two reads.
+    :return: Summary of the read latencies and of the logins.
+    """
+    read_latencies: list[float] = []
+    login_statuses: list[int] = []
+    pending = iter(range(logins))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def login_worker():
+            for _ in pending:
+                login_statuses.append((await client.post("/login")).status_code)
+
+        async def reader():
+            due_at = time.perf_counter()
+            finishes_at = due_at + duration
+            while due_at < finishes_at or len(login_statuses) < logins:
+                await asyncio.sleep(max(due_at - time.perf_counter(), 0))
+                (await client.get("/read")).raise_for_status()
+                read_latencies.append(time.perf_counter() - due_at)
+                # The reads missed while blocked are not sent afterwards, the late one counts them
+                due_at = max(due_at + read_interval, time.perf_counter())
+
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(reader())
+            for _ in range(concurrency):
+                task_group.create_task(login_worker())
+
+    accepted = login_statuses.count(status.HTTP_200_OK)
+    rejected = login_statuses.count(status.HTTP_503_SERVICE_UNAVAILABLE)
+    return (
+        f"reads p50 {percentile(read_latencies, 50) * 1000:.1f} ms, "
+        f"p99 {percentile(read_latencies, 99) * 1000:.1f} ms, "
+        f"max {max(read_latencies) * 1000:.1f} ms over {len(read_latencies)} reads; "
+        f"logins {accepted} accepted, {rejected} rejected"
+    )
+
+
+async def run(args: argparse.Namespace):
+    hashed_password = Security.get_password_hash(PASSWORD)
+    hashers = {
+        executor: PasswordHasher(
+            workers=args.workers, queue_size=args.queue_size, executor=executor
+        )
+        for executor in (EXECUTOR_THREAD, EXECUTOR_PROCESS)
+    }
+    scenarios = {
+        "no logins": (create_app(hashed_password, hasher=None), 0),
+        "logins in the event loop": (create_app(hashed_password, hasher=None), args.logins),
+        **{
+            f"logins in {executor} workers": (
+                create_app(hashed_password, hasher=hasher),
+                args.logins,
+            )
+            for executor, hasher in hashers.items()
+        },
+    }
+    for name, (app, logins) in scenarios.items():
+        result = await storm(
+            app,
+            logins=logins,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            read_interval=args.read_interval,
+        )
+        print(f"{name}: {result}")
+    for hasher in hashers.values():
+        print(f"hasher: {hasher.stats()}")
+        hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Latency of cheap reads during a burst of bcrypt logins, verified in the event loop "
+            "and in the thread and process workers of PasswordHasher."
+        )
+    )
+    parser.add_argument("--logins", type=int, default=40, help="Logins sent in the burst.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Logins in flight at once.")
+    parser.add_argument("--duration", type=float, default=2, help="Minimum seconds of reads.")
+    parser.add_argument(
+        "--read-interval", type=float, default=0.005, help="Seconds between two reads."
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Workers of the hasher.")
+    parser.add_argument("--queue-size", type=int, default=32, help="Queue of the hasher.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
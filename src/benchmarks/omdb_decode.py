@@ -0,0 +1,74 @@
+import argparse
+import json
+import timeit
+
+import orjson
+
+from schemas.responses.omdb import MovieImdbResponse
+
+SAMPLE_BODY = {
+    "Title": "Avengers: Endgame",
+    "Year": "2019",
+    "Rated": "PG-13",
+    "Released": "26 Apr 2019",
+    "Runtime": "181 min",
+    "Genre": "Action, Adventure, Drama",
+    "Director": "Anthony Russo, Joe Russo",
+    "Writer": "Christopher Markus, Stephen McFeely, Stan Lee",
+    "Actors": "Robert Downey Jr., Chris Evans, Mark Ruffalo",
+    "Plot": "After the devastating events of Avengers: Infinity War, the universe is in ruins.",
+    "Language": "English, Japanese, Xhosa, German",
+    "Country": "United States",
+    "Awards": "Nominated for 1 Oscar. 70 wins & 133 nominations total",
+    "Poster": "https://m.media-amazon.com/images/M/MV5BMTc5MDE2ODcwNV5BMl5BanBnXkFtZTgwMzI2NzQ2NzM@.jpg",
+    "Ratings": [
+        {"Source": "Internet Movie Database", "Value": "8.4/10"},
+        {"Source": "Rotten Tomatoes", "Value": "94%"},
+        {"Source": "Metacritic", "Value": "78/100"},
+    ],
+    "Metascore": "78",
+    "imdbRating": "8.4",
+    "imdbVotes": "1,339,749",
+    "imdbID": "tt4154796",
+    "Type": "movie",
+    "DVD": "N/A",
+    "BoxOffice": "$858,373,000",
+    "Production": "N/A",
+    "Website": "N/A",
+    "Response": "True",
+}
+
+
+def decode_baseline(content: bytes) -> MovieImdbResponse:
+    """Decode path used before: stdlib JSON parser and the field validators."""
+    return MovieImdbResponse.model_validate(json.loads(content))
+
+
+def decode_fast(content: bytes) -> MovieImdbResponse:
+    """Decode path used by OmdbRepository."""
+    return MovieImdbResponse.from_omdb(orjson.loads(content))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark of the OMDB payload decoding.")
+    parser.add_argument("--number", type=int, default=20000, help="Payloads decoded per round.")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds, the best one is reported.")
+    args = parser.parse_args()
+
+    content = json.dumps(SAMPLE_BODY).encode()
+    assert decode_baseline(content) == decode_fast(content)
+
+    results = {}
+    for name, decode in (("baseline", decode_baseline), ("fast", decode_fast)):
+        best = min(
+            timeit.repeat(
+                lambda decode=decode: decode(content), number=args.number, repeat=args.repeat
+            )
+        )
+        results[name] = best / args.number
+        print(f"{name:>8}: {results[name] * 1e6:7.2f} us/movie ({1 / results[name]:,.0f} movies/s)")
+    print(f" speedup: {results['baseline'] / results['fast']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
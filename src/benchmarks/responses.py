@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import time
+
+import orjson
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.fake_omdb import generate_corpus
+from config import ORDER_BY_TITLE, ORDER_TYPE_ASC
+from core.responses import PydanticJSONResponse
+from schemas.responses.movie import MoviesResponse
+from schemas.responses.omdb import MovieImdbResponse
+from schemas.shared.movie import MovieGet
+
+
+def build_page(page_size: int) -> MoviesResponse:
+    """Builds a page of movies like the ones returned by MovieService.get_movies."""
+    movies = [
+        MovieGet.model_validate({**MovieImdbResponse.from_omdb(body).model_dump(), "id": number})
+        for number, body in enumerate(generate_corpus(size=page_size, search_terms=["Movie"]))
+    ]
+    return MoviesResponse(
+        page=1,
+        page_size=page_size,
+        order_by=ORDER_BY_TITLE,
+        order_type=ORDER_TYPE_ASC,
+        total=page_size * 10,
+        movies=movies,
+    )
+
+
+def create_app(page: MoviesResponse) -> FastAPI:
+    """Serves the same page through the default response path and through the fast one."""
+    app = FastAPI()
+
+    @app.get("/baseline")
+    async def baseline() -> MoviesResponse:
+        return page
+
+    @app.get("/fast", response_model=MoviesResponse)
+    async def fast() -> PydanticJSONResponse:
+        return PydanticJSONResponse(content=page)
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> float:
+    """
+    Sends the requests one after the other.
+    :return: Requests per second.
+    """
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - started_at)
+
+
+async def run(page_sizes: list[int], requests: int):
+    for page_size in page_sizes:
+        app = create_app(build_page(page_size))
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            baseline, fast = await client.get("/baseline"), await client.get("/fast")
+            assert orjson.loads(baseline.content) == orjson.loads(fast.content)
+            results = {
+                path: await measure(client, path=f"/{path}", requests=requests)
+                for path in ("baseline", "fast")
+            }
+        print(
+            f"page_size {page_size:>3}: baseline {results['baseline']:,.0f} req/s, "
+            f"fast {results['fast']:,.0f} req/s, "
+            f"speedup {results['fast'] / results['baseline']:.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Requests per second of a movie page served through the default response path "
+            "(response model validation and jsonable_encoder) and through PydanticJSONResponse."
+        )
+    )
+    parser.add_argument(
+        "--page-sizes", type=int, nargs="*", default=[10, 100], help="Movies per page."
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per measure.")
+    args = parser.parse_args()
+    asyncio.run(run(page_sizes=args.page_sizes, requests=args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,31 @@ from os import environ
 # OMDB API
 OMDB_API_KEY: str = environ.get("OMDB_API_KEY")
 OMDB_API_URL: str = environ.get("OMDB_API_URL", default="https://www.omdbapi.com/")
+OMDB_MAX_CONCURRENCY: int = int(environ.get("OMDB_MAX_CONCURRENCY", default=10))
+# A value of 0 disables the rate limit
+OMDB_REQUESTS_PER_SECOND: float = float(environ.get("OMDB_REQUESTS_PER_SECOND", default=20))
+OMDB_BURST_SIZE: int = int(environ.get("OMDB_BURST_SIZE", default=10))
+OMDB_TIMEOUT: float = float(environ.get("OMDB_TIMEOUT", default=10))
+OMDB_CONNECT_TIMEOUT: float = float(environ.get("OMDB_CONNECT_TIMEOUT", default=5))
+OMDB_MAX_CONNECTIONS: int = int(environ.get("OMDB_MAX_CONNECTIONS", default=20))
+OMDB_MAX_KEEPALIVE_CONNECTIONS: int = int(environ.get("OMDB_MAX_KEEPALIVE_CONNECTIONS", default=10))
+OMDB_KEEPALIVE_EXPIRY: float = float(environ.get("OMDB_KEEPALIVE_EXPIRY", default=30))
+# HTTP/2 requires the optional h2 package (pip install httpx[http2])
+OMDB_HTTP2: int = int(environ.get("OMDB_HTTP2", default=0))
+OMDB_CACHE_ENABLED: int = int(environ.get("OMDB_CACHE_ENABLED", default=1))
+OMDB_CACHE_MAX_ENTRIES: int = int(environ.get("OMDB_CACHE_MAX_ENTRIES", default=10000))
+OMDB_CACHE_TTL: float = float(environ.get("OMDB_CACHE_TTL", default=24 * 60 * 60))
+OMDB_CACHE_NEGATIVE_TTL: float = float(environ.get("OMDB_CACHE_NEGATIVE_TTL", default=60 * 60))
+# Path of the SQLite file of the on-disk tier, if not provided only the in-memory tier is used
+OMDB_CACHE_DISK_PATH: str | None = environ.get("OMDB_CACHE_DISK_PATH")
+OMDB_MAX_RETRIES: int = int(environ.get("OMDB_MAX_RETRIES", default=2))
+OMDB_RETRY_BACKOFF_BASE: float = float(environ.get("OMDB_RETRY_BACKOFF_BASE", default=0.2))
+OMDB_RETRY_BACKOFF_MAX: float = float(environ.get("OMDB_RETRY_BACKOFF_MAX", default=5))
+# Seconds to wait before sending a duplicate (hedged) request, a value of 0 disables hedging
+OMDB_HEDGE_DELAY: float = float(environ.get("OMDB_HEDGE_DELAY", default=0))
+# Consecutive failed requests, after their retries, that open the circuit breaker
+OMDB_BREAKER_FAILURE_THRESHOLD: int = int(environ.get("OMDB_BREAKER_FAILURE_THRESHOLD", default=5))
+OMDB_BREAKER_RESET_TIMEOUT: float = float(environ.get("OMDB_BREAKER_RESET_TIMEOUT", default=30))
 # DATABASE CONFIGURATION
 DATABASE_ENDPOINT: str = environ.get("DATABASE_ENDPOINT")
 DATABASE_USER: str = environ.get("DATABASE_USER")
@@ -12,7 +37,41 @@ DATABASE_PORT: str = environ.get("DATABASE_PORT", default=5432)
 DATABASE_NAME: str = environ.get("DATABASE_NAME")
 POOL_SIZE: int = int(environ.get("POOL_SIZE", default=5))
 POOL_MAX_OVERFLOW: int = int(environ.get("POOL_MAX_OVERFLOW", default=0))
+# Connections opened at startup, so the first requests don't pay the connect cost
+POOL_WARM_UP: int = int(environ.get("POOL_WARM_UP", default=POOL_SIZE))
+# Seconds to wait for a pooled connection before failing
+POOL_TIMEOUT: float = float(environ.get("POOL_TIMEOUT", default=30))
+# Prepared statements cached per connection by the asyncpg driver, 0 disables it (e.g. pgbouncer)
+PREPARED_STATEMENT_CACHE_SIZE: int = int(environ.get("PREPARED_STATEMENT_CACHE_SIZE", default=500))
 DATABASE_URL: str = "postgresql+asyncpg://{}:{}@{}:{}/{}"
+# Comma separated SQLAlchemy URLs of the read replicas, the reads use the primary if empty
+DATABASE_REPLICA_URLS: list[str] = [
+    url.strip()
+    for url in environ.get("DATABASE_REPLICA_URLS", default="").split(",")
+    if url.strip()
+]
+# Seconds a failed replica is left out before trying it again
+REPLICA_RETRY_AFTER: float = float(environ.get("REPLICA_RETRY_AFTER", default=30))
+# Seconds the reads of a client go to the primary after a write, so it reads its own writes
+READ_YOUR_WRITES_WINDOW: float = float(environ.get("READ_YOUR_WRITES_WINDOW", default=5))
+# Seconds after a write during which a replica may still serve the previous data
+REPLICATION_LAG: float = READ_YOUR_WRITES_WINDOW if DATABASE_REPLICA_URLS else 0
+INGEST_BATCH_SIZE: int = int(environ.get("INGEST_BATCH_SIZE", default=50))
+INGEST_QUEUE_SIZE: int = int(environ.get("INGEST_QUEUE_SIZE", default=100))
+# Loads with more movies than this are written with COPY instead of multi-row INSERTs
+INGEST_COPY_THRESHOLD: int = int(environ.get("INGEST_COPY_THRESHOLD", default=1000))
+# Seconds an exact count of movies is reused, writes of this instance invalidate it at once
+MOVIE_COUNT_CACHE_TTL: float = float(environ.get("MOVIE_COUNT_CACHE_TTL", default=60))
+# Cache of the movies and of the pages of movies read, keyed by the catalog versions
+MOVIE_CACHE_ENABLED: int = int(environ.get("MOVIE_CACHE_ENABLED", default=1))
+MOVIE_CACHE_MAX_ENTRIES: int = int(environ.get("MOVIE_CACHE_MAX_ENTRIES", default=10000))
+MOVIE_CACHE_TTL: float = float(environ.get("MOVIE_CACHE_TTL", default=10 * 60))
+# URL of a Redis compatible server to keep the cache out of the process, e.g. redis://host:6379/0
+MOVIE_CACHE_URL: str | None = environ.get("MOVIE_CACHE_URL")
+# Cache-Control of the movie reads, the clients revalidate them with their ETag every time
+MOVIE_CACHE_CONTROL: str = environ.get("MOVIE_CACHE_CONTROL", default="private, no-cache")
+# Seconds to wait before listening again to the catalog changes after losing the connection
+CATALOG_LISTENER_RETRY_AFTER: float = float(environ.get("CATALOG_LISTENER_RETRY_AFTER", default=5))
 USE_FALLBACK: int = int(environ.get("USE_FALLBACK", default=0))
 # GOOGLE CLOUD DEPLOYMENT
 DEPLOY_ENVIRON: str = environ.get("DEPLOY_ENVIRON", default="DEV")
@@ -22,6 +81,18 @@ UNIX_SOCKET = f"{DB_SOCKET_PATH}/{DATABASE_ENDPOINT}"
 SECRET_KEY: str = environ.get("SECRET_KEY", default="X1s4GqRfG1lkfhznF0FhIEBqhh2cb8W7gFkzM7z1zjY=")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_TIME_DELTA = timedelta(hours=1)
+# Seconds an authenticated user is reused without reading it again, a revocation or a change of
+# role made by another worker takes effect within this time
+PRINCIPAL_CACHE_TTL: float = float(environ.get("PRINCIPAL_CACHE_TTL", default=60))
+PRINCIPAL_CACHE_MAX_ENTRIES: int = int(environ.get("PRINCIPAL_CACHE_MAX_ENTRIES", default=10000))
+# Processes (or threads) hashing and verifying passwords with bcrypt, out of the event loop
+PASSWORD_HASH_WORKERS: int = int(environ.get("PASSWORD_HASH_WORKERS", default=2))
+# "process" or "thread", threads only help if the bcrypt backend releases the GIL (bcrypt package)
+PASSWORD_HASH_EXECUTOR: str = environ.get("PASSWORD_HASH_EXECUTOR", default="process")
+# Passwords waiting for a free thread at most, over this the logins are answered with a 503
+PASSWORD_HASH_QUEUE_SIZE: int = int(environ.get("PASSWORD_HASH_QUEUE_SIZE", default=32))
+# Seconds sent in the Retry-After header of the logins rejected by a full queue
+PASSWORD_HASH_RETRY_AFTER: int = int(environ.get("PASSWORD_HASH_RETRY_AFTER", default=1))
 # USERS FOR DEMO PURPOSES, IN A PRODUCTION APP IMPLEMENT AN ENDPOINT FOR REGISTER INSTEAD
 REGULAR_USER_PASSWORD = "1234"
 REGULAR_USER_USERNAME = "demo_user"
@@ -43,7 +114,27 @@ MOVIES_SEARCH_TERM: str = "Avengers"
 ORDER_BY_TITLE = "title"
 ORDER_TYPE_ASC = "asc"
 ORDER_BY_ID = "id"
+ORDER_BY_RELEVANCE = "relevance"
+ORDER_BY_YEAR = "year"
+ORDER_BY_IMDB_RATING = "imdb_rating"
+ORDER_BY_METASCORE = "metascore"
+ORDER_BY_IMDB_VOTES = "imdb_votes"
+ORDER_BY_RUNTIME_MINUTES = "runtime_minutes"
+ORDER_BY_BOX_OFFICE_CENTS = "box_office_cents"
+ORDER_TYPE_DESC = "desc"
+# Roles of the people of a movie in the movie_person table
+ROLE_DIRECTOR = "director"
+ROLE_ACTOR = "actor"
+COUNT_EXACT = "exact"
+SEARCH_MODE_PREFIX = "prefix"
+SEARCH_MODE_TRIGRAM = "trigram"
+SEARCH_MODE_FULLTEXT = "fulltext"
+# Text search configuration of the search_vector column
+SEARCH_TEXT_CONFIG = "english"
+COUNT_ESTIMATED = "estimated"
 AUTHORIZATION_HEADER = "Authorization"
+# Postgres channel notified by the movie_changes triggers with the ids of the changed movies
+CATALOG_CHANNEL = "catalog_changes"
 IMDB_ID_UNIQUE_CONSTRAINT = "movie_imdb_id_key"
 PROJECT_NAME = "Brite test with OMDB"
 API_V1 = "v1"
@@ -0,0 +1,211 @@
+import importlib.util
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator
+
+from logger import logger
+
+
+class LRUCache:
+    """In-memory cache with a maximum number of entries and an expiration time for each entry."""
+
+    def __init__(self, max_entries: int):
+        """
+        :param max_entries: When this size is exceeded the least recently used entry is evicted.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Any | None:
+        """
+        Retrieves a value if it exists and hasn't expired. Expired entries are kept until they are
+        replaced or evicted, so they can still be served when the source is unavailable.
+        :param key: Key of the entry.
+        :param allow_stale: Whether to return the value even if it has expired.
+        :return: The value if found, otherwise None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic() and not allow_stale:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Stores a value evicting the least recently used entries if needed.
+        :param key: Key of the entry.
+        :param value: Value to store.
+        :param ttl: Seconds until the entry expires.
+        """
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        """Removes an entry if it exists."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all the entries."""
+        self._entries.clear()
+
+    def values(self) -> Iterator[Any]:
+        """Values of every entry, expired or not."""
+        return (value for value, _ in self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Counters of the cache usage."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(ABC):
+    """Storage of a cache of serialized values, shared by all its keys."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Retrieves a value if it exists and hasn't expired.
+        :param key: Key of the entry.
+        :return: The value if found, otherwise None.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        """
+        Stores a value.
+        :param key: Key of the entry.
+        :param value: Serialized value.
+        :param ttl: Seconds until the entry expires.
+        """
+
+    @abstractmethod
+    async def clear(self):
+        """Removes all the entries."""
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        """Number of entries and memory used by them."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Backend held in the memory of the process, the least recently used entries are evicted."""
+
+    def __init__(self, max_entries: int):
+        self.entries = LRUCache(max_entries=max_entries)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self.entries.set(key, value, ttl=ttl)
+
+    async def clear(self):
+        self.entries.clear()
+
+    async def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self.entries),
+            "max_entries": self.entries.max_entries,
+            "evictions": self.entries.evictions,
+            "memory_bytes": sum(len(value) for value in self.entries.values()),
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend stored in Redis or any server speaking its protocol, out of the memory of the process.
+    The server evicts the entries according to its own maxmemory policy. While it's unavailable
+    every read is a miss, and the writes and the clears are dropped.
+    """
+
+    def __init__(self, client, prefix: str, errors: tuple[type[Exception], ...] = (OSError,)):
+        """
+        :param client: Asynchronous client, e.g. redis.asyncio.Redis.
+        :param prefix: Prefix of the keys, so other data on the server is left alone.
+        :param errors: Errors of the client that mean the server is unavailable.
+        """
+        self.client = client
+        self.prefix = prefix
+        self.errors = errors
+        self.failures: int = 0
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.client.get(self.prefix + key)
+        except self.errors as e:
+            self._failed(e)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        try:
+            await self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+        except self.errors as e:
+            self._failed(e)
+
+    async def clear(self):
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+            if keys:
+                await self.client.delete(*keys)
+        except self.errors as e:
+            self._failed(e)
+
+    async def stats(self) -> dict:
+        stats = {"backend": "redis", "prefix": self.prefix, "failures": self.failures}
+        try:
+            memory = await self.client.info("memory")
+            stats["entries"] = await self.client.dbsize()
+        except self.errors as e:
+            self._failed(e)
+            return stats
+        stats["memory_bytes"] = memory.get("used_memory")
+        stats["max_memory_bytes"] = memory.get("maxmemory")
+        return stats
+
+    def _failed(self, error: Exception):
+        self.failures += 1
+        logger.warning(f"The cache server is unavailable: {error}")
+
+
+def create_cache_backend(url: str | None, max_entries: int, prefix: str) -> CacheBackend:
+    """
+    Creates the backend of a cache.
+    :param url: URL of a Redis compatible server, e.g. redis://localhost:6379/0. None keeps the
+    cache in memory.
+    :param max_entries: Entries kept at most by the in-memory backend.
+    :param prefix: Prefix of the keys stored in Redis.
+    :return: The backend.
+    """
+    if url:
+        if importlib.util.find_spec("redis") is not None:
+            import redis.asyncio
+
+            return RedisCacheBackend(
+                client=redis.asyncio.from_url(url),
+                prefix=prefix,
+                errors=(redis.RedisError, OSError),
+            )
+        logger.warning("Redis cache requested but the redis package is not installed, using memory")
+    return MemoryCacheBackend(max_entries=max_entries)
@@ -0,0 +1,38 @@
+import base64
+import binascii
+
+import orjson
+
+from exceptions.pagination_exceptions import InvalidCursorException
+
+
+class Cursor:
+    """
+    Opaque cursors for keyset pagination. A cursor encodes the sort key of the last row of a page,
+    (title, id), so the next page seeks from it instead of skipping the previous rows.
+    """
+
+    @staticmethod
+    def encode(title: str, id: int) -> str:
+        """
+        Encodes the sort key of a row.
+        :param title: Title of the last movie of the page.
+        :param id: Id of the last movie of the page.
+        :return: URL safe cursor.
+        """
+        return base64.urlsafe_b64encode(orjson.dumps([title, id])).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> tuple[str, int]:
+        """
+        Decodes a cursor given by encode.
+        :param cursor: Cursor received from a client.
+        :return: Tuple with the title and the id of the last movie of the previous page.
+        """
+        try:
+            title, id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+            raise InvalidCursorException(detail={"cursor": cursor})
+        if type(title) is not str or type(id) is not int:
+            raise InvalidCursorException(detail={"cursor": cursor})
+        return title, id
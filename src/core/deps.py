@@ -1,26 +1,50 @@
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import APIKeyHeader
 from jwt import InvalidTokenError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import SECRET_KEY, ALGORITHM, AUTHORIZATION_HEADER
+from config import (
+    SECRET_KEY,
+    ALGORITHM,
+    AUTHORIZATION_HEADER,
+    MOVIE_CACHE_CONTROL,
+    PRINCIPAL_CACHE_TTL,
+    PRINCIPAL_CACHE_MAX_ENTRIES,
+    REPLICATION_LAG,
+)
+from core.cache import LRUCache
+from core.single_flight import SingleFlight
+from core.versions import catalog_versions, etag_matches
+from exceptions.conditional_exceptions import NotModifiedException
 from repositories.database.user import UserDatabaseRepository
-from repositories.database.session_factory import get_session
+from repositories.database.session_factory import (
+    get_session,
+    get_read_session,
+    SessionMaker,
+    EngineManager,
+)
 from schemas.shared.user import UserData
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+# Session bound to a read replica when there is a healthy one, only for reads
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 api_key_header = APIKeyHeader(name=AUTHORIZATION_HEADER)
 AuthDep = Annotated[str, Depends(api_key_header)]
+# Users already authenticated by username, so most requests don't read the database to authenticate
+principal_cache = LRUCache(max_entries=PRINCIPAL_CACHE_MAX_ENTRIES)
+# Concurrent requests of a user that isn't cached share one read
+in_flight_principals = SingleFlight()
 
 
-async def get_current_user(session: SessionDep, token: AuthDep) -> UserData:
+async def get_current_user(token: AuthDep) -> UserData:
     """
-    Get the username from the payload to authenticate user.
-    :param session: Database session
+    Get the username from the payload to authenticate user. The user is read from the database
+    only if it isn't cached. Admin privileges need both the role of the user and the claim of the
+    token, so a demoted admin loses them without waiting for the token to expire.
     :param token: Token within header Authorization
     :return: User data
     """
@@ -31,12 +55,33 @@ async def get_current_user(session: SessionDep, token: AuthDep) -> UserData:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await UserDatabaseRepository.get_by_username(
-        session=session, username=payload["username"]
-    )
+    username: str = payload["username"]
+    user: UserData | None = principal_cache.get(username)
+    if user is None:
+        user = await in_flight_principals.do(username, lambda: _load_principal(username))
+    if user.tokens_valid_after and payload.get("iat", 0) < user.tokens_valid_after.timestamp():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The token has been revoked",
+        )
+    if user.is_admin and not payload.get("is_admin", False):
+        return user.model_copy(update={"is_admin": False})
+    return user
+
+
+async def _load_principal(username: str) -> UserData:
+    """
+    Reads a user from the primary, a revocation must not be missed due to the replication lag.
+    :param username: username of the user
+    :return: User data, it's cached
+    """
+    async with SessionMaker(bind=EngineManager.get_engine()) as session:
+        user = await UserDatabaseRepository.get_by_username(session=session, username=username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserData.model_validate(user)
+    principal = UserData.model_validate(user)
+    principal_cache.set(username, principal, ttl=PRINCIPAL_CACHE_TTL)
+    return principal
 
 
 CurrentUserDep = Annotated[UserData, Depends(get_current_user)]
@@ -53,4 +98,43 @@ async def get_current_user_admin(current_user: CurrentUserDep) -> UserData:
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
     return current_user
 
-CurrentAdminDep = Annotated[UserData, Depends(get_current_user_admin)]
\ No newline at end of file
+
+CurrentAdminDep = Annotated[UserData, Depends(get_current_user_admin)]
+
+
+async def check_catalog_etag(request: Request) -> str | None:
+    """
+    Answers with a 304 when the client already has the current version of the listings, without
+    querying the movies. Right after a write there's no ETag: the listing may be read from a
+    replica that still has the previous version, which must not be sent with the new ETag.
+    :param request: Request with the optional If-None-Match header.
+    :return: ETag to send with the listing, None if the versions may be out of date.
+    """
+    if catalog_versions.bumped_within(REPLICATION_LAG):
+        return None
+    etag = catalog_versions.catalog_etag()
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        raise NotModifiedException(etag=etag, cache_control=MOVIE_CACHE_CONTROL)
+    return etag
+
+
+CatalogETagDep = Annotated[str | None, Depends(check_catalog_etag)]
+
+
+async def check_movie_etag(request: Request, id: int) -> str | None:
+    """
+    Answers with a 304 when the client already has the current version of a movie, without
+    querying it. Right after a write there's no ETag, as for the listings.
+    :param request: Request with the optional If-None-Match header.
+    :param id: id of the movie requested.
+    :return: ETag to send with the movie, None if the versions may be out of date.
+    """
+    if catalog_versions.bumped_within(REPLICATION_LAG):
+        return None
+    etag = catalog_versions.movie_etag(movie_id=id)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        raise NotModifiedException(etag=etag, cache_control=MOVIE_CACHE_CONTROL)
+    return etag
+
+
+MovieETagDep = Annotated[str | None, Depends(check_movie_etag)]
@@ -0,0 +1,16 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response that encodes pydantic models, and lists or dicts of them, straight to bytes with
+    the serializer of pydantic-core: dates and nested models are encoded without the generic
+    jsonable_encoder. A route returning it skips the validation of its response model too, so the
+    content must be trusted, e.g. built by a service from validated models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
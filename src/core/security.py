@@ -1,17 +1,42 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from typing import Callable, TypeVar
+
 import jwt
 from passlib.context import CryptContext
 
-from config import SECRET_KEY, ALGORITHM
+from config import (
+    SECRET_KEY,
+    ALGORITHM,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_RETRY_AFTER,
+)
+from exceptions.security_exceptions import PasswordHasherSaturatedException
+
+T = TypeVar("T")
+
+EXECUTOR_PROCESS = "process"
+EXECUTOR_THREAD = "thread"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class Security:
     @staticmethod
-    def create_access_token(username: str, expires_delta: timedelta) -> str:
-        expire = datetime.now(timezone.utc) + expires_delta
-        to_encode = {"exp": expire, "username": username}
+    def create_access_token(username: str, expires_delta: timedelta, is_admin: bool = False) -> str:
+        now = datetime.now(timezone.utc)
+        # iat keeps the fraction of second, a token issued right after a revocation must be valid
+        to_encode = {
+            "exp": now + expires_delta,
+            "iat": now.timestamp(),
+            "username": username,
+            "is_admin": is_admin,
+        }
 
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
@@ -23,3 +48,118 @@ class Security:
     @staticmethod
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
+
+
+def _timed_call(func: Callable[..., T], *args) -> tuple[T, float]:
+    """Calls func in a worker, returning its result and the seconds it took."""
+    started_at = time.perf_counter()
+    return func(*args), time.perf_counter() - started_at
+
+
+class PasswordHasher:
+    """
+    Runs the bcrypt hashes and verifications in a dedicated pool of workers. bcrypt takes tens of
+    milliseconds of CPU on purpose, run in the event loop it would stall every other request of
+    the worker. The pool uses processes by default, since some bcrypt backends hold the GIL and
+    would stall the event loop from a thread too. The work waiting for a worker is bounded, over
+    the limit it's rejected at once with a 503 instead of making every login slower.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        queue_size: int = PASSWORD_HASH_QUEUE_SIZE,
+        retry_after: int = PASSWORD_HASH_RETRY_AFTER,
+        executor: str = PASSWORD_HASH_EXECUTOR,
+    ):
+        """
+        :param workers: Passwords hashed at the same time.
+        :param queue_size: Passwords waiting for a free worker at most.
+        :param retry_after: Seconds the rejected clients are told to wait.
+        :param executor: Kind of workers, "process" or "thread".
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.executor = executor
+        # Created on first use, after a shutdown too
+        self._executor: Executor | None = None
+        self.pending: int = 0
+        self.completed: int = 0
+        self.rejected: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+        self.run_total: float = 0.0
+        self.run_max: float = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hashes a password out of the event loop, see Security.get_password_hash."""
+        return await self._run(Security.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifies a password out of the event loop, see Security.verify_password."""
+        return await self._run(Security.verify_password, plain_password, hashed_password)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == EXECUTOR_THREAD:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+            else:
+                # Forking a process with running threads (e.g. the logger one) isn't safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        """
+        Runs func in a worker of the pool, timing how long it waited and how long it ran.
+        :param func: Function to run, it must be picklable for the process workers.
+        :raises PasswordHasherSaturatedException: If all the workers are busy and the queue full.
+        """
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PasswordHasherSaturatedException(
+                retry_after=self.retry_after, detail={"pending": self.pending}
+            )
+        submitted_at = time.perf_counter()
+        self.pending += 1
+        try:
+            result, ran = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self.pending -= 1
+        waited = time.perf_counter() - submitted_at - ran
+        self.completed += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.run_total += ran
+        self.run_max = max(self.run_max, ran)
+        return result
+
+    def shutdown(self):
+        """Stops the workers, the passwords still waiting are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Load of the pool and seconds waited for a worker and spent hashing."""
+        return {
+            "executor": self.executor,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_avg": self.wait_total / self.completed if self.completed else 0.0,
+            "wait_max": self.wait_max,
+            "run_avg": self.run_total / self.completed if self.completed else 0.0,
+            "run_max": self.run_max,
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,77 @@
+import math
+import secrets
+import time
+
+# Per movie versions kept at most, over this they are all invalidated at once
+MAX_MOVIE_VERSIONS: int = 100000
+
+
+class CatalogVersions:
+    """
+    Versions of the catalog and of every movie, bumped after every committed write. The ETags are
+    built from them, so a conditional GET can be answered without reading the database.
+    The epoch makes the ETags of every process different, since the counters start at 0.
+    """
+
+    def __init__(self, max_movie_versions: int = MAX_MOVIE_VERSIONS):
+        self.max_movie_versions = max_movie_versions
+        self.epoch: str = secrets.token_hex(4)
+        self.catalog: int = 0
+        # Bumped instead of every movie version when many movies change at once
+        self.generation: int = 0
+        # Only the movies updated or deleted have a version, the rest are at 0
+        self.movies: dict[int, int] = {}
+        # Whether the writes of other processes are being received, see CatalogListener
+        self.synced: bool = True
+        # Monotonic time of the last write
+        self.bumped_at: float = -math.inf
+
+    def bump(self, movie_ids: list[int] | None = None):
+        """
+        Records a write to the catalog.
+        :param movie_ids: ids of the movies updated or deleted, None if they are unknown, which
+        invalidates every movie.
+        """
+        self.catalog += 1
+        self.bumped_at = time.monotonic()
+        if movie_ids is None or len(self.movies) + len(movie_ids) > self.max_movie_versions:
+            self.generation += 1
+            self.movies.clear()
+            return
+        for movie_id in movie_ids:
+            self.movies[movie_id] = self.movies.get(movie_id, 0) + 1
+
+    def bumped_within(self, seconds: float) -> bool:
+        """Whether the last write happened less than some seconds ago."""
+        return time.monotonic() - self.bumped_at < seconds
+
+    def catalog_etag(self) -> str | None:
+        """ETag of the listings, None while the versions may be out of date."""
+        if not self.synced:
+            return None
+        return f'W/"{self.epoch}.{self.catalog}"'
+
+    def movie_etag(self, movie_id: int) -> str | None:
+        """ETag of a movie, None while the versions may be out of date."""
+        if not self.synced:
+            return None
+        return f'W/"{self.epoch}.{self.generation}.{self.movies.get(movie_id, 0)}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Weak comparison of an If-None-Match header with an ETag. "*" never matches: the ETags are
+    checked before reading the movie, so it can't be told whether the movie exists.
+    :param if_none_match: Value of the header, a list of ETags.
+    :param etag: Current ETag, None if there isn't one.
+    :return: Whether the client has the current representation.
+    """
+    if not if_none_match or etag is None:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag for candidate in if_none_match.split(",")
+    )
+
+
+catalog_versions = CatalogVersions()
@@ -0,0 +1,11 @@
+from fastapi import HTTPException, status
+
+
+class NotModifiedException(HTTPException):
+    """The client already has the current representation, it's answered without a body."""
+
+    def __init__(self, etag: str, cache_control: str):
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
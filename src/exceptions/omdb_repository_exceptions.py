@@ -37,3 +37,15 @@ class OmdbRepositoryInvalidResponseFormatException(OmdbRepositoryException):
     def __init__(self, detail: dict | None = None):
         logger.error(f"Invalid response format: {str(detail)}")
         super().__init__(detail=detail, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OmdbRepositoryUnavailableException(OmdbRepositoryException):
+    def __init__(self, detail: dict | None = None):
+        logger.error(f"OMDB is unavailable: {str(detail)}")
+        super().__init__(detail=detail, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class OmdbRepositoryQuotaExceededException(OmdbRepositoryException):
+    def __init__(self, detail: dict | None = None):
+        logger.warning(f"OMDB request quota exceeded: {str(detail)}")
+        super().__init__(detail=detail, status_code=status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,9 @@
+from fastapi import HTTPException, status
+
+from logger import logger
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, detail: dict | None = None):
+        logger.warning(f"Invalid pagination cursor: {str(detail)}")
+        super().__init__(detail=detail, status_code=status.HTTP_400_BAD_REQUEST)
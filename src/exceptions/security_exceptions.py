@@ -0,0 +1,13 @@
+from fastapi import HTTPException, status
+
+from logger import logger
+
+
+class PasswordHasherSaturatedException(HTTPException):
+    def __init__(self, retry_after: int, detail: dict | None = None):
+        logger.warning(f"Too many passwords waiting to be hashed: {str(detail)}")
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,7 +1,18 @@
-from sqlalchemy import Integer, String, UniqueConstraint, Index, Date, Float
+from sqlalchemy import (
+    Integer,
+    BigInteger,
+    String,
+    UniqueConstraint,
+    Index,
+    Date,
+    Float,
+    Computed,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from config import IMDB_ID_UNIQUE_CONSTRAINT
+from config import IMDB_ID_UNIQUE_CONSTRAINT, SEARCH_TEXT_CONFIG
 from repositories.database.models.base import Base
 from repositories.database.models.rating import Rating
 
@@ -35,6 +46,20 @@ class Movie(Base):
     box_office: Mapped[str | None] = mapped_column(String, nullable=True)
     production: Mapped[str | None] = mapped_column(String, nullable=True)
     website: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Parsed from runtime and box_office, so they can be sorted and aggregated in SQL
+    runtime_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    box_office_cents: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Generated by the database for the full-text search, the title weighs the most
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(actors, '')), 'B') || "
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(plot, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     ratings: Mapped[list["Rating"]] = relationship(
         back_populates="movie", cascade="all, delete-orphan"
@@ -44,4 +69,36 @@ class Movie(Base):
         UniqueConstraint("imdb_id", name=IMDB_ID_UNIQUE_CONSTRAINT),
         Index("ix_movie_id", "id"),
         Index("ix_movie_imdb_id", "imdb_id"),
+        # Keyset pagination seeks and orders by (title, id)
+        Index("ix_movie_title_id", "title", "id"),
+        # Title search: case insensitive prefix, trigram similarity and full-text
+        Index("ix_movie_title_prefix", text("lower(title) text_pattern_ops")),
+        Index(
+            "ix_movie_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("ix_movie_search_vector", "search_vector", postgresql_using="gin"),
+        # Structured filters and sorts, the id makes the order total. The nullable columns are
+        # usually sorted in descending order with the movies without a value last.
+        Index("ix_movie_year_id", "year", "id"),
+        Index("ix_movie_type_year_id", "type", "year", "id"),
+        Index(
+            "ix_movie_imdb_rating_id",
+            text("imdb_rating DESC NULLS LAST"),
+            text("id DESC"),
+        ),
+        Index("ix_movie_metascore_id", text("metascore DESC NULLS LAST"), text("id DESC")),
+        Index("ix_movie_imdb_votes_id", text("imdb_votes DESC NULLS LAST"), text("id DESC")),
+        Index(
+            "ix_movie_runtime_minutes_id",
+            text("runtime_minutes DESC NULLS LAST"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_movie_box_office_cents_id",
+            text("box_office_cents DESC NULLS LAST"),
+            text("id DESC"),
+        ),
     )
@@ -0,0 +1,21 @@
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from repositories.database.models.base import Base
+
+
+class MovieGenre(Base):
+    """
+    Genre of a movie, one row per genre in the comma-joined movie.genre. The rows are kept in sync
+    by the movie_facets trigger, see scripts/database_creation.sql.
+    """
+
+    __tablename__ = "movie_genre"
+
+    # Lowercase, the primary key seeks the movies of a genre
+    genre: Mapped[str] = mapped_column(String, primary_key=True)
+    movie_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("movie.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    __table_args__ = (Index("ix_movie_genre_movie_id", "movie_id"),)
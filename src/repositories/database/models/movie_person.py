@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from repositories.database.models.base import Base
+
+
+class MoviePerson(Base):
+    """
+    Director or actor of a movie, one row per name in the comma-joined movie.director and
+    movie.actors. The rows are kept in sync by the movie_facets trigger, see
+    scripts/database_creation.sql.
+    """
+
+    __tablename__ = "movie_person"
+
+    # ROLE_DIRECTOR or ROLE_ACTOR
+    role: Mapped[str] = mapped_column(String, primary_key=True)
+    # Lowercase, the primary key seeks the movies of a person in a role
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    movie_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("movie.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    __table_args__ = (Index("ix_movie_person_movie_id", "movie_id"),)
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint, Float, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from repositories.database.models.base import Base
@@ -13,9 +13,13 @@ class Rating(Base):
     movie_id: Mapped[int] = mapped_column(ForeignKey("movie.id", ondelete="CASCADE"))
     source: Mapped[str] = mapped_column(String)
     value: Mapped[str] = mapped_column(String)
+    # The value normalized to 0-100, comparable between sources
+    score: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     movie: Mapped["Movie"] = relationship(lazy="noload")
 
     __table_args__ = (
         UniqueConstraint("movie_id", "source", "value", name="movie_source_value_unique"),
+        # Movies with a minimum score from a source, e.g. Rotten Tomatoes
+        Index("ix_rating_source_score", "source", "score", "movie_id"),
     )
@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, String, Boolean, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import Integer, String, Boolean, UniqueConstraint, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 
 from repositories.database.models.base import Base
@@ -13,5 +15,6 @@ class User(Base):
     username: Mapped[str] = mapped_column(String)
     hashed_password: Mapped[str] = mapped_column(String)
     is_admin: Mapped[bool] = mapped_column(Boolean)
+    tokens_valid_after: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     __table_args__ = (UniqueConstraint("username", name="username_unique"),)
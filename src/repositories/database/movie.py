@@ -1,116 +1,685 @@
-from sqlalchemy import select, func, delete, Function, Select
+import re
+from typing import Iterable
+
+import orjson
+from sqlalchemy import (
+    select,
+    func,
+    delete,
+    Select,
+    text,
+    literal_column,
+    tuple_,
+    values,
+    column,
+    String,
+    Float,
+    update,
+    asc,
+    desc,
+)
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, ColumnElement, Executable
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
 
-from config import IMDB_ID_UNIQUE_CONSTRAINT
+from config import (
+    IMDB_ID_UNIQUE_CONSTRAINT,
+    INGEST_COPY_THRESHOLD,
+    COUNT_EXACT,
+    COUNT_ESTIMATED,
+    MOVIE_COUNT_CACHE_TTL,
+    SEARCH_MODE_PREFIX,
+    SEARCH_MODE_TRIGRAM,
+    SEARCH_TEXT_CONFIG,
+    ORDER_BY_TITLE,
+    ORDER_BY_ID,
+    ORDER_BY_YEAR,
+    ORDER_BY_IMDB_RATING,
+    ORDER_BY_METASCORE,
+    ORDER_BY_IMDB_VOTES,
+    ORDER_BY_RUNTIME_MINUTES,
+    ORDER_BY_BOX_OFFICE_CENTS,
+    ORDER_TYPE_DESC,
+    ROLE_DIRECTOR,
+    ROLE_ACTOR,
+)
+from core.cache import LRUCache
+from core.versions import catalog_versions
 from core.deps import SessionDep
 from repositories.database.models.movie import Movie
+from repositories.database.models.movie_genre import MovieGenre
+from repositories.database.models.movie_person import MoviePerson
 from repositories.database.models.rating import Rating
-from schemas.shared.movie import MovieCreate
+from schemas.shared.movie import MovieCreate, BulkInsertResult, MovieGet
+from schemas.responses.omdb import parse_runtime, parse_box_office, parse_rating_score
+from schemas.shared.movie_filter import MovieFilter, MovieSort
+from schemas.shared.search_filter import SearchFilter
+
+# Every column of a movie but the ones generated by the database
+MOVIE_COLUMNS: list[str] = [
+    column.name
+    for column in Movie.__table__.columns
+    if column.name != Movie.id.name and column.computed is None
+]
+# asyncpg allows up to 32767 parameters per statement
+MOVIE_ROWS_PER_STATEMENT: int = 32767 // len(MOVIE_COLUMNS)
+RATING_ROWS_PER_STATEMENT: int = 32767 // 4
+MOVIE_COUNT_CACHE_MAX_ENTRIES: int = 1000
+INSERTED_COLUMN = literal_column("xmax = 0").label("inserted")
+# Columns of a movie returned by the reads
+MOVIE_READ_COLUMNS = [Movie.id, *(Movie.__table__.c[column] for column in MOVIE_COLUMNS)]
+# Columns the listings can be sorted by, every one has an index ending in id
+SORT_COLUMNS = {
+    ORDER_BY_TITLE: Movie.title,
+    ORDER_BY_ID: Movie.id,
+    ORDER_BY_YEAR: Movie.year,
+    ORDER_BY_IMDB_RATING: Movie.imdb_rating,
+    ORDER_BY_METASCORE: Movie.metascore,
+    ORDER_BY_IMDB_VOTES: Movie.imdb_votes,
+    ORDER_BY_RUNTIME_MINUTES: Movie.runtime_minutes,
+    ORDER_BY_BOX_OFFICE_CENTS: Movie.box_office_cents,
+}
+# Their indexes are (column DESC NULLS LAST, id DESC): the movies without a value are the lowest,
+# last in descending order and first in ascending order, which scans the same index backward
+NULLS_LAST_SORT_COLUMNS = {
+    ORDER_BY_IMDB_RATING,
+    ORDER_BY_METASCORE,
+    ORDER_BY_IMDB_VOTES,
+    ORDER_BY_RUNTIME_MINUTES,
+    ORDER_BY_BOX_OFFICE_CENTS,
+}
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, its parameters are bound like in the statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def _ts_query(query: str) -> ColumnElement:
+    """Parses a search like a web search engine does: quotes, "or" and "-" are supported."""
+    return func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, query)
 
 
 class MovieDatabaseRepository:
     """Handles database operations for Movie objects"""
 
+    # Exact counts of the listings by title filter, "" is the unfiltered one.
+    count_cache: LRUCache = LRUCache(max_entries=MOVIE_COUNT_CACHE_MAX_ENTRIES)
+
     @staticmethod
-    async def bulk_insert(session: SessionDep, movies: list[MovieCreate]):
+    async def bulk_insert(
+        session: SessionDep,
+        movies: list[MovieCreate],
+        update_existing: bool = False,
+        use_copy: bool | None = None,
+    ) -> BulkInsertResult:
         """
-        Inserts in bulk a group of movies.
+        Inserts in bulk a group of movies with set-based statements: the movies are written with
+        INSERT ... ON CONFLICT (imdb_id) ... RETURNING and then all their ratings at once, so a
+        movie that already exists doesn't fail the rest of the batch.
         :param session: The database session to use for the query.
         :param movies: A list of movies to insert.
+        :param update_existing: Whether to overwrite the movies that already exist, and their
+        ratings, instead of skipping them.
+        :param use_copy: Whether to load the rows with COPY through staging tables, by default only
+        for loads larger than INGEST_COPY_THRESHOLD.
+        :return: imdb_ids of the movies inserted, updated and skipped.
         """
-        movies_to_insert: list[Movie] = MovieDatabaseRepository._map_schema_to_model(movies)
-        session.add_all(movies_to_insert)
+        if not movies:
+            return BulkInsertResult()
+        # A statement can't affect the same row twice, so the last duplicate of a movie wins.
+        unique_movies: dict[str, MovieCreate] = {movie.imdb_id: movie for movie in movies}
+        if use_copy is None:
+            use_copy = len(unique_movies) > INGEST_COPY_THRESHOLD
+        if use_copy:
+            written, updated_ids = await MovieDatabaseRepository._copy_movies(
+                session=session, movies=list(unique_movies.values()), update=update_existing
+            )
+        else:
+            written, updated_ids = await MovieDatabaseRepository._insert_movies(
+                session=session, movies=list(unique_movies.values()), update=update_existing
+            )
         await session.commit()
+        if written:
+            MovieDatabaseRepository.invalidate_counts()
+            catalog_versions.bump(movie_ids=updated_ids)
+
+        # The duplicate whose data was written is the one reported, the earlier ones are skipped
+        result = BulkInsertResult()
+        for movie in movies:
+            if movie.imdb_id not in written or unique_movies[movie.imdb_id] is not movie:
+                result.skipped.append(movie.imdb_id)
+            elif written[movie.imdb_id]:
+                result.inserted.append(movie.imdb_id)
+            else:
+                result.updated.append(movie.imdb_id)
+        return result
 
     @staticmethod
-    def _map_schema_to_model(movies: list[MovieCreate]):
+    async def _insert_movies(
+        session: SessionDep, movies: list[MovieCreate], update: bool
+    ) -> tuple[dict[str, bool], list[int]]:
         """
-        A manual mapping of types that highlights the impedance mismatch between schemas and models.
-        :param movies: Movies to map from list[MovieCreate] to list[Movie]
-        :return: Transformed movies as list[Movie]
+        Writes the movies and their ratings with multi-row INSERTs.
+        :return: Whether every written movie was inserted (True) or updated (False) by imdb_id,
+        and the ids of the updated ones.
         """
-        movies_to_insert: list[Movie] = []
-        for movie_create in movies:
-            movie_data: dict = movie_create.model_dump(exclude={"ratings"})
-            movie: Movie = Movie(**movie_data)
+        movie_ids: dict[str, int] = {}
+        written: dict[str, bool] = {}
+        movie_rows = [movie.model_dump(exclude={"ratings"}) for movie in movies]
+        for start in range(0, len(movie_rows), MOVIE_ROWS_PER_STATEMENT):
+            statement = insert(Movie).values(movie_rows[start : start + MOVIE_ROWS_PER_STATEMENT])
+            if update:
+                statement = statement.on_conflict_do_update(
+                    index_elements=[Movie.imdb_id],
+                    set_={column: statement.excluded[column] for column in MOVIE_COLUMNS},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=[Movie.imdb_id])
+            # xmax is 0 only for the rows inserted by this transaction, not for the updated ones
+            statement = statement.returning(Movie.id, Movie.imdb_id, INSERTED_COLUMN)
+            for id, imdb_id, inserted in await session.execute(statement):
+                movie_ids[imdb_id] = id
+                written[imdb_id] = inserted
 
-            if movie_create.ratings:
-                for rating_create in movie_create.ratings:
-                    rating: Rating = Rating(**rating_create.model_dump())
-                    movie.ratings.append(rating)
+        updated_ids = [movie_ids[imdb_id] for imdb_id, inserted in written.items() if not inserted]
+        if updated_ids:
+            await session.execute(delete(Rating).where(Rating.movie_id.in_(updated_ids)))
+        rating_rows = [
+            {
+                "movie_id": movie_ids[movie.imdb_id],
+                "source": rating.source,
+                "value": rating.value,
+                "score": rating.score,
+            }
+            for movie in movies
+            if movie.imdb_id in movie_ids
+            for rating in movie.ratings
+        ]
+        for start in range(0, len(rating_rows), RATING_ROWS_PER_STATEMENT):
+            await session.execute(
+                insert(Rating)
+                .values(rating_rows[start : start + RATING_ROWS_PER_STATEMENT])
+                .on_conflict_do_nothing()
+            )
+        return written, updated_ids
 
-            movies_to_insert.append(movie)
-        return movies_to_insert
+    @staticmethod
+    async def _copy_movies(
+        session: SessionDep, movies: list[MovieCreate], update: bool
+    ) -> tuple[dict[str, bool], list[int]]:
+        """
+        Loads the movies and their ratings with COPY into temporary staging tables and moves them
+        to the real ones with a single INSERT ... SELECT each.
+        :return: Whether every written movie was inserted (True) or updated (False) by imdb_id,
+        and the ids of the updated ones.
+        """
+        connection = await session.connection()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        columns = ", ".join(MOVIE_COLUMNS)
+        await session.execute(
+            text(
+                f"CREATE TEMP TABLE movie_staging ON COMMIT DROP AS SELECT {columns} FROM movie "
+                "WITH NO DATA"
+            )
+        )
+        await session.execute(
+            text(
+                "CREATE TEMP TABLE rating_staging "
+                "(imdb_id VARCHAR, source TEXT, value TEXT, score DOUBLE PRECISION) ON COMMIT DROP"
+            )
+        )
+        await driver_connection.copy_records_to_table(
+            "movie_staging",
+            records=[tuple(getattr(movie, column) for column in MOVIE_COLUMNS) for movie in movies],
+            columns=MOVIE_COLUMNS,
+        )
+        await driver_connection.copy_records_to_table(
+            "rating_staging",
+            records=[
+                (movie.imdb_id, rating.source, rating.value, rating.score)
+                for movie in movies
+                for rating in movie.ratings
+            ],
+            columns=["imdb_id", "source", "value", "score"],
+        )
+
+        if update:
+            conflict = "DO UPDATE SET " + ", ".join(
+                f"{column} = EXCLUDED.{column}" for column in MOVIE_COLUMNS
+            )
+        else:
+            conflict = "DO NOTHING"
+        rows = await session.execute(
+            text(
+                f"INSERT INTO movie ({columns}) SELECT {columns} FROM movie_staging "
+                f"ON CONFLICT (imdb_id) {conflict} RETURNING id, imdb_id, (xmax = 0) AS inserted"
+            )
+        )
+        written: dict[str, bool] = {}
+        updated_ids: list[int] = []
+        for id, imdb_id, inserted in rows:
+            written[imdb_id] = inserted
+            if not inserted:
+                updated_ids.append(id)
+        if updated_ids:
+            await session.execute(delete(Rating).where(Rating.movie_id.in_(updated_ids)))
+        await session.execute(
+            text(
+                "INSERT INTO rating (movie_id, source, value, score) "
+                "SELECT movie.id, rating_staging.source, rating_staging.value, "
+                "rating_staging.score FROM rating_staging "
+                "JOIN movie ON movie.imdb_id = rating_staging.imdb_id "
+                "WHERE rating_staging.imdb_id = ANY(:imdb_ids) ON CONFLICT DO NOTHING"
+            ),
+            {"imdb_ids": list(written)},
+        )
+        return written, updated_ids
 
     @staticmethod
-    async def count(session: SessionDep) -> int:
+    async def count(
+        session: SessionDep,
+        title: str | None = None,
+        search: SearchFilter | None = None,
+        filters: MovieFilter | None = None,
+    ) -> int:
         """
         Retrieves the total count of movies.
         :param session: The database session to use for the query.
+        :param title: Filter to count only movies whose title matches exactly this.
+        :param search: Filter to count only movies matching this search.
+        :param filters: Structured filters the movies must match.
         :return: Total count of movies.
         """
-        count_query = select(func.count(Movie.id))
+        count_query = select(func.count(Movie.id)).where(
+            *MovieDatabaseRepository._filters(title=title, search=search, filters=filters)
+        )
         return await session.scalar(count_query)
 
     @staticmethod
-    async def create(session: SessionDep, movie: MovieCreate) -> Movie:
+    async def get_total(
+        session: SessionDep,
+        title: str | None,
+        strategy: str = COUNT_EXACT,
+        search: SearchFilter | None = None,
+        filters: MovieFilter | None = None,
+    ) -> tuple[int, bool]:
         """
-        Inserts a new movie in the database.
+        Retrieves the number of movies of a listing with the given strategy. The exact counts are
+        cached per filter until this instance writes movies or MOVIE_COUNT_CACHE_TTL expires. The
+        estimated ones come from the planner statistics and don't scan the table at all.
+        :param session: The database session to use for the query.
+        :param title: Filter to count only movies whose title matches exactly this.
+        :param strategy: COUNT_EXACT or COUNT_ESTIMATED.
+        :param search: Filter to count only movies matching this search.
+        :param filters: Structured filters the movies must match.
+        :return: Tuple with the total and whether it's estimated.
+        """
+        if filters is not None and filters.is_empty():
+            filters = None
+        if strategy == COUNT_ESTIMATED:
+            estimate = await MovieDatabaseRepository._estimate_count(
+                session=session, title=title, search=search, filters=filters
+            )
+            if estimate is not None:
+                return estimate, True
+
+        # A tuple, the title and the terms may contain any separator
+        key = (
+            title,
+            search.mode if search else None,
+            search.query if search else None,
+            filters.model_dump_json(exclude_none=True) if filters else None,
+        )
+        total: int | None = MovieDatabaseRepository.count_cache.get(key)
+        if total is None:
+            total = await MovieDatabaseRepository.count(
+                session=session, title=title, search=search, filters=filters
+            )
+            MovieDatabaseRepository.count_cache.set(key, total, ttl=MOVIE_COUNT_CACHE_TTL)
+        return total, False
+
+    @staticmethod
+    async def _estimate_count(
+        session: SessionDep,
+        title: str | None,
+        search: SearchFilter | None,
+        filters: MovieFilter | None = None,
+    ) -> int | None:
+        """
+        Estimates the number of movies from the planner statistics.
+        :param session: The database session to use for the query.
+        :param title: Filter to count only movies whose title matches exactly this.
+        :param search: Filter to count only movies matching this search.
+        :param filters: Structured filters the movies must match.
+        :return: The estimate, or None if the table has not been analyzed yet.
+        """
+        if not title and not search and not filters:
+            estimate = await session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'movie'::regclass")
+            )
+            # -1 or 0 until the table is vacuumed or analyzed for the first time
+            return estimate if estimate and estimate > 0 else None
+        query = select(Movie.id).where(
+            *MovieDatabaseRepository._filters(title=title, search=search, filters=filters)
+        )
+        plan = await session.scalar(Explain(query))
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _filters(
+        title: str | None, search: SearchFilter | None, filters: MovieFilter | None = None
+    ) -> list[ColumnElement[bool]]:
+        """
+        Builds the conditions of a listing, every search mode has its own index.
+        :param title: Filter to get only movies whose title matches exactly this.
+        :param search: Filter to get only movies matching this search.
+        :param filters: Structured filters the movies must match.
+        :return: Conditions to apply to the query.
+        """
+        conditions: list[ColumnElement[bool]] = []
+        if title:
+            conditions.append(Movie.title == title)
+        if filters is not None:
+            conditions.extend(MovieDatabaseRepository._structured_filters(filters=filters))
+        if search is None:
+            return conditions
+        if search.mode == SEARCH_MODE_PREFIX:
+            # lower(title) LIKE 'term%' uses ix_movie_title_prefix, the wildcards are escaped
+            pattern = re.sub(r"([/%_])", r"/\1", search.query.lower()) + "%"
+            conditions.append(func.lower(Movie.title).like(pattern, escape="/"))
+        elif search.mode == SEARCH_MODE_TRIGRAM:
+            # The % operator uses ix_movie_title_trgm, pg_trgm.similarity_threshold applies
+            conditions.append(Movie.title.op("%")(search.query))
+        else:
+            conditions.append(Movie.search_vector.op("@@")(_ts_query(search.query)))
+        return conditions
+
+    @staticmethod
+    def _structured_filters(filters: MovieFilter) -> list[ColumnElement[bool]]:
+        """
+        Builds the conditions of the structured filters. Genres and people are semi-joins on the
+        primary keys of movie_genre and movie_person, the rest use the movie indexes.
+        :param filters: Structured filters the movies must match.
+        :return: Conditions to apply to the query.
+        """
+        conditions: list[ColumnElement[bool]] = []
+        if filters.year_from is not None:
+            conditions.append(Movie.year >= filters.year_from)
+        if filters.year_to is not None:
+            conditions.append(Movie.year <= filters.year_to)
+        if filters.type is not None:
+            conditions.append(Movie.type == filters.type)
+        if filters.min_imdb_rating is not None:
+            conditions.append(Movie.imdb_rating >= filters.min_imdb_rating)
+        if filters.min_metascore is not None:
+            conditions.append(Movie.metascore >= filters.min_metascore)
+        if filters.min_runtime is not None:
+            conditions.append(Movie.runtime_minutes >= filters.min_runtime)
+        if filters.max_runtime is not None:
+            conditions.append(Movie.runtime_minutes <= filters.max_runtime)
+        if filters.genre is not None:
+            conditions.append(
+                Movie.id.in_(select(MovieGenre.movie_id).where(MovieGenre.genre == filters.genre))
+            )
+        for role, name in ((ROLE_DIRECTOR, filters.director), (ROLE_ACTOR, filters.actor)):
+            if name is not None:
+                conditions.append(
+                    Movie.id.in_(
+                        select(MoviePerson.movie_id).where(
+                            MoviePerson.role == role, MoviePerson.name == name
+                        )
+                    )
+                )
+        return conditions
+
+    @staticmethod
+    def _order_by(sort: MovieSort) -> list[ColumnElement]:
+        """
+        Builds the ordering of a sort, the id breaks the ties in the same direction so the order
+        matches the index of the column.
+        :param sort: Column and direction to sort by.
+        :return: Expressions to order the query by.
+        """
+        direction = desc if sort.order_type == ORDER_TYPE_DESC else asc
+        column = direction(SORT_COLUMNS[sort.order_by])
+        if sort.order_by in NULLS_LAST_SORT_COLUMNS:
+            column = column.nulls_last() if direction is desc else column.nulls_first()
+        if sort.order_by == ORDER_BY_ID:
+            return [column]
+        return [column, direction(Movie.id)]
+
+    @staticmethod
+    def _relevance(search: SearchFilter) -> list[ColumnElement]:
+        """
+        Builds the ordering of a search, the most relevant movies first and the id as tie-breaker.
+        :param search: Search to rank.
+        :return: Expressions to order the query by.
+        """
+        if search.mode == SEARCH_MODE_PREFIX:
+            return [Movie.title, Movie.id]
+        if search.mode == SEARCH_MODE_TRIGRAM:
+            return [func.similarity(Movie.title, search.query).desc(), Movie.id]
+        return [func.ts_rank(Movie.search_vector, _ts_query(search.query)).desc(), Movie.id]
+
+    @staticmethod
+    def invalidate_counts():
+        """Forgets the cached counts, every write of movies must call it."""
+        MovieDatabaseRepository.count_cache.clear()
+
+    @staticmethod
+    async def get_existing_imdb_ids(session: SessionDep, imdb_ids: list[str]) -> set[str]:
+        """
+        Checks in a single query which imdb_ids are already stored.
+        :param session: The database session to use for the query.
+        :param imdb_ids: imdb_ids to check.
+        :return: The imdb_ids that are already stored.
+        """
+        if not imdb_ids:
+            return set()
+        query = select(Movie.imdb_id).where(Movie.imdb_id.in_(imdb_ids))
+        return set((await session.scalars(query)).all())
+
+    @staticmethod
+    async def create(session: SessionDep, movie: MovieCreate) -> MovieGet:
+        """
+        Inserts a new movie and its ratings in a single statement. The movie comes back from the
+        INSERT ... RETURNING of a CTE and the ratings from the one of a second CTE, so there is
+        no need to read the movie again.
         :param session: The database session to use for the query.
         :param movie: The movie to insert.
+        :return: The inserted movie.
         """
-        movie_to_create: Movie = MovieDatabaseRepository._map_schema_to_model([movie])[0]
-        session.add(movie_to_create)
-        await session.commit()
-        query = (
-            select(Movie).where(Movie.imdb_id == movie.imdb_id).options(selectinload(Movie.ratings))
+        new_movie = (
+            insert(Movie)
+            .values(movie.model_dump(exclude={"ratings"}))
+            .returning(*MOVIE_READ_COLUMNS)
+            .cte("new_movie")
         )
-        return (await session.execute(query)).scalar_one_or_none()
+        ratings = literal_column("'[]'::json")
+        if movie.ratings:
+            new_ratings_values = values(
+                column("source", String),
+                column("value", String),
+                column("score", Float),
+                name="new_rating_values",
+            ).data([(rating.source, rating.value, rating.score) for rating in movie.ratings])
+            new_ratings = (
+                insert(Rating)
+                .from_select(
+                    ["movie_id", "source", "value", "score"],
+                    select(
+                        new_movie.c.id,
+                        new_ratings_values.c.source,
+                        new_ratings_values.c.value,
+                        new_ratings_values.c.score,
+                    ),
+                )
+                .returning(Rating.id, Rating.source, Rating.value, Rating.score)
+                .cte("new_ratings")
+            )
+            # Same order as the reads, the ids follow the order of the values
+            ratings = select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "source",
+                            new_ratings.c.source,
+                            "value",
+                            new_ratings.c.value,
+                            "score",
+                            new_ratings.c.score,
+                        ),
+                        new_ratings.c.id,
+                    )
+                )
+            ).scalar_subquery()
+        row = (await session.execute(select(new_movie, ratings.label("ratings")))).one()
+        await session.commit()
+        MovieDatabaseRepository.invalidate_counts()
+        # The new movie only changes the listings, nobody has an ETag of it yet
+        catalog_versions.bump(movie_ids=[])
+        return MovieDatabaseRepository._to_movie(row)
 
     @staticmethod
-    async def get(session: SessionDep, id: int) -> Movie | None:
+    async def get(session: SessionDep, id: int) -> MovieGet | None:
         """
         Retrieves a movie by id.
         :param session: The database session to use for the query.
         :param id: Id of the movie to retrieve, do not confuse with imdb_id
         :return: If found, returns the movie, otherwise returns None.
         """
-        query = select(Movie).where(Movie.id == id).options(selectinload(Movie.ratings))
-        return (await session.execute(query)).scalar_one_or_none()
+        query = MovieDatabaseRepository._select_movies().where(Movie.id == id)
+        row = (await session.execute(query)).one_or_none()
+        return MovieDatabaseRepository._to_movie(row) if row is not None else None
 
     @staticmethod
     async def get_all_paginated(
-        session: SessionDep, title: str | None, limit: int | None = None, offset: int | None = None
-    ) -> tuple[list[Movie], int]:
+        session: SessionDep,
+        title: str | None,
+        limit: int | None = None,
+        offset: int | None = None,
+        search: SearchFilter | None = None,
+        filters: MovieFilter | None = None,
+        sort: MovieSort | None = None,
+    ) -> list[MovieGet]:
         """
         Retrieves a list of movies. If title is not provided the movies are ordered by title,
-        otherwise by id.
+        otherwise by id. Searches are ordered by relevance. A sort overrides both. The total is
+        retrieved apart with get_total, a count(*) OVER () here would make Postgres materialize
+        every matching row before applying the limit.
         :param session: The database session to use for the query.
         :param title: Filter to get only movies whose title matches exactly this.
         :param limit: Limit for this query (optional). If not provided, returns all results.
         :param offset: Offset for this query (optional). If not provided, returns all results.
         returns all results.
-        :return: Tuple containing a list of movies, and total count of movies.
+        :param search: Filter to get only movies matching this search (optional).
+        :param filters: Structured filters the movies must match (optional).
+        :param sort: Column and direction to sort by (optional).
+        :return: List of movies.
         """
-        count: Function = func.count().over().label("total_count")
-        query: Select[tuple[Movie, int]] = select(Movie, count).options(selectinload(Movie.ratings))
-        if not title:
-            query = query.order_by(Movie.title)
-        if title:
-            query = query.where(Movie.title == title).order_by(Movie.id)
+        query: Select = MovieDatabaseRepository._select_movies().where(
+            *MovieDatabaseRepository._filters(title=title, search=search, filters=filters)
+        )
+        if sort:
+            query = query.order_by(*MovieDatabaseRepository._order_by(sort=sort))
+        elif search:
+            query = query.order_by(*MovieDatabaseRepository._relevance(search=search))
+        elif title:
+            query = query.order_by(Movie.id)
+        else:
+            query = query.order_by(Movie.title, Movie.id)
         if limit is not None and offset is not None:
             query = query.limit(limit).offset(offset)
-        rows: list[tuple[Movie, int]] = list((await session.execute(query)).all())
-        # It would have been cleaner to use a separate count query, but in terms of performance
-        # it is better to avoid duplicated database round-trips.
-        movies: list[Movie] = []
-        total: int = 0
-        if rows:
-            _, total = rows[0]
-            movies = [movie for movie, _ in rows]
+        return MovieDatabaseRepository._to_movies(await session.execute(query))
+
+    @staticmethod
+    async def get_page_after(
+        session: SessionDep,
+        title: str | None,
+        limit: int,
+        after: tuple[str, int] | None,
+        filters: MovieFilter | None = None,
+    ) -> list[MovieGet]:
+        """
+        Retrieves a page of movies with keyset pagination: the movies are ordered by (title, id)
+        and the query seeks after the last movie of the previous page using ix_movie_title_id,
+        so the cost doesn't grow with the depth of the page. When filtering by title the order
+        is the same as ordering by id.
+        :param session: The database session to use for the query.
+        :param title: Filter to get only movies whose title matches exactly this.
+        :param limit: Maximum number of movies to retrieve.
+        :param after: (title, id) of the last movie of the previous page, None for the first page.
+        :param filters: Structured filters the movies must match (optional).
+        :return: List of movies.
+        """
+        query = (
+            MovieDatabaseRepository._select_movies()
+            .where(*MovieDatabaseRepository._filters(title=title, search=None, filters=filters))
+            .order_by(Movie.title, Movie.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Movie.title, Movie.id) > tuple_(*after))
+        return MovieDatabaseRepository._to_movies(await session.execute(query))
+
+    @staticmethod
+    def _select_movies() -> Select:
+        """
+        Builds the query of the movies with their ratings aggregated as a JSON array by a
+        correlated subquery, so a page is read in a single round-trip and without hydrating ORM
+        objects.
+        :return: Query to complete with filters, ordering and limits.
+        """
+        ratings = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "source",
+                                Rating.source,
+                                "value",
+                                Rating.value,
+                                "score",
+                                Rating.score,
+                            ),
+                            Rating.id,
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                )
+            )
+            .where(Rating.movie_id == Movie.id)
+            .scalar_subquery()
+        )
+        return select(*MOVIE_READ_COLUMNS, ratings.label("ratings"))
+
+    @staticmethod
+    def _to_movies(rows: Iterable[Row]) -> list[MovieGet]:
+        """Maps the rows of _select_movies to the response schema."""
+        return [MovieDatabaseRepository._to_movie(row) for row in rows]
 
-        return movies, total
+    @staticmethod
+    def _to_movie(row: Row) -> MovieGet:
+        """Maps a row of _select_movies to the response schema."""
+        movie_data = row._asdict()
+        if isinstance(movie_data["ratings"], str):
+            movie_data["ratings"] = orjson.loads(movie_data["ratings"])
+        return MovieGet.model_validate(movie_data)
 
     @staticmethod
     async def delete(session: SessionDep, id: int) -> bool:
@@ -123,8 +692,62 @@ class MovieDatabaseRepository:
         query = delete(Movie).where(Movie.id == id)
         result = await session.execute(query)
         await session.commit()
+        MovieDatabaseRepository.invalidate_counts()
+        if result.rowcount:
+            catalog_versions.bump(movie_ids=[id])
         return result.rowcount == 1
 
+    @staticmethod
+    async def backfill_numeric_columns(
+        session: SessionDep, after_id: int, limit: int
+    ) -> int | None:
+        """
+        Parses runtime_minutes, box_office_cents and the rating scores of a batch of movies stored
+        before these columns existed, and commits them. The movies are walked by id, so every one
+        is visited once even if its values can't be parsed.
+        :param session: The database session to use for the query.
+        :param after_id: id of the last movie of the previous batch, 0 for the first one.
+        :param limit: Maximum number of movies of the batch.
+        :return: id of the last movie of the batch, None if there are no more movies.
+        """
+        movies = (
+            await session.execute(
+                select(Movie.id, Movie.runtime, Movie.box_office)
+                .where(Movie.id > after_id)
+                .order_by(Movie.id)
+                .limit(limit)
+            )
+        ).all()
+        if not movies:
+            return None
+        last_id: int = movies[-1].id
+        # Bulk UPDATEs by primary key, sent as a single executemany each
+        await session.execute(
+            update(Movie),
+            [
+                {
+                    "id": id,
+                    "runtime_minutes": parse_runtime(runtime),
+                    "box_office_cents": parse_box_office(box_office),
+                }
+                for id, runtime, box_office in movies
+            ],
+        )
+        ratings = (
+            await session.execute(
+                select(Rating.id, Rating.value).where(
+                    Rating.movie_id > after_id, Rating.movie_id <= last_id, Rating.score.is_(None)
+                )
+            )
+        ).all()
+        if ratings:
+            await session.execute(
+                update(Rating),
+                [{"id": id, "score": parse_rating_score(value)} for id, value in ratings],
+            )
+        await session.commit()
+        return last_id
+
     @staticmethod
     def check_already_exists(exception: Exception) -> bool:
         """Trick to avoid a round-trip to the database just to know if a Record exist.
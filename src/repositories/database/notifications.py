@@ -0,0 +1,76 @@
+import asyncio
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from config import CATALOG_CHANNEL, CATALOG_LISTENER_RETRY_AFTER
+from core.versions import CatalogVersions, catalog_versions
+from logger import logger
+from repositories.database.session_factory import url
+
+# Payload of the notifications whose changed movies are too many to list
+ALL_MOVIES = "*"
+
+
+class CatalogListener:
+    """
+    Listens to the notifications sent by the movie_changes triggers, so the writes of other
+    processes (other workers, the ingest command...) bump the catalog versions too. It holds its
+    own connection, out of the pool. While it's disconnected the versions are flagged as out of
+    date and the conditional GETs are answered in full.
+    """
+
+    def __init__(
+        self,
+        versions: CatalogVersions = catalog_versions,
+        channel: str = CATALOG_CHANNEL,
+        retry_after: float = CATALOG_LISTENER_RETRY_AFTER,
+    ):
+        self.versions = versions
+        self.channel = channel
+        self.retry_after = retry_after
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Starts listening in the background, it reconnects until stopped."""
+        self.versions.synced = False
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def on_notification(self, connection, pid: int, channel: str, payload: str):
+        """Bumps the versions of the movies listed in the payload, or of every movie."""
+        if payload == ALL_MOVIES:
+            self.versions.bump(movie_ids=None)
+        else:
+            self.versions.bump(movie_ids=[int(id) for id in payload.split(",") if id])
+
+    async def _listen(self):
+        dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            connection: asyncpg.Connection | None = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _, closed=closed: closed.set())
+                await connection.add_listener(self.channel, self.on_notification)
+                # Anything could have changed while nobody was listening
+                self.versions.bump(movie_ids=None)
+                self.versions.synced = True
+                logger.info(f"Listening to the catalog changes on {self.channel}")
+                await closed.wait()
+                logger.warning("The connection listening to the catalog changes was closed")
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(f"Couldn't listen to the catalog changes: {e}")
+            finally:
+                self.versions.synced = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.retry_after)
+
+
+catalog_listener = CatalogListener()
@@ -1,5 +1,12 @@
+import asyncio
+import itertools
+import time
+
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config import (
     DATABASE_URL,
@@ -9,10 +16,19 @@ from config import (
     DATABASE_PORT,
     POOL_SIZE,
     POOL_MAX_OVERFLOW,
+    POOL_TIMEOUT,
+    POOL_WARM_UP,
+    PREPARED_STATEMENT_CACHE_SIZE,
     DATABASE_NAME,
     DEPLOY_ENVIRON,
     UNIX_SOCKET,
+    DATABASE_REPLICA_URLS,
+    REPLICA_RETRY_AFTER,
+    READ_YOUR_WRITES_WINDOW,
+    AUTHORIZATION_HEADER,
 )
+from core.cache import LRUCache
+from logger import logger
 
 if DEPLOY_ENVIRON == "GOOGLE":
     url: str = f"postgresql+asyncpg://{DATABASE_USER}:{DATABASE_PASSWORD}@/{DATABASE_NAME}?host={UNIX_SOCKET}"
@@ -20,25 +36,236 @@ else:
     url: str = DATABASE_URL.format(
         DATABASE_USER, DATABASE_PASSWORD, DATABASE_ENDPOINT, DATABASE_PORT, DATABASE_NAME
     )
-engine = create_async_engine(url=url, pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW)
 
 
-class SingletonEngine:
-    engine : AsyncEngine = None
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool that records how long the checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        connection = super()._do_get()
+        # It includes the time to connect when the pool has to open a new connection
+        waited = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        """Usage of the pool and the time waited by its checkouts, in seconds."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": self.checkouts,
+            "wait_avg": self.wait_total / self.checkouts if self.checkouts else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Creates an engine with the pool settings of the app.
+    :param url: SQLAlchemy URL of the database.
+    :return: The engine, it doesn't connect until it's used.
+    """
+    return create_async_engine(
+        url=url,
+        poolclass=TimedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        connect_args={
+            # Cache of the statements prepared by SQLAlchemy and by asyncpg itself
+            "prepared_statement_cache_size": PREPARED_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+class EngineManager:
+    """
+    Owns the engine of the primary database. It's created on first use, warmed up when the app
+    starts and disposed when it shuts down, together with the engines of the read replicas.
+    """
+
+    engine: AsyncEngine | None = None
+
+    @staticmethod
+    def get_engine() -> AsyncEngine:
+        if EngineManager.engine is None:
+            EngineManager.engine = create_engine(url=url)
+        return EngineManager.engine
+
+    @staticmethod
+    async def warm_up(connections: int = POOL_WARM_UP):
+        """
+        Opens pooled connections at once, so the first requests don't pay the connect cost.
+        A failure is logged and doesn't stop the app, the connections will be opened on demand.
+        :param connections: Number of connections to open, up to the pool size.
+        """
+        engine = EngineManager.get_engine()
+        pending = [engine.connect() for _ in range(min(connections, POOL_SIZE))]
+        results = await asyncio.gather(
+            *(connection.start() for connection in pending), return_exceptions=True
+        )
+        # Closing returns the connections to the pool, they stay open
+        await asyncio.gather(
+            *(connection.close() for connection in pending if connection.sync_connection)
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning(f"{len(errors)} connections couldn't be opened on startup: {errors[0]}")
+        logger.info(f"Database pool warmed up with {len(pending) - len(errors)} connections")
+
+    @staticmethod
+    async def dispose():
+        """Closes every pooled connection of the primary and of the read replicas."""
+        if EngineManager.engine is not None:
+            await EngineManager.engine.dispose()
+            EngineManager.engine = None
+        await replica_router.dispose()
+
     @staticmethod
-    def get_engine()-> AsyncEngine:
-        if SingletonEngine.engine is None:
-            SingletonEngine.engine = create_async_engine(url=url, pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW)
-        return SingletonEngine.engine
+    def pool_stats() -> dict | None:
+        """Usage of the pool of the primary, None until the engine is created."""
+        return EngineManager.engine.pool.stats() if EngineManager.engine else None
+
 
 SessionMaker = sessionmaker(class_=AsyncSession, autoflush=False)
 
 
-async def get_session():
+class ReplicaRouter:
+    """
+    Chooses the engine of the read sessions. The healthy replicas are used in turns, a replica
+    that fails is left out for REPLICA_RETRY_AFTER seconds, and the primary is used when no
+    replica is available. After a write, the reads of the same client go to the primary for
+    READ_YOUR_WRITES_WINDOW seconds, so the replication lag doesn't hide its own writes.
+    """
+
+    def __init__(
+        self,
+        replica_urls: list[str] = DATABASE_REPLICA_URLS,
+        retry_after: float = REPLICA_RETRY_AFTER,
+        read_your_writes_window: float = READ_YOUR_WRITES_WINDOW,
+    ):
+        self.replica_urls = replica_urls
+        self.retry_after = retry_after
+        self.read_your_writes_window = read_your_writes_window
+        self.engines: dict[int, AsyncEngine] = {}
+        self.unhealthy_until: dict[int, float] = {}
+        self.recent_writers = LRUCache(max_entries=10000)
+        self._turns = itertools.cycle(range(len(replica_urls)))
+
+    def get_engine(self, client: str | None) -> tuple[AsyncEngine, int | None]:
+        """
+        Chooses the engine for a read.
+        :param client: Key of the client, e.g. its token.
+        :return: Tuple with the engine and the index of the replica, None if it's the primary.
+        """
+        if client is not None and self.recent_writers.get(client):
+            return EngineManager.get_engine(), None
+        now = time.monotonic()
+        for _ in range(len(self.replica_urls)):
+            replica = next(self._turns)
+            if self.unhealthy_until.get(replica, 0) <= now:
+                return self._get_replica_engine(replica), replica
+        return EngineManager.get_engine(), None
+
+    def _get_replica_engine(self, replica: int) -> AsyncEngine:
+        if replica not in self.engines:
+            self.engines[replica] = create_engine(url=self.replica_urls[replica])
+        return self.engines[replica]
+
+    def mark_failed(self, replica: int):
+        """Leaves a replica out until the retry time passes."""
+        logger.warning(f"Read replica {replica} failed, using the others for {self.retry_after}s")
+        self.unhealthy_until[replica] = time.monotonic() + self.retry_after
+
+    def mark_write(self, client: str | None):
+        """Sends the next reads of a client to the primary."""
+        if client is not None and self.read_your_writes_window > 0:
+            self.recent_writers.set(client, True, ttl=self.read_your_writes_window)
+
+    async def dispose(self):
+        """Closes the pooled connections of the replicas."""
+        for engine in self.engines.values():
+            await engine.dispose()
+        self.engines.clear()
+
+    def status(self) -> dict:
+        """Health of every replica and the usage of its pool, if it has been used."""
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "replica": replica,
+                    "healthy": self.unhealthy_until.get(replica, 0) <= now,
+                    "pool": self.engines[replica].pool.stats() if replica in self.engines else None,
+                }
+                for replica in range(len(self.replica_urls))
+            ],
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+def get_client_key(request: Request | None) -> str | None:
+    """Identifies the client of a request by its token, or by its address without one."""
+    if request is None:
+        return None
+    token = request.headers.get(AUTHORIZATION_HEADER)
+    if token:
+        return token
+    return request.client.host if request.client else None
+
+
+async def get_session(request: Request = None):
     """
     Create a new session.
+    :param request: Request using the session, its client reads from the primary for a while
+    after an unsafe method (POST, DELETE...) is completed.
     :return:
     """
-    engine = SingletonEngine.get_engine()
+    engine = EngineManager.get_engine()
     async with SessionMaker(bind=engine) as session:
-        yield session
+        try:
+            yield session
+        finally:
+            # Even a failed or cancelled request may have written, e.g. through a shared insert
+            if request is not None and request.method not in ("GET", "HEAD", "OPTIONS"):
+                replica_router.mark_write(get_client_key(request))
+
+
+async def get_read_session(request: Request = None):
+    """
+    Create a new session for reads, bound to a replica if there is a healthy one.
+    :param request: Request using the session, it identifies the client for read-your-writes.
+    :return:
+    """
+    engine, replica = replica_router.get_engine(client=get_client_key(request))
+    session: AsyncSession = SessionMaker(bind=engine)
+    if replica is not None:
+        try:
+            # Checking out the connection now allows falling back to the primary
+            await session.connection()
+        except (DBAPIError, OSError):
+            await session.close()
+            replica_router.mark_failed(replica)
+            replica = None
+            session = SessionMaker(bind=EngineManager.get_engine())
+    async with session:
+        try:
+            yield session
+        except DBAPIError as e:
+            if replica is not None and e.connection_invalidated:
+                replica_router.mark_failed(replica)
+            raise
@@ -1,4 +1,6 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+
+from sqlalchemy import select, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from repositories.database.models.user import User
@@ -11,15 +13,15 @@ class UserDatabaseRepository:
     @staticmethod
     async def create(session: AsyncSession, user: UserData) -> User:
         """
-        Inserts a new user in the database.
+        Inserts a new user in the database, the row comes back from INSERT ... RETURNING.
         :param session: The database session to use for the query.
         :param user: The user to insert.
+        :return: The inserted user, detached from the session.
         """
-        user_to_create: User = User(**user.model_dump())
-        session.add(user_to_create)
+        query = insert(User).values(user.model_dump()).returning(*User.__table__.columns)
+        row = (await session.execute(query)).mappings().one()
         await session.commit()
-        query = select(User).where(User.username == user.username)
-        return (await session.execute(query)).scalar_one_or_none()
+        return User(**row)
 
     @staticmethod
     async def get_by_username(session: AsyncSession, username: str) -> User | None:
@@ -31,3 +33,23 @@ class UserDatabaseRepository:
         """
         query = select(User).where(User.username == username)
         return (await session.execute(query)).scalar_one_or_none()
+
+    @staticmethod
+    async def revoke_tokens(session: AsyncSession, username: str) -> bool:
+        """
+        Revokes every token issued to a user until now. The time comes from the clock of the app
+        that issues the tokens, the one of the database may be skewed or be the start of the
+        transaction.
+        :param session: The database session to use for the query.
+        :param username: username of the user
+        :return: Whether the user exists.
+        """
+        query = (
+            update(User)
+            .where(User.username == username)
+            .values(tokens_valid_after=datetime.now(timezone.utc))
+            .returning(User.id)
+        )
+        revoked = (await session.execute(query)).scalar_one_or_none() is not None
+        await session.commit()
+        return revoked
@@ -1,36 +1,313 @@
 import asyncio
+import importlib.util
 import math
-from typing import Type, TypeVar
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Type, TypeVar, Awaitable, Callable, AsyncIterator
 
+import orjson
 from fastapi import status
-from httpx import Response, AsyncClient
+from httpx import Response, AsyncClient, HTTPError, Limits, Timeout
 from pydantic import BaseModel
 
-from config import OMDB_API_URL, OMDB_API_KEY, MAX_TOTAL_PAGES, RESULTS_PER_PAGE, TYPE_MOVIE
+from config import (
+    OMDB_API_URL,
+    OMDB_API_KEY,
+    MAX_TOTAL_PAGES,
+    RESULTS_PER_PAGE,
+    TYPE_MOVIE,
+    OMDB_MAX_CONCURRENCY,
+    OMDB_REQUESTS_PER_SECOND,
+    OMDB_BURST_SIZE,
+    OMDB_TIMEOUT,
+    OMDB_CONNECT_TIMEOUT,
+    OMDB_MAX_CONNECTIONS,
+    OMDB_MAX_KEEPALIVE_CONNECTIONS,
+    OMDB_KEEPALIVE_EXPIRY,
+    OMDB_HTTP2,
+    OMDB_CACHE_ENABLED,
+    OMDB_MAX_RETRIES,
+    OMDB_RETRY_BACKOFF_BASE,
+    OMDB_RETRY_BACKOFF_MAX,
+    OMDB_HEDGE_DELAY,
+    OMDB_BREAKER_FAILURE_THRESHOLD,
+    OMDB_BREAKER_RESET_TIMEOUT,
+)
 from exceptions.omdb_repository_exceptions import (
+    OmdbRepositoryException,
     OmdbRepositoryUnauthorizedException,
     OmdbRepositoryBadRequestException,
     OmdbRepositoryNotFoundException,
     OmdbRepositoryInternalServerErrorException,
     OmdbRepositoryInvalidResponseFormatException,
+    OmdbRepositoryUnavailableException,
+    OmdbRepositoryQuotaExceededException,
+)
+from core.single_flight import SingleFlight
+from logger import logger
+from repositories.external.omdb_cache import OmdbCache, OMDB_NOT_FOUND_ERROR
+from schemas.responses.omdb import (
+    MovieSearchResponse,
+    MovieImdbResponse,
+    MovieImdbBatchResponse,
+    FailedImdbFetch,
 )
-from schemas.responses.omdb import MovieSearchResponse, MovieImdbResponse
 
 T = TypeVar("T", bound=BaseModel)
 
+# Status codes worth retrying, any other response is a final answer from OMDB.
+TRANSIENT_STATUS_CODES = {
+    status.HTTP_429_TOO_MANY_REQUESTS,
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    status.HTTP_502_BAD_GATEWAY,
+    status.HTTP_503_SERVICE_UNAVAILABLE,
+    status.HTTP_504_GATEWAY_TIMEOUT,
+}
+
+
+class TokenBucket:
+    """Limits the rate of the requests, allowing bursts up to the capacity of the bucket."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        :param rate: Tokens refilled per second.
+        :param capacity: Maximum number of tokens that can be stored.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = float(capacity)
+        self._updated_at: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available and consumes it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._updated_at
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RetryPolicy:
+    """How the idempotent requests to OMDB are retried and hedged."""
+
+    def __init__(
+        self,
+        max_retries: int = OMDB_MAX_RETRIES,
+        backoff_base: float = OMDB_RETRY_BACKOFF_BASE,
+        backoff_max: float = OMDB_RETRY_BACKOFF_MAX,
+        hedge_delay: float = OMDB_HEDGE_DELAY,
+    ):
+        """
+        :param max_retries: Retries after the first attempt.
+        :param backoff_base: Seconds of the first backoff, it doubles on every retry.
+        :param backoff_max: Upper bound of the backoff in seconds.
+        :param hedge_delay: Seconds to wait before sending a duplicate request, 0 disables it.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_delay = hedge_delay
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter.
+        :param attempt: Number of the failed attempt, starting at 0.
+        :return: Seconds to wait before the next attempt.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to OMDB after consecutive failed requests, each one counted once its
+    retries run out. Once the reset timeout has passed a single trial request is allowed, if it
+    succeeds the circuit closes again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = OMDB_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = OMDB_BREAKER_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures: int = 0
+        self._opened_at: float | None = None
+        # A trial that never reports back (e.g. cancelled) doesn't block the circuit forever.
+        self._trial_started_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a request can be sent, in half open state only one trial is allowed."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            if self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = now
+                return True
+        return False
+
+    def record_success(self):
+        """Closes the circuit."""
+        if self._opened_at is not None:
+            logger.info("OMDB circuit breaker closed")
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self):
+        """Opens the circuit if the threshold is reached or the trial request failed."""
+        self.consecutive_failures += 1
+        self._trial_started_at = None
+        if self._opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"OMDB circuit breaker opened for {self.reset_timeout} seconds")
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """State of the circuit."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+        }
+
+
+class RequestScheduler:
+    """
+    Bounds how many requests are in flight at the same time and how many are sent per second.
+    Every request to OMDB goes through the same scheduler, so the limits are global.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = OMDB_MAX_CONCURRENCY,
+        requests_per_second: float = OMDB_REQUESTS_PER_SECOND,
+        burst_size: int = OMDB_BURST_SIZE,
+        request_budget: int | None = None,
+    ):
+        """
+        :param max_concurrency: Maximum number of requests in flight.
+        :param requests_per_second: Maximum rate of requests, 0 disables the rate limit.
+        :param burst_size: Requests that can be sent at once before the rate limit applies.
+        :param request_budget: Maximum number of requests to send in total, e.g. a daily quota.
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket: TokenBucket | None = None
+        if requests_per_second > 0:
+            self._bucket = TokenBucket(rate=requests_per_second, capacity=max(burst_size, 1))
+        self.request_budget = request_budget
+        self.requests_sent: int = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserves a slot to send one request."""
+        async with self._semaphore:
+            if self.request_budget is not None and self.requests_sent >= self.request_budget:
+                raise OmdbRepositoryQuotaExceededException(
+                    detail={"error": f"The budget of {self.request_budget} requests is spent"}
+                )
+            if self._bucket:
+                await self._bucket.acquire()
+            self.requests_sent += 1
+            yield
+
+    @staticmethod
+    async def run_isolated(
+        keys: list[str], fetch: Callable[[str], Awaitable[T]]
+    ) -> tuple[list[T], list[FailedImdbFetch]]:
+        """
+        Runs fetch for every key, a failure only affects its own key instead of the whole batch.
+        :param keys: Keys to fetch, e.g. imdb_ids.
+        :param fetch: Coroutine function that fetches a single key.
+        :return: Tuple with the successful results (in the same order as keys) and the failures.
+        """
+
+        async def isolated_fetch(key: str) -> T | FailedImdbFetch:
+            try:
+                return await fetch(key)
+            except OmdbRepositoryException as e:
+                return FailedImdbFetch(imdb_id=key, status_code=e.status_code, detail=e.detail)
+            except HTTPError as e:
+                logger.warning(f"Request to OMDB failed for {key}: {str(e)}")
+                return FailedImdbFetch(
+                    imdb_id=key,
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail={"error": str(e)},
+                )
+
+        responses = await asyncio.gather(*[isolated_fetch(key) for key in keys])
+        results: list[T] = []
+        failures: list[FailedImdbFetch] = []
+        for response in responses:
+            if isinstance(response, FailedImdbFetch):
+                failures.append(response)
+            else:
+                results.append(response)
+        return results, failures
+
 
 class OmdbRepository:
     """Repository to make requests to the OMDB API"""
 
-    # Since most of the methods here are intended only to be used at the start of the application
-    # they can share one client. Only one method will use its own client.
-    # The purpose of this client is to make asynchronous HTTP requests.
-    client: AsyncClient
+    # Pooled client shared by every method, it's created and closed in the lifespan of the app so
+    # the connections to OMDB are kept alive between requests.
+    client: AsyncClient | None = None
+    # Created lazily, so it's bound to the event loop that uses the client.
+    scheduler: RequestScheduler | None = None
+    cache: OmdbCache | None = OmdbCache() if OMDB_CACHE_ENABLED else None
+    # Identical requests in flight at the same time share one upstream request.
+    in_flight: SingleFlight = SingleFlight()
+    retry_policy: RetryPolicy = RetryPolicy()
+    breaker: CircuitBreaker = CircuitBreaker()
+
+    @staticmethod
+    def create_client() -> AsyncClient:
+        """
+        Creates a pooled client configured for OMDB. The caller is responsible for closing it.
+        :return: A new AsyncClient
+        """
+        http2 = bool(OMDB_HTTP2)
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+        return AsyncClient(
+            timeout=Timeout(OMDB_TIMEOUT, connect=OMDB_CONNECT_TIMEOUT),
+            limits=Limits(
+                max_connections=OMDB_MAX_CONNECTIONS,
+                max_keepalive_connections=OMDB_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=OMDB_KEEPALIVE_EXPIRY,
+            ),
+            http2=http2,
+        )
 
     @classmethod
-    def set_client(cls, client: AsyncClient):
+    def set_client(cls, client: AsyncClient | None):
         """Sets the AsyncClient for the repository."""
         cls.client = client
+        cls.scheduler = None
 
     @classmethod
     def get_client(cls) -> AsyncClient:
@@ -39,17 +316,53 @@ class OmdbRepository:
             raise ValueError("Client has not been set.")
         return cls.client
 
+    @classmethod
+    def set_scheduler(cls, scheduler: RequestScheduler):
+        """Sets the scheduler, e.g. to apply a request budget."""
+        cls.scheduler = scheduler
+
+    @classmethod
+    def get_scheduler(cls) -> RequestScheduler:
+        """Gets the scheduler shared by every request of the repository."""
+        if cls.scheduler is None:
+            cls.scheduler = RequestScheduler()
+        return cls.scheduler
+
+    @classmethod
+    def set_cache(cls, cache: OmdbCache | None):
+        """Sets the cache for the repository, None disables it."""
+        cls.cache = cache
+
+    @classmethod
+    def set_resilience(cls, retry_policy: RetryPolicy, breaker: CircuitBreaker):
+        """Sets how failed requests are retried and when OMDB is considered unavailable."""
+        cls.retry_policy = retry_policy
+        cls.breaker = breaker
+
+    @classmethod
+    def status(cls) -> dict:
+        """State of the circuit breaker and usage of the cache."""
+        return {
+            "circuit_breaker": cls.breaker.stats(),
+            "cache": cls.cache.stats() if cls.cache else None,
+        }
+
     @staticmethod
-    async def get_movies_by_imdb_ids(imdb_ids: list[str]) -> list[MovieImdbResponse]:
+    async def get_movies_by_imdb_ids(imdb_ids: list[str]) -> MovieImdbBatchResponse:
         """
-        Fetches all the movies data using imdb_ids
+        Fetches all the movies data using imdb_ids. The requests are bounded by the scheduler and
+        a failed movie doesn't abort the rest of the batch.
 
         :param imdb_ids: list of imdb_id
-        :return: List of movies
+        :return: The fetched movies and the imdb_ids that couldn't be fetched.
         """
-        tasks = [OmdbRepository._fetch_movie_by_imdb_id(imdb_id=imdb_id) for imdb_id in imdb_ids]
-        movies_responses: list[MovieImdbResponse] = await asyncio.gather(*tasks)
-        return movies_responses
+        movies, failures = await RequestScheduler.run_isolated(
+            keys=imdb_ids,
+            fetch=lambda imdb_id: OmdbRepository._fetch_movie_by_imdb_id(imdb_id=imdb_id),
+        )
+        if failures:
+            logger.warning(f"{len(failures)} of {len(imdb_ids)} movies couldn't be fetched")
+        return MovieImdbBatchResponse(movies=movies, failures=failures)
 
     @staticmethod
     async def get_movies_by_search(search_term: str) -> list[str]:
@@ -62,11 +375,7 @@ class OmdbRepository:
         first_page_results: MovieSearchResponse = await OmdbRepository._fetch_page_by_search_term(
             search_term=search_term, page=1
         )
-
-        # Extract total number of results and calculate number of pages needed
-        total_results: int = int(first_page_results.total_results)
-        # Ensure we fetch at most 10 pages
-        total_pages: int = int(min(math.ceil(total_results / RESULTS_PER_PAGE), MAX_TOTAL_PAGES))
+        total_pages: int = OmdbRepository._count_pages(first_page_results)
 
         # Fetch remaining pages concurrently
         tasks = [
@@ -82,6 +391,61 @@ class OmdbRepository:
 
         return imdb_ids
 
+    @staticmethod
+    async def stream_movies_by_search(
+        search_term: str, max_pages: int = MAX_TOTAL_PAGES
+    ) -> AsyncIterator[list[str]]:
+        """
+        Same as get_movies_by_search, but yields the imdb_ids of every page as soon as it arrives
+        instead of waiting for all of them.
+        :param search_term: The term to search within movie titles.
+        :param max_pages: Maximum number of pages to fetch.
+        :return: Async iterator of the imdb_ids of every page, in order of arrival.
+        """
+        first_page_results: MovieSearchResponse = await OmdbRepository._fetch_page_by_search_term(
+            search_term=search_term, page=1
+        )
+        yield [movie.imdb_id for movie in first_page_results.movies]
+
+        total_pages: int = OmdbRepository._count_pages(first_page_results, max_pages=max_pages)
+        tasks = [
+            asyncio.ensure_future(
+                OmdbRepository._fetch_page_by_search_term(search_term=search_term, page=page)
+            )
+            for page in range(2, total_pages + 1)
+        ]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                response: MovieSearchResponse = await next_page
+                yield [movie.imdb_id for movie in response.movies]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _count_pages(
+        first_page_results: MovieSearchResponse, max_pages: int = MAX_TOTAL_PAGES
+    ) -> int:
+        """
+        Calculates the number of pages to fetch.
+        :param first_page_results: First page of a search.
+        :param max_pages: Maximum number of pages to fetch.
+        :return: Number of pages, including the first one.
+        """
+        # Extract total number of results and calculate number of pages needed
+        total_results: int = int(first_page_results.total_results)
+        # Ensure we fetch at most max_pages pages
+        return int(min(math.ceil(total_results / RESULTS_PER_PAGE), max_pages))
+
+    @staticmethod
+    async def get_movie_by_imdb_id(imdb_id: str) -> MovieImdbResponse:
+        """
+        Retrieves a movie using its imdb_id.
+        :param imdb_id: imdb_id of the movie to retrieve.
+        :return: Response with movie info.
+        """
+        return await OmdbRepository._fetch_movie_by_imdb_id(imdb_id=imdb_id)
+
     @staticmethod
     async def get_movie_by_title(title: str) -> MovieImdbResponse:
         """
@@ -89,12 +453,12 @@ class OmdbRepository:
         :param title: Title of the movie to retrieve.
         :return: Response with movie info.
         """
-        params = {"t": title, "apikey": OMDB_API_KEY, "type": TYPE_MOVIE}
-        async with AsyncClient() as client:
-            response: Response = await client.get(url=OMDB_API_URL, params=params)
-        response_body = response.json()
+        params = {"t": title, "type": TYPE_MOVIE}
+        status_code, response_body = await OmdbRepository._get_cached(
+            query_type="title", params=params
+        )
         validated_movie_response = OmdbRepository._validate_response(
-            response.status_code, response_body, MovieImdbResponse
+            status_code, response_body, MovieImdbResponse
         )
         return validated_movie_response
 
@@ -107,12 +471,12 @@ class OmdbRepository:
         :return: Response given by OMDB.
         """
         """Fetches a single page of results and returns a structured response."""
-        client = OmdbRepository.get_client()
-        params = {"s": search_term, "apikey": OMDB_API_KEY, "page": page, "type": TYPE_MOVIE}
-        response: Response = await client.get(url=OMDB_API_URL, params=params)
-        response_body = response.json()
+        params = {"s": search_term, "page": page, "type": TYPE_MOVIE}
+        status_code, response_body = await OmdbRepository._get_cached(
+            query_type="search", params=params
+        )
         validated_movies_response = OmdbRepository._validate_response(
-            response.status_code, response_body, MovieSearchResponse
+            status_code, response_body, MovieSearchResponse
         )
         return validated_movies_response
 
@@ -122,16 +486,139 @@ class OmdbRepository:
         Fetch a movie by its imdb_id
         :return: Response given by OMDB.
         """
-        client = OmdbRepository.get_client()
-        params = {"i": imdb_id, "apikey": OMDB_API_KEY, "type": TYPE_MOVIE}
-        response: Response = await client.get(url=OMDB_API_URL, params=params)
-        response_body = response.json()
+        params = {"i": imdb_id, "type": TYPE_MOVIE}
+        status_code, response_body = await OmdbRepository._get_cached(
+            query_type="imdb_id", params=params
+        )
         validated_movie_response = OmdbRepository._validate_response(
-            response.status_code, response_body, MovieImdbResponse
+            status_code, response_body, MovieImdbResponse
         )
 
         return validated_movie_response
 
+    @staticmethod
+    async def _get_cached(query_type: str, params: dict) -> tuple[int, dict]:
+        """
+        Returns the cached body of a request if there is one, otherwise sends the request and
+        caches its body. Concurrent identical requests are coalesced into one.
+        :param query_type: Kind of query, it's part of the key of the cache.
+        :param params: Query params of the request.
+        :return: Tuple with the status code and the parsed JSON body.
+        """
+        key = OmdbCache.build_key(query_type=query_type, params=params)
+        cache = OmdbRepository.cache
+        if cache:
+            cached_body = await cache.get(key)
+            if cached_body is not None:
+                return status.HTTP_200_OK, cached_body
+        try:
+            return await OmdbRepository.in_flight.do(
+                key, lambda: OmdbRepository._get_and_cache(key=key, params=params)
+            )
+        except OmdbRepositoryUnavailableException:
+            # While OMDB is unavailable an expired body is better than no body at all.
+            stale_body = await cache.get(key, allow_stale=True) if cache else None
+            if stale_body is None:
+                raise
+            logger.info(f"Serving a stale OMDB response from the cache: {key}")
+            return status.HTTP_200_OK, stale_body
+
+    @staticmethod
+    async def _get_and_cache(key: str, params: dict) -> tuple[int, dict]:
+        """
+        Sends the request and caches its body.
+        :param key: Key of the cache entry.
+        :param params: Query params of the request.
+        :return: Tuple with the status code and the parsed JSON body.
+        """
+        response: Response = await OmdbRepository._get(params=params)
+        try:
+            response_body = orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise OmdbRepositoryInvalidResponseFormatException(
+                detail={"status_code": response.status_code, "error": str(e)}
+            )
+        if OmdbRepository.cache and response.status_code == status.HTTP_200_OK:
+            await OmdbRepository.cache.set(key, response_body)
+        return response.status_code, response_body
+
+    @staticmethod
+    async def _get(params: dict) -> Response:
+        """
+        Sends a request to OMDB retrying the transient failures with a jittered exponential
+        backoff. Fails fast while the circuit breaker is open.
+        :param params: Query params of the request, the api key is added here.
+        :return: Raw response given by OMDB.
+        :raises OmdbRepositoryUnavailableException: If the transient failures outlast the retries.
+        """
+        retry_policy = OmdbRepository.retry_policy
+        breaker = OmdbRepository.breaker
+        error: str = ""
+        for attempt in range(retry_policy.max_retries + 1):
+            if not breaker.allow_request():
+                if attempt:
+                    # The circuit opened while retrying, e.g. a half open trial failed
+                    breaker.record_failure()
+                raise OmdbRepositoryUnavailableException(
+                    detail={"error": "OMDB is unavailable", "circuit_breaker": breaker.state}
+                )
+            try:
+                response: Response = await OmdbRepository._send(params=params)
+            except HTTPError as e:
+                error = f"{type(e).__name__}: {str(e)}"
+            else:
+                if response.status_code not in TRANSIENT_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                error = f"status code {response.status_code}"
+            if attempt < retry_policy.max_retries:
+                logger.info(f"Retrying OMDB request after a transient failure: {error}")
+                await asyncio.sleep(retry_policy.backoff(attempt))
+        # A request counts as a single failure however many times it was retried
+        breaker.record_failure()
+        raise OmdbRepositoryUnavailableException(detail={"error": error})
+
+    @staticmethod
+    async def _send(params: dict) -> Response:
+        """
+        Sends a request, and a duplicate one if the hedge delay passes without a response. The
+        first successful response wins and the other request is cancelled.
+        :param params: Query params of the request.
+        :return: Raw response given by OMDB.
+        """
+        hedge_delay = OmdbRepository.retry_policy.hedge_delay
+        if hedge_delay <= 0:
+            return await OmdbRepository._send_once(params=params)
+        pending = {asyncio.ensure_future(OmdbRepository._send_once(params=params))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                pending.add(asyncio.ensure_future(OmdbRepository._send_once(params=params)))
+            error: BaseException | None = None
+            while done or pending:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _send_once(params: dict) -> Response:
+        """
+        Sends a single request using the shared client once the scheduler allows it.
+        :param params: Query params of the request, the api key is added here.
+        :return: Raw response given by OMDB.
+        """
+        client = OmdbRepository.get_client()
+        async with OmdbRepository.get_scheduler().slot():
+            return await client.get(url=OMDB_API_URL, params={**params, "apikey": OMDB_API_KEY})
+
     @staticmethod
     def _validate_response(status_code: int, response_body: dict, model: Type[T]) -> T:
         """
@@ -143,10 +630,12 @@ class OmdbRepository:
         """
         if status_code == status.HTTP_200_OK:
             try:
+                if model is MovieImdbResponse:
+                    return MovieImdbResponse.from_omdb(response_body)
                 return model.model_validate(response_body)
             except ValueError as e:
                 # OMDB Return 200 for 404
-                if "Error" in response_body and response_body["Error"] == "Movie not found!":
+                if "Error" in response_body and response_body["Error"] == OMDB_NOT_FOUND_ERROR:
                     raise OmdbRepositoryNotFoundException(detail=response_body)
                 raise OmdbRepositoryInvalidResponseFormatException(detail={"error": str(e)})
         elif status_code == status.HTTP_401_UNAUTHORIZED:
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+from config import (
+    OMDB_CACHE_MAX_ENTRIES,
+    OMDB_CACHE_TTL,
+    OMDB_CACHE_NEGATIVE_TTL,
+    OMDB_CACHE_DISK_PATH,
+)
+from core.cache import LRUCache
+
+OMDB_NOT_FOUND_ERROR = "Movie not found!"
+
+
+class DiskCache:
+    """On-disk tier backed by SQLite, the entries survive restarts of the app."""
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the SQLite file, it's created if it doesn't exist.
+        """
+        self.path = path
+        self.hits: int = 0
+        self.misses: int = 0
+        # The queries run in worker threads to avoid blocking the event loop.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS omdb_cache "
+            "(key TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    async def get(self, key: str, allow_stale: bool = False) -> tuple[dict, float] | None:
+        """
+        Retrieves a body if it exists and hasn't expired.
+        :param key: Key of the entry.
+        :param allow_stale: Whether to return the body even if it has expired.
+        :return: Tuple with the body and the remaining seconds to live if found, otherwise None.
+        """
+        row = await asyncio.to_thread(self._select, key)
+        if row is None or (row[1] <= time.time() and not allow_stale):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), row[1] - time.time()
+
+    async def set(self, key: str, body: dict, ttl: float):
+        """
+        Stores a body.
+        :param key: Key of the entry.
+        :param body: JSON body to store.
+        :param ttl: Seconds until the entry expires.
+        """
+        await asyncio.to_thread(self._upsert, key, json.dumps(body), time.time() + ttl)
+
+    def _select(self, key: str) -> tuple[str, float] | None:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT body, expires_at FROM omdb_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _upsert(self, key: str, body: str, expires_at: float):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO omdb_cache (key, body, expires_at) VALUES (?, ?, ?)",
+                (key, body, expires_at),
+            )
+            self._connection.commit()
+
+    def stats(self) -> dict:
+        """Counters of the cache usage."""
+        return {"path": self.path, "hits": self.hits, "misses": self.misses}
+
+
+class OmdbCache:
+    """
+    Two tiers cache of OMDB response bodies. The in-memory tier is checked first, then the optional
+    on-disk tier. "Movie not found!" responses are cached too, with their own TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = OMDB_CACHE_MAX_ENTRIES,
+        ttl: float = OMDB_CACHE_TTL,
+        negative_ttl: float = OMDB_CACHE_NEGATIVE_TTL,
+        disk_path: str | None = OMDB_CACHE_DISK_PATH,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory = LRUCache(max_entries=max_entries)
+        self.disk: DiskCache | None = DiskCache(path=disk_path) if disk_path else None
+
+    @staticmethod
+    def build_key(query_type: str, params: dict) -> str:
+        """
+        Builds the key of a request, the api key must not be part of the params.
+        :param query_type: Kind of query, e.g. "title", "imdb_id" or "search".
+        :param params: Query params of the request.
+        :return: Key of the cache entry.
+        """
+        return f"{query_type}:{urlencode(sorted(params.items()))}"
+
+    async def get(self, key: str, allow_stale: bool = False) -> dict | None:
+        """
+        Retrieves a cached body, promoting to memory the entries found on disk.
+        :param key: Key of the entry.
+        :param allow_stale: Whether to return expired bodies, e.g. while OMDB is unavailable.
+        :return: The body if found, otherwise None.
+        """
+        body = self.memory.get(key, allow_stale=allow_stale)
+        if body is not None or self.disk is None:
+            return body
+        disk_entry = await self.disk.get(key, allow_stale=allow_stale)
+        if disk_entry is None:
+            return None
+        body, remaining_ttl = disk_entry
+        if remaining_ttl > 0:
+            self.memory.set(key, body, ttl=remaining_ttl)
+        return body
+
+    async def set(self, key: str, body: dict):
+        """
+        Stores a successful body or a "Movie not found!" one, any other error is not cached.
+        :param key: Key of the entry.
+        :param body: JSON body returned by OMDB with a 200 status code.
+        """
+        if body.get("Response") == "True":
+            ttl = self.ttl
+        elif body.get("Error") == OMDB_NOT_FOUND_ERROR:
+            ttl = self.negative_ttl
+        else:
+            return
+        if ttl <= 0:
+            return
+        self.memory.set(key, body, ttl=ttl)
+        if self.disk:
+            await self.disk.set(key, body, ttl=ttl)
+
+    def stats(self) -> dict:
+        """Counters of the cache usage for every tier."""
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk else None,
+        }
@@ -1,17 +1,78 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from config import TAG_HEALTHCHECK
-from core.deps import SessionDep
+from core.deps import ReadSessionDep, get_current_user_admin
 from services.health import HealthService
 
 router = APIRouter()
 
 
 @router.post("/", tags=[TAG_HEALTHCHECK], status_code=status.HTTP_200_OK)
-async def healthcheck(session: SessionDep):
+async def healthcheck(session: ReadSessionDep):
     """
     Checks the health status.
-    :param session: A database session
+    :param session: A database session, bound to a read replica if there is a healthy one
     :return: 200 OK
     """
     return await HealthService.healtcheck(session=session)
+
+
+@router.get(
+    "/omdb",
+    tags=[TAG_HEALTHCHECK],
+    dependencies=[Depends(get_current_user_admin)],
+    status_code=status.HTTP_200_OK,
+)
+async def omdb_status() -> dict:
+    """
+    Reports the state of the OMDB circuit breaker and the usage of its cache.
+    :return: OMDB status
+    """
+    return HealthService.omdb_status()
+
+
+@router.get(
+    "/database",
+    tags=[TAG_HEALTHCHECK],
+    dependencies=[Depends(get_current_user_admin)],
+    status_code=status.HTTP_200_OK,
+)
+async def database_status() -> dict:
+    """
+    Reports the usage of the connection pools: size, checked out connections, overflow and the
+    time waited for a connection. It also reports which read replicas are healthy, the reads use
+    the primary while none is.
+    :return: Database status
+    """
+    return HealthService.database_status()
+
+
+@router.get(
+    "/cache",
+    tags=[TAG_HEALTHCHECK],
+    dependencies=[Depends(get_current_user_admin)],
+    status_code=status.HTTP_200_OK,
+)
+async def cache_status() -> dict | None:
+    """
+    Reports the hits, misses and hit ratio of the cache of the movie reads, for the single movies
+    and for the pages, and the entries and memory of its storage.
+    :return: Cache status, null if the cache is disabled
+    """
+    return await HealthService.cache_status()
+
+
+@router.get(
+    "/passwords",
+    tags=[TAG_HEALTHCHECK],
+    dependencies=[Depends(get_current_user_admin)],
+    status_code=status.HTTP_200_OK,
+)
+async def password_hasher_status() -> dict:
+    """
+    Reports the load of the workers hashing passwords, processes by default (see
+    PASSWORD_HASH_EXECUTOR): passwords pending, completed and rejected because the queue was full,
+    and the time waited for a worker and spent hashing.
+    :return: Password hasher status
+    """
+    return HealthService.password_hasher_status()
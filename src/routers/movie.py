@@ -1,65 +1,182 @@
-from fastapi import APIRouter, status, Depends
+from typing import Literal
 
-from config import TAG_MOVIE, API_V1
-from core.deps import SessionDep, CurrentUserDep, \
-    CurrentAdminDep, get_current_user, get_current_user_admin
+from fastapi import APIRouter, status, Depends, Query, Request
+
+from config import (
+    TAG_MOVIE,
+    API_V1,
+    COUNT_EXACT,
+    SEARCH_MODE_FULLTEXT,
+    ORDER_TYPE_ASC,
+    MOVIE_CACHE_CONTROL,
+)
+from core.deps import (
+    SessionDep,
+    ReadSessionDep,
+    CurrentUserDep,
+    CurrentAdminDep,
+    get_current_user,
+    get_current_user_admin,
+    CatalogETagDep,
+    MovieETagDep,
+)
+from core.responses import PydanticJSONResponse
+from repositories.database.session_factory import replica_router, get_client_key
 from schemas.requests.insert_movies import InsertTitleBody
 from schemas.responses.movie import MoviesResponse, SingleMovieResponse
+from schemas.shared.movie_filter import MovieFilter, MovieSort
 from schemas.shared.pagination_filter import Pagination
+from schemas.shared.search_filter import SearchFilter
 from services.movie import MovieService
 
 router = APIRouter(prefix=f"/api/{API_V1}/movies", tags=[TAG_MOVIE])
+# Text parameters are stripped by their schemas, a blank one must be rejected here with a 422
+NOT_BLANK = r"\S"
+
+
+def _cache_headers(etag: str | None) -> dict[str, str]:
+    """Headers of a movie read, the clients revalidate it with If-None-Match."""
+    if etag is None:
+        return {"Cache-Control": MOVIE_CACHE_CONTROL}
+    return {"ETag": etag, "Cache-Control": MOVIE_CACHE_CONTROL}
 
 
 @router.post(
     "",
     dependencies=[Depends(get_current_user)],
     status_code=status.HTTP_201_CREATED,
+    response_model=SingleMovieResponse,
 )
-async def insert_movie_by_title(session: SessionDep, body: InsertTitleBody) -> SingleMovieResponse:
+async def insert_movie_by_title(request: Request, body: InsertTitleBody) -> PydanticJSONResponse:
     """
     Searches movies with given title in OMDB and stores them in our database.
     When filtering only by title, OMDB will return only one result, even if there exists more with
     the same title.
-    :param session: A database session.
+    :param request: The request, its client reads from the primary for a while afterwards.
     :param body: The title that movies should match exactly.
     :return: The inserted movies if there is some.
     """
+    try:
+        movie = await MovieService.insert_movie_by_title(title=body.title)
+    finally:
+        # The insert has a session of its own and may be shared, even a failed request may have
+        # waited for a successful one
+        replica_router.mark_write(get_client_key(request))
+    return PydanticJSONResponse(content=movie, status_code=status.HTTP_201_CREATED)
 
-    return await MovieService.insert_movie_by_title(session=session, title=body.title)
 
-
-@router.get("", dependencies=[Depends(get_current_user)])
+# The movie reads return PydanticJSONResponse, the models built by the service are encoded once
+# by pydantic-core instead of being validated again and encoded by jsonable_encoder.
+@router.get("", dependencies=[Depends(get_current_user)], response_model=MoviesResponse)
 async def get_movies(
-    session: SessionDep,
+    etag: CatalogETagDep,
+    session: ReadSessionDep,
     title: str | None = None,
     page: int = 1,
     page_size: int = 10,
-) -> MoviesResponse:
+    cursor: str | None = None,
+    count: Literal["exact", "estimated"] = COUNT_EXACT,
+    search: str | None = Query(default=None, min_length=1, max_length=200, pattern=NOT_BLANK),
+    search_mode: Literal["prefix", "trigram", "fulltext"] = SEARCH_MODE_FULLTEXT,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genre: str | None = Query(default=None, min_length=1, max_length=200, pattern=NOT_BLANK),
+    director: str | None = Query(default=None, min_length=1, max_length=200, pattern=NOT_BLANK),
+    actor: str | None = Query(default=None, min_length=1, max_length=200, pattern=NOT_BLANK),
+    type: str | None = None,
+    min_imdb_rating: float | None = Query(default=None, ge=0, le=10),
+    min_metascore: int | None = Query(default=None, ge=0, le=100),
+    min_runtime: int | None = Query(default=None, ge=0),
+    max_runtime: int | None = Query(default=None, ge=0),
+    order_by: (
+        Literal[
+            "title",
+            "id",
+            "year",
+            "imdb_rating",
+            "metascore",
+            "imdb_votes",
+            "runtime_minutes",
+            "box_office_cents",
+        ]
+        | None
+    ) = None,
+    order_type: Literal["asc", "desc"] = ORDER_TYPE_ASC,
+) -> PydanticJSONResponse:
     """
     Retrieves a paginated list of movies, filtered by title if provided.
     Default ordering is by title if not provided, or else by id.
+    Every response includes next_cursor, passing it as cursor retrieves the next page without
+    the cost of skipping the previous ones. An empty cursor starts from the first page.
+    Sending the ETag of a previous response in If-None-Match gets a 304 without a body if no
+    movie has been written since.
 
+    :param etag: ETag of the current version of the catalog.
     :param session: A database session.
     :param title: Filter to get only movies whose title matches exactly this.
     :param page: Page number for pagination.
     :param page_size: Size of the page for pagination.
+    :param cursor: Cursor of the page to retrieve, the page is ignored when given.
+    :param count: How the total is computed, "estimated" avoids counting the matching movies
+    and is flagged with total_estimated in the response.
+    :param search: Terms to search, movies are ranked by relevance. It can't be combined with
+    a cursor.
+    :param search_mode: "prefix" matches the beginning of the title, "trigram" titles similar to
+    the terms even if misspelled, and "fulltext" the words of the title, actors and plot.
+    :param year_from: Filter to get only movies released this year or later.
+    :param year_to: Filter to get only movies released this year or earlier.
+    :param genre: Filter to get only movies of this genre, case insensitive.
+    :param director: Filter to get only movies directed by this person, case insensitive.
+    :param actor: Filter to get only movies starring this person, case insensitive.
+    :param type: Filter to get only movies of this OMDB type, e.g. "movie" or "series".
+    :param min_imdb_rating: Filter to get only movies with at least this IMDb rating.
+    :param min_metascore: Filter to get only movies with at least this Metascore.
+    :param min_runtime: Filter to get only movies lasting at least these minutes.
+    :param max_runtime: Filter to get only movies lasting at most these minutes.
+    :param order_by: Column to sort by, it overrides the default ordering and the relevance.
+    Cursors are only supported when sorting by title in ascending order.
+    :param order_type: Direction of the sort, the movies without a score are always last when
+    sorting by imdb_rating, metascore, imdb_votes, runtime_minutes or box_office_cents.
     :return: Response including paginated and ordered movies.
     """
-    return await MovieService.get_movies(
-        session=session, title=title, pagination=Pagination(page=page, page_size=page_size)
+    filters = MovieFilter(
+        year_from=year_from,
+        year_to=year_to,
+        genre=genre,
+        director=director,
+        actor=actor,
+        type=type,
+        min_imdb_rating=min_imdb_rating,
+        min_metascore=min_metascore,
+        min_runtime=min_runtime,
+        max_runtime=max_runtime,
+    )
+    movies = await MovieService.get_movies(
+        session=session,
+        title=title,
+        pagination=Pagination(page=page, page_size=page_size, cursor=cursor, count=count),
+        search=SearchFilter(query=search, mode=search_mode) if search else None,
+        filters=filters if not filters.is_empty() else None,
+        sort=MovieSort(order_by=order_by, order_type=order_type) if order_by else None,
     )
+    return PydanticJSONResponse(content=movies, headers=_cache_headers(etag))
 
 
-@router.get("/{id}", dependencies=[Depends(get_current_user)])
-async def get_single_movie(session: SessionDep, id: int) -> SingleMovieResponse:
+@router.get("/{id}", dependencies=[Depends(get_current_user)], response_model=SingleMovieResponse)
+async def get_single_movie(
+    etag: MovieETagDep, session: ReadSessionDep, id: int
+) -> PydanticJSONResponse:
     """
     Retrieves a movie by id.
+    Sending the ETag of a previous response in If-None-Match gets a 304 without a body if the
+    movie hasn't changed since.
+    :param etag: ETag of the current version of the movie.
     :param session: A database session
     :param id: id of the movie to retrieve
     :return: Response including the movie if found
     """
-    return await MovieService.get_single_movie(session=session, id=id)
+    movie = await MovieService.get_single_movie(session=session, id=id)
+    return PydanticJSONResponse(content=movie, headers=_cache_headers(etag))
 
 
 @router.delete(
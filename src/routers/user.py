@@ -1,7 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, status
 
 from config import TAG_USER, API_V1
-from core.deps import SessionDep
+from core.deps import SessionDep, get_current_user_admin
 from schemas.requests.user_login import UserLogin
 from schemas.responses.login import LoginResponse
 from services.user import UserService
@@ -18,3 +18,18 @@ async def login(session: SessionDep, user_login: UserLogin) -> LoginResponse:
     :return: Token
     """
     return await UserService.login(session=session, user_login=user_login)
+
+
+@router.post(
+    "/{username}/revoke",
+    tags=[TAG_USER],
+    dependencies=[Depends(get_current_user_admin)],
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def revoke_tokens(session: SessionDep, username: str):
+    """
+    Revokes every token issued to a user until now, only admins can do it.
+    :param session: A database session
+    :param username: User whose tokens are revoked.
+    """
+    return await UserService.revoke_tokens(session=session, username=username)
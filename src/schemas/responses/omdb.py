@@ -1,7 +1,12 @@
+import re
 from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Self, TypeVar
 
 from pydantic import BaseModel, Field, field_validator
 
+M = TypeVar("M", bound=BaseModel)
+
 
 class MovieSearch(BaseModel):
     title: str = Field(alias="Title")
@@ -51,7 +56,7 @@ class MovieImdbResponse(BaseModel):
     @field_validator("released", mode="before")
     def validate_released(v: str | None):
         v = none_if_na(v)
-        return datetime.strptime(v, "%d %b %Y").date() if v else None
+        return parse_released(v) if v else None
 
     @field_validator("year", "metascore", "imdb_votes", mode="before")
     def validate_ints(v: str | None):
@@ -84,6 +89,173 @@ class MovieImdbResponse(BaseModel):
     def validate_optional_na(v: str | None):
         return none_if_na(v)
 
+    @classmethod
+    def from_omdb(cls, body: dict) -> Self:
+        """
+        Fast path equivalent to model_validate for the usual OMDB payloads. The normalization and
+        the coercions are done in one pass and the model is built without running the validators.
+        Any payload that doesn't have the expected shape goes through model_validate, so the
+        result, or the raised error, is the same.
+        :param body: Parsed JSON body.
+        :return: Validated model instance.
+        """
+        try:
+            return cls._construct_from_omdb(body)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return cls.model_validate(body)
+
+    @classmethod
+    def _construct_from_omdb(cls, body: dict) -> Self:
+        values: dict[str, Any] = {}
+        for name, alias in _REQUIRED_STR_FIELDS:
+            value = body[alias]
+            if type(value) is not str:
+                raise TypeError(alias)
+            values[name] = value
+        for name, alias in _OPTIONAL_STR_FIELDS:
+            value = body[alias]
+            if value == "N/A":
+                value = None
+            elif value is not None and type(value) is not str:
+                raise TypeError(alias)
+            values[name] = value
+        for name, alias in _INT_FIELDS:
+            value = body[alias]
+            values[name] = int(value.replace(",", "")) if value and value != "N/A" else None
+        if values["year"] is None:
+            raise ValueError("Year")
+        imdb_rating = body["imdbRating"]
+        values["imdb_rating"] = float(imdb_rating) if imdb_rating and imdb_rating != "N/A" else None
+        released = body["Released"]
+        values["released"] = parse_released(released) if released and released != "N/A" else None
+
+        ratings = body["Ratings"]
+        if type(ratings) is not list:
+            raise TypeError("Ratings")
+        values["ratings"] = []
+        for rating in ratings:
+            source, value = rating["Source"], rating["Value"]
+            if type(source) is not str or type(value) is not str:
+                raise TypeError("Ratings")
+            values["ratings"].append(
+                _build_model(RatingImdbResponse, {"source": source, "value": value})
+            )
+        return _build_model(cls, values)
+
+
+_REQUIRED_STR_FIELDS = (("title", "Title"), ("imdb_id", "imdbID"), ("type", "Type"))
+_OPTIONAL_STR_FIELDS = (
+    ("rated", "Rated"),
+    ("runtime", "Runtime"),
+    ("genre", "Genre"),
+    ("director", "Director"),
+    ("writer", "Writer"),
+    ("actors", "Actors"),
+    ("plot", "Plot"),
+    ("language", "Language"),
+    ("country", "Country"),
+    ("awards", "Awards"),
+    ("poster", "Poster"),
+    ("dvd", "DVD"),
+    ("box_office", "BoxOffice"),
+    ("production", "Production"),
+    ("website", "Website"),
+)
+_INT_FIELDS = (("year", "Year"), ("metascore", "Metascore"), ("imdb_votes", "imdbVotes"))
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+
+
+class FailedImdbFetch(BaseModel):
+    imdb_id: str
+    status_code: int
+    detail: Any
+
+
+class MovieImdbBatchResponse(BaseModel):
+    """Partial results of a batch of requests, the failed ones do not abort the whole batch."""
+
+    movies: list[MovieImdbResponse]
+    failures: list[FailedImdbFetch]
+
+
+def _build_model(model: type[M], values: dict[str, Any]) -> M:
+    """
+    Builds an instance from values that are already valid, like model_construct does, but without
+    its overhead, which is higher than the validation it's meant to skip.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
 
 def none_if_na(value: str | None) -> str | None:
     return None if value in (None, "N/A") else value
+
+
+def parse_released(value: str) -> date:
+    """
+    Parses dates like "04 May 2012". It's much faster than strptime, which is still used for any
+    value with a different shape.
+    """
+    parts = value.split(" ") if type(value) is str else ()
+    if (
+        len(parts) == 3
+        and len(parts[0]) <= 2
+        and parts[0].isascii()
+        and parts[0].isdigit()
+        and parts[1] in _MONTHS
+        and len(parts[2]) == 4
+        and parts[2].isascii()
+        and parts[2].isdigit()
+    ):
+        return date(int(parts[2]), _MONTHS[parts[1]], int(parts[0]))
+    return datetime.strptime(value, "%d %b %Y").date()
+
+
+_RUNTIME = re.compile(r"(?:(\d+)\s*h\w*)?\s*(?:([\d,]+)\s*min\w*)?", re.IGNORECASE)
+
+
+def parse_runtime(value: str | None) -> int | None:
+    """Parses runtimes like "142 min" or "1 h 30 min" to minutes, None if it's not one."""
+    match = _RUNTIME.fullmatch(value.strip()) if type(value) is str else None
+    if match is None or not any(match.groups()):
+        return None
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int((minutes or "0").replace(",", ""))
+
+
+def parse_box_office(value: str | None) -> int | None:
+    """Parses dollar amounts like "$623,357,910" to cents, None if it's not one."""
+    if type(value) is not str or not value.startswith("$"):
+        return None
+    try:
+        return int(Decimal(value[1:].replace(",", "")) * 100)
+    except InvalidOperation:
+        return None
+
+
+def parse_rating_score(value: str | None) -> float | None:
+    """
+    Normalizes the rating values of every source to a 0-100 score: "8.0/10" is 80, "94%" is 94
+    and "69/100" is 69. None if it's not one of these shapes.
+    """
+    if type(value) is not str:
+        return None
+    try:
+        if value.endswith("%"):
+            score = float(value[:-1])
+        else:
+            numerator, _, denominator = value.partition("/")
+            score = float(numerator) * 100 / float(denominator)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(score, 1) if 0 <= score <= 100 else None
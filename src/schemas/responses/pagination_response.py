@@ -4,8 +4,12 @@ from pydantic import BaseModel
 class PaginationResponse(BaseModel):
     """It serves as a template for other responses"""
 
-    page: int
+    page: int | None
     page_size: int
     order_by: str
     order_type: str
     total: int
+    # Whether the total comes from the planner statistics instead of an exact count
+    total_estimated: bool = False
+    # Cursor of the next page, None if this is the last one
+    next_cursor: str | None = None
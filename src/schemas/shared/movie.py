@@ -1,15 +1,26 @@
 from datetime import date
+from typing import Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+
+from schemas.responses.omdb import parse_runtime, parse_box_office, parse_rating_score
 
 
 class Rating(BaseModel):
     source: str
     value: str
+    # The value normalized to 0-100, parsed from it when not given
+    score: float | None = None
 
     class Config:
         from_attributes = True
 
+    @model_validator(mode="after")
+    def parse_score(self) -> Self:
+        if self.score is None:
+            self.score = parse_rating_score(self.value)
+        return self
+
 
 """
 class RatingGet(Rating):
@@ -43,6 +54,17 @@ class MovieBase(BaseModel):
     box_office: str | None
     production: str | None
     website: str | None
+    # Typed copies of runtime and box_office, parsed from them when not given
+    runtime_minutes: int | None = None
+    box_office_cents: int | None = None
+
+    @model_validator(mode="after")
+    def parse_numeric_columns(self) -> Self:
+        if self.runtime_minutes is None:
+            self.runtime_minutes = parse_runtime(self.runtime)
+        if self.box_office_cents is None:
+            self.box_office_cents = parse_box_office(self.box_office)
+        return self
 
 
 class MovieCreate(MovieBase):
@@ -54,3 +76,11 @@ class MovieGet(MovieBase):
 
     class Config:
         from_attributes = True
+
+
+class BulkInsertResult(BaseModel):
+    """imdb_ids of a bulk insert grouped by what happened to every movie."""
+
+    inserted: list[str] = []
+    updated: list[str] = []
+    skipped: list[str] = []
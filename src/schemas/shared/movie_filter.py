@@ -0,0 +1,42 @@
+from typing import Literal
+
+from pydantic import BaseModel, confloat, conint, constr
+
+from config import ORDER_TYPE_ASC
+
+# Genres and people are matched case insensitively against the movie_genre and movie_person rows
+FacetName = constr(strip_whitespace=True, to_lower=True, min_length=1, max_length=200)
+
+
+class MovieFilter(BaseModel):
+    # Inclusive range of release years
+    year_from: int | None = None
+    year_to: int | None = None
+    genre: FacetName | None = None
+    director: FacetName | None = None
+    actor: FacetName | None = None
+    type: str | None = None
+    # Movies without a score don't pass a threshold
+    min_imdb_rating: confloat(ge=0, le=10) | None = None
+    min_metascore: conint(ge=0, le=100) | None = None
+    # Inclusive range of runtimes in minutes
+    min_runtime: conint(ge=0) | None = None
+    max_runtime: conint(ge=0) | None = None
+
+    def is_empty(self) -> bool:
+        """Whether no filter is set."""
+        return not self.model_dump(exclude_none=True)
+
+
+class MovieSort(BaseModel):
+    order_by: Literal[
+        "title",
+        "id",
+        "year",
+        "imdb_rating",
+        "metascore",
+        "imdb_votes",
+        "runtime_minutes",
+        "box_office_cents",
+    ]
+    order_type: Literal["asc", "desc"] = ORDER_TYPE_ASC
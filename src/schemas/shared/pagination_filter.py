@@ -1,6 +1,14 @@
+from typing import Literal
+
 from pydantic import BaseModel, conint
 
+from config import COUNT_EXACT
+
 
 class Pagination(BaseModel):
     page: conint(ge=1) | None
     page_size: conint(ge=1, le=100)
+    # Keyset pagination, when given the page is ignored
+    cursor: str | None = None
+    # How the total is computed, the estimated one is cheaper on large catalogs
+    count: Literal["exact", "estimated"] = COUNT_EXACT
@@ -0,0 +1,11 @@
+from typing import Literal
+
+from pydantic import BaseModel, constr
+
+from config import SEARCH_MODE_FULLTEXT
+
+
+class SearchFilter(BaseModel):
+    # prefix and trigram match the title, fulltext matches the title, actors and plot
+    query: constr(strip_whitespace=True, min_length=1, max_length=200)
+    mode: Literal["prefix", "trigram", "fulltext"] = SEARCH_MODE_FULLTEXT
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -5,6 +7,8 @@ class UserData(BaseModel):
     username: str
     hashed_password: str
     is_admin: bool
+    # Tokens issued before this are revoked
+    tokens_valid_after: datetime | None = None
 
     class Config:
         from_attributes = True
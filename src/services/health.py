@@ -1,7 +1,11 @@
 from fastapi import HTTPException, status
 
 from core.deps import SessionDep
+from core.security import password_hasher
 from repositories.database.health import HealthRepository
+from repositories.database.session_factory import EngineManager, replica_router
+from repositories.external.omdb import OmdbRepository
+from services.movie import MovieService
 
 
 class HealthService:
@@ -19,3 +23,35 @@ class HealthService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Healthcheck failed",
             )
+
+    @staticmethod
+    def omdb_status() -> dict:
+        """
+        State of the OMDB circuit breaker and usage of its cache.
+        :return: OMDB status
+        """
+        return OmdbRepository.status()
+
+    @staticmethod
+    def database_status() -> dict:
+        """
+        Usage of the connection pool of the primary, and health and pool usage of the replicas.
+        :return: Database status
+        """
+        return {"pool": EngineManager.pool_stats(), **replica_router.status()}
+
+    @staticmethod
+    async def cache_status() -> dict:
+        """
+        Hit ratios of the movie reads cache and memory used by it.
+        :return: Cache status, None if the cache is disabled
+        """
+        return await MovieService.cache.stats() if MovieService.cache else None
+
+    @staticmethod
+    def password_hasher_status() -> dict:
+        """
+        Load of the workers (processes or threads) hashing passwords and their latencies.
+        :return: Password hasher status
+        """
+        return password_hasher.stats()
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from typing import Callable
+
+from fastapi import status
+from httpx import HTTPError
+
+from config import OMDB_MAX_CONCURRENCY, INGEST_BATCH_SIZE, INGEST_QUEUE_SIZE, MAX_TOTAL_PAGES
+from core.deps import SessionDep
+from exceptions.omdb_repository_exceptions import OmdbRepositoryException
+from logger import logger
+from repositories.database.movie import MovieDatabaseRepository
+from repositories.external.omdb import OmdbRepository
+from schemas.responses.omdb import MovieImdbResponse, FailedImdbFetch
+from schemas.shared.movie import MovieCreate
+
+# Marks the end of the items of a queue
+_END = object()
+
+
+class StageStats:
+    """Number of items processed by a stage of the pipeline and how long it took."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items: int = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def record(self, items: int = 1):
+        """Counts processed items, the clock starts with the first one."""
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        self.items += items
+
+    def finish(self):
+        """Stops the clock of the stage."""
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds between the first item and the end of the stage."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        return self.items / self.elapsed if self.elapsed else float(self.items)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.items} items in {self.elapsed:.2f}s "
+            f"({self.throughput:.1f} items/s)"
+        )
+
+
+class IngestReport:
+    """Outcome of an ingest."""
+
+    def __init__(self, stages: list[StageStats], failures: list[FailedImdbFetch], skipped: int):
+        self.stages = stages
+        self.failures = failures
+        self.skipped = skipped
+
+    @property
+    def inserted(self) -> int:
+        """Number of movies written to the database."""
+        return self.stages[-1].items
+
+
+class IngestPipeline:
+    """
+    Fetches movies from OMDB and stores them as a staged pipeline connected by bounded queues:
+    search pages -> imdb_ids -> detail fetches -> validation -> batched database writes.
+    The imdb_ids of every search page are planned before fetching: duplicates, skipped ones and
+    the ones already stored are dropped, so only new titles cost OMDB requests.
+    Every stage starts working as soon as the previous one produces its first item, and the
+    bounded queues keep the memory flat no matter the size of the catalog.
+    """
+
+    def __init__(
+        self,
+        session: SessionDep,
+        fetch_workers: int = OMDB_MAX_CONCURRENCY,
+        batch_size: int = INGEST_BATCH_SIZE,
+        queue_size: int = INGEST_QUEUE_SIZE,
+        max_pages: int = MAX_TOTAL_PAGES,
+        skip_imdb_ids: set[str] | None = None,
+        on_batch_written: Callable[[list[str]], None] | None = None,
+    ):
+        """
+        :param session: Database session used to write the batches.
+        :param fetch_workers: Number of concurrent detail fetches, OMDB limits still apply.
+        :param batch_size: Number of movies committed at once.
+        :param queue_size: Maximum number of items waiting between two stages.
+        :param max_pages: Maximum number of search pages to fetch for every search term.
+        :param skip_imdb_ids: imdb_ids that must not be fetched, e.g. already ingested.
+        :param on_batch_written: Called with the imdb_ids of every committed batch.
+        """
+        self.session = session
+        self.fetch_workers = fetch_workers
+        self.batch_size = batch_size
+        self.max_pages = max_pages
+        self.skip_imdb_ids: set[str] = skip_imdb_ids or set()
+        self.on_batch_written = on_batch_written
+        self._imdb_ids: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._movies: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._batches: asyncio.Queue = asyncio.Queue(maxsize=max(queue_size // batch_size, 1))
+        self.search_stats = StageStats("search")
+        self.fetch_stats = StageStats("fetch")
+        self.validation_stats = StageStats("validation")
+        self.write_stats = StageStats("write")
+        self.failures: list[FailedImdbFetch] = []
+        self.skipped: int = 0
+        self._seen_imdb_ids: set[str] = set()
+        # The planning and the write stages share the session, which can't run queries concurrently
+        self._session_lock = asyncio.Lock()
+
+    async def run(self, search_terms: list[str]) -> IngestReport:
+        """
+        Ingests all the movies found for the search terms.
+        :param search_terms: Terms to search within movie titles.
+        :return: Stats of every stage and the movies that couldn't be fetched.
+        """
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(self._search(search_terms))
+            for _ in range(self.fetch_workers):
+                task_group.create_task(self._fetch())
+            task_group.create_task(self._validate())
+            task_group.create_task(self._write())
+
+        stages = [self.search_stats, self.fetch_stats, self.validation_stats, self.write_stats]
+        for stage in stages:
+            logger.info(f"Ingest stage {stage}")
+        if self.failures:
+            logger.warning(f"{len(self.failures)} movies couldn't be fetched during the ingest")
+        logger.info(f"{self.skipped} movies were skipped because they are duplicated or stored")
+        return IngestReport(stages=stages, failures=self.failures, skipped=self.skipped)
+
+    async def _search(self, search_terms: list[str]):
+        """Produces the imdb_ids of every search page."""
+        for search_term in search_terms:
+            async for imdb_ids in OmdbRepository.stream_movies_by_search(
+                search_term=search_term, max_pages=self.max_pages
+            ):
+                self.search_stats.record(len(imdb_ids))
+                for imdb_id in await self._plan(imdb_ids):
+                    await self._imdb_ids.put(imdb_id)
+        self.search_stats.finish()
+        for _ in range(self.fetch_workers):
+            await self._imdb_ids.put(_END)
+
+    async def _plan(self, imdb_ids: list[str]) -> list[str]:
+        """
+        Drops the imdb_ids already seen in this run, the ones to skip and the ones already stored.
+        :param imdb_ids: imdb_ids of a search page.
+        :return: imdb_ids whose details must be fetched, in the same order.
+        """
+        candidates: list[str] = [
+            imdb_id
+            for imdb_id in dict.fromkeys(imdb_ids)
+            if imdb_id not in self._seen_imdb_ids and imdb_id not in self.skip_imdb_ids
+        ]
+        self._seen_imdb_ids.update(imdb_ids)
+        existing: set[str] = set()
+        if candidates:
+            async with self._session_lock:
+                existing = await MovieDatabaseRepository.get_existing_imdb_ids(
+                    session=self.session, imdb_ids=candidates
+                )
+        planned = [imdb_id for imdb_id in candidates if imdb_id not in existing]
+        self.skipped += len(imdb_ids) - len(planned)
+        return planned
+
+    async def _fetch(self):
+        """Fetches the details of every imdb_id, a failed movie doesn't stop the pipeline."""
+        while (imdb_id := await self._imdb_ids.get()) is not _END:
+            try:
+                movie = await OmdbRepository.get_movie_by_imdb_id(imdb_id=imdb_id)
+            except OmdbRepositoryException as e:
+                self.failures.append(
+                    FailedImdbFetch(imdb_id=imdb_id, status_code=e.status_code, detail=e.detail)
+                )
+                continue
+            except HTTPError as e:
+                self.failures.append(
+                    FailedImdbFetch(
+                        imdb_id=imdb_id,
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail={"error": str(e)},
+                    )
+                )
+                continue
+            self.fetch_stats.record()
+            await self._movies.put(movie)
+        await self._movies.put(_END)
+
+    async def _validate(self):
+        """Maps the fetched movies to the schema to insert and groups them in batches."""
+        finished_workers = 0
+        batch: list[MovieCreate] = []
+        while finished_workers < self.fetch_workers:
+            movie: MovieImdbResponse = await self._movies.get()
+            if movie is _END:
+                finished_workers += 1
+                continue
+            batch.append(MovieCreate.model_validate(movie.model_dump()))
+            self.validation_stats.record()
+            if len(batch) >= self.batch_size:
+                await self._batches.put(batch)
+                batch = []
+        self.fetch_stats.finish()
+        self.validation_stats.finish()
+        if batch:
+            await self._batches.put(batch)
+        await self._batches.put(_END)
+
+    async def _write(self):
+        """Commits every batch as soon as it's full, the movies already stored are skipped."""
+        while (batch := await self._batches.get()) is not _END:
+            async with self._session_lock:
+                result = await MovieDatabaseRepository.bulk_insert(
+                    session=self.session, movies=batch
+                )
+            # Movies stored by someone else after the planning are skipped, not failed
+            self.write_stats.record(len(result.inserted))
+            self.skipped += len(result.skipped)
+            if self.on_batch_written:
+                self.on_batch_written([movie.imdb_id for movie in batch])
+        self.write_stats.finish()
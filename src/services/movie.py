@@ -1,74 +1,254 @@
-from config import ORDER_BY_TITLE, ORDER_TYPE_ASC, ORDER_BY_ID
+from config import (
+    ORDER_BY_TITLE,
+    ORDER_TYPE_ASC,
+    ORDER_BY_ID,
+    ORDER_BY_RELEVANCE,
+    SEARCH_MODE_PREFIX,
+    MOVIE_CACHE_ENABLED,
+)
+from core.cursor import Cursor
 from core.deps import SessionDep
+from core.single_flight import SingleFlight
 from exceptions.movie_exceptions import MovieNotFoundException, MovieAlreadyExistsException
+from exceptions.pagination_exceptions import InvalidCursorException
 from repositories.database.movie import MovieDatabaseRepository
-from repositories.database.models.movie import Movie
+from repositories.database.session_factory import SessionMaker, EngineManager
 from repositories.external.omdb import OmdbRepository
 from schemas.responses.movie import MoviesResponse, SingleMovieResponse
 from schemas.responses.omdb import MovieImdbResponse
 from schemas.shared.movie import MovieGet, MovieCreate
+from schemas.shared.movie_filter import MovieFilter, MovieSort
 from schemas.shared.pagination_filter import Pagination
+from schemas.shared.search_filter import SearchFilter
+from services.movie_cache import MovieCache, create_movie_cache
 
 
 class MovieService:
     """ """
 
+    # Concurrent inserts of the same movie share one database insert.
+    in_flight_inserts: SingleFlight = SingleFlight()
+    # Movies and pages already read, the writes invalidate them through the catalog versions
+    cache: MovieCache | None = create_movie_cache() if MOVIE_CACHE_ENABLED else None
+
+    @classmethod
+    def set_cache(cls, cache: MovieCache | None):
+        """Sets the cache of the reads, None disables it."""
+        cls.cache = cache
+
     @staticmethod
-    async def insert_movie_by_title(session: SessionDep, title: str) -> SingleMovieResponse:
+    async def insert_movie_by_title(title: str) -> SingleMovieResponse:
         """
         Searches movies with given title in OMDB and stores them in our database.
         Even if the OMDB Endpoint returns only one movie when filtering by title,
         title is not a UNIQUE field and its value is repeated. Thus, there could be multiple movies
         with the same title.
-        :param session: A database session.
         :param title: The title that movies should match exactly.
         :return: The inserted movies if there is some.
         """
         movie: MovieImdbResponse = await OmdbRepository.get_movie_by_title(title=title)
         if not movie:
             raise MovieNotFoundException(detail={"title": title})
-        try:
-            created_movie = await MovieDatabaseRepository.create(
-                session=session, movie=MovieCreate.model_validate(movie.model_dump())
-            )
-        except Exception as e:
-            if MovieDatabaseRepository.check_already_exists(e):
-                raise MovieAlreadyExistsException(detail={"title": title})
-            else:
-                raise e
-        return MovieGet.model_validate(created_movie)
+        return await MovieService.in_flight_inserts.do(
+            movie.imdb_id, lambda: MovieService._create_movie(title=title, movie=movie)
+        )
+
+    @staticmethod
+    async def _create_movie(title: str, movie: MovieImdbResponse) -> SingleMovieResponse:
+        """
+        Stores a movie fetched from OMDB. The insert is shared by concurrent requests, so it uses a
+        session of its own: the session of a request is closed if the request is cancelled.
+        :param title: The title used to fetch the movie.
+        :param movie: The movie to store.
+        :return: The inserted movie.
+        """
+        async with SessionMaker(bind=EngineManager.get_engine()) as session:
+            try:
+                return await MovieDatabaseRepository.create(
+                    session=session, movie=MovieCreate.model_validate(movie.model_dump())
+                )
+            except Exception as e:
+                if MovieDatabaseRepository.check_already_exists(e):
+                    raise MovieAlreadyExistsException(detail={"title": title})
+                else:
+                    raise e
 
     @staticmethod
     async def get_movies(
-        session: SessionDep, title: str | None, pagination: Pagination
+        session: SessionDep,
+        title: str | None,
+        pagination: Pagination,
+        search: SearchFilter | None = None,
+        filters: MovieFilter | None = None,
+        sort: MovieSort | None = None,
     ) -> MoviesResponse:
         """
         Retrieves a paginated list of movies, filtered by title if provided.
-        Default ordering is by title if not provided, or else by id.
+        Default ordering is by title if not provided, or else by id. Searches are ordered by
+        relevance, except the prefix ones, which are ordered by title. A sort overrides them,
+        cursors are only supported by the ascending order of titles.
+
+        :param session: A database session
+        :param title: Filter to get only movies whose title matches exactly this.
+        :param pagination: Pagination to apply
+        :param search: Search to filter and rank the movies (optional).
+        :param filters: Structured filters the movies must match (optional).
+        :param sort: Column and direction to sort by (optional).
+        :return: Response including paginated and ordered movies.
+        """
+        cache = MovieService.cache
+        # The key is built before reading, a write meanwhile makes it outdated
+        key = (
+            cache.page_key(
+                title=title, pagination=pagination, search=search, filters=filters, sort=sort
+            )
+            if cache
+            else None
+        )
+        if key:
+            cached_movies = await cache.get(key, MoviesResponse)
+            if cached_movies is not None:
+                return cached_movies
+        movies = await MovieService._query_movies(
+            session=session,
+            title=title,
+            pagination=pagination,
+            search=search,
+            filters=filters,
+            sort=sort,
+        )
+        if key:
+            await cache.set(key, movies)
+        return movies
 
+    @staticmethod
+    async def _query_movies(
+        session: SessionDep,
+        title: str | None,
+        pagination: Pagination,
+        search: SearchFilter | None = None,
+        filters: MovieFilter | None = None,
+        sort: MovieSort | None = None,
+    ) -> MoviesResponse:
+        """
+        Reads a page of movies from the database, see get_movies.
         :param session: A database session
         :param title: Filter to get only movies whose title matches exactly this.
         :param pagination: Pagination to apply
+        :param search: Search to filter and rank the movies (optional).
+        :param filters: Structured filters the movies must match (optional).
+        :param sort: Column and direction to sort by (optional).
         :return: Response including paginated and ordered movies.
         """
-        movies: list[Movie]
-        total_count: int
+        default_order = ORDER_BY_ID if title else ORDER_BY_TITLE
+        order_type = ORDER_TYPE_ASC
+        # Cursors encode the (title, id) of the last movie
+        keyset_order = sort is None or (
+            sort.order_by == ORDER_BY_TITLE and sort.order_type == ORDER_TYPE_ASC
+        )
+        if search:
+            if pagination.cursor is not None:
+                raise InvalidCursorException(
+                    detail={"cursor": pagination.cursor, "error": "Not supported by searches"}
+                )
+            default_order = (
+                ORDER_BY_TITLE if search.mode == SEARCH_MODE_PREFIX else ORDER_BY_RELEVANCE
+            )
+        if sort:
+            if pagination.cursor is not None and not keyset_order:
+                raise InvalidCursorException(
+                    detail={"cursor": pagination.cursor, "error": "Not supported by this sort"}
+                )
+            default_order, order_type = sort.order_by, sort.order_type
+        if pagination.cursor is not None:
+            return await MovieService._get_movies_after_cursor(
+                session=session,
+                title=title,
+                pagination=pagination,
+                order_by=default_order,
+                filters=filters,
+            )
+
+        movies: list[MovieGet]
         limit: int
         offset: int
         limit, offset = MovieService._calculate_limit_offset(pagination=pagination)
 
-        movies, total_count = await MovieDatabaseRepository.get_all_paginated(
-            session=session, title=title, limit=limit, offset=offset
+        movies = await MovieDatabaseRepository.get_all_paginated(
+            session=session,
+            title=title,
+            limit=limit,
+            offset=offset,
+            search=search,
+            filters=filters,
+            sort=sort,
+        )
+        total_count, total_estimated = await MovieDatabaseRepository.get_total(
+            session=session,
+            title=title,
+            strategy=pagination.count,
+            search=search,
+            filters=filters,
         )
 
-        default_order = ORDER_BY_ID if title else ORDER_BY_TITLE
+        # Clients can switch to keyset pagination from any page. The total may be an estimate,
+        # so any full page gets a cursor, even if the next page turns out to be empty.
+        next_cursor: str | None = None
+        if movies and len(movies) == limit and not search and keyset_order:
+            next_cursor = Cursor.encode(title=movies[-1].title, id=movies[-1].id)
         return MoviesResponse(
             page=pagination.page,
             page_size=pagination.page_size,
             total=total_count,
+            total_estimated=total_estimated,
             order_by=default_order,
+            order_type=order_type,
+            next_cursor=next_cursor,
+            movies=movies,
+        )
+
+    @staticmethod
+    async def _get_movies_after_cursor(
+        session: SessionDep,
+        title: str | None,
+        pagination: Pagination,
+        order_by: str,
+        filters: MovieFilter | None = None,
+    ) -> MoviesResponse:
+        """
+        Retrieves the page of movies that follows the cursor.
+        :param session: A database session
+        :param title: Filter to get only movies whose title matches exactly this.
+        :param pagination: Pagination with the cursor to seek from, an empty one is the first page.
+        :param order_by: Ordering reported in the response.
+        :param filters: Structured filters the movies must match (optional).
+        :return: Response including the movies and the cursor of the next page.
+        """
+        after = Cursor.decode(pagination.cursor) if pagination.cursor else None
+        # One extra movie tells whether there is a next page
+        movies: list[MovieGet] = await MovieDatabaseRepository.get_page_after(
+            session=session,
+            title=title,
+            limit=pagination.page_size + 1,
+            after=after,
+            filters=filters,
+        )
+        next_cursor: str | None = None
+        if len(movies) > pagination.page_size:
+            movies = movies[: pagination.page_size]
+            next_cursor = Cursor.encode(title=movies[-1].title, id=movies[-1].id)
+        total_count, total_estimated = await MovieDatabaseRepository.get_total(
+            session=session, title=title, strategy=pagination.count, filters=filters
+        )
+        return MoviesResponse(
+            page=None,
+            page_size=pagination.page_size,
+            total=total_count,
+            total_estimated=total_estimated,
+            order_by=order_by,
             order_type=ORDER_TYPE_ASC,
-            movies=[MovieGet.model_validate(movie) for movie in movies],
+            next_cursor=next_cursor,
+            movies=movies,
         )
 
     @staticmethod
@@ -79,11 +259,19 @@ class MovieService:
         :param id: id of the movie to retrieve
         :return: Response including the movie if found
         """
+        cache = MovieService.cache
+        key = cache.movie_key(id) if cache else None
+        if key:
+            cached_movie = await cache.get(key, MovieGet)
+            if cached_movie is not None:
+                return cached_movie
 
-        movie: Movie = await MovieDatabaseRepository.get(session=session, id=id)
+        movie: MovieGet | None = await MovieDatabaseRepository.get(session=session, id=id)
         if not movie:
             raise MovieNotFoundException(detail={"id": id})
-        return MovieGet.model_validate(movie)
+        if key:
+            await cache.set(key, movie)
+        return movie
 
     @staticmethod
     async def delete_movie(session: SessionDep, id: int):
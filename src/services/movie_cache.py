@@ -0,0 +1,144 @@
+from typing import TypeVar
+
+import orjson
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from config import (
+    MOVIE_CACHE_MAX_ENTRIES,
+    MOVIE_CACHE_TTL,
+    MOVIE_CACHE_URL,
+    REPLICATION_LAG,
+)
+from core.cache import CacheBackend, create_cache_backend
+from core.versions import CatalogVersions, catalog_versions
+
+Model = TypeVar("Model", bound=BaseModel)
+
+MOVIE_KEY = "movie"
+PAGE_KEY = "movies"
+
+
+class MovieCache:
+    """
+    Read-through cache of the movies by id and of the pages of movies. The keys contain the
+    catalog versions, which every committed write bumps (see CatalogVersions), so:
+    - Deleting or updating a movie only invalidates that movie and the pages.
+    - Inserting a movie only invalidates the pages.
+    - A page read before a write and stored after it lands under the old key, it's never served.
+    The outdated entries are not removed, they are evicted as any other unused entry. While the
+    versions may be out of date the cache is bypassed. The versions are per process, so a Redis
+    backend moves the entries out of the memory of the workers but doesn't share them.
+    The reads may come from a replica that hasn't applied the last write yet, so nothing is stored
+    until the replicas are expected to have caught up; otherwise stale data would be stored under
+    the new versions.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = MOVIE_CACHE_TTL,
+        versions: CatalogVersions = catalog_versions,
+        replication_lag: float = REPLICATION_LAG,
+    ):
+        """
+        :param backend: Storage of the serialized movies and pages.
+        :param ttl: Seconds an entry is kept even if it's still current.
+        :param versions: Versions of the catalog the keys are built from.
+        :param replication_lag: Seconds after a write during which the reads aren't stored.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.versions = versions
+        self.replication_lag = replication_lag
+        self.hits: dict[str, int] = {MOVIE_KEY: 0, PAGE_KEY: 0}
+        self.misses: dict[str, int] = {MOVIE_KEY: 0, PAGE_KEY: 0}
+        self.bypasses: int = 0
+        self.lagging_stores: int = 0
+
+    def movie_key(self, id: int) -> str | None:
+        """
+        Builds the key of a movie.
+        :param id: id of the movie.
+        :return: Key of the entry, None if the cache must be bypassed.
+        """
+        version = self.versions.movie_etag(id)
+        if version is None:
+            self.bypasses += 1
+            return None
+        return f"{MOVIE_KEY}:{version}:{id}"
+
+    def page_key(self, **params: BaseModel | str | None) -> str | None:
+        """
+        Builds the key of a page of movies.
+        :param params: Everything the page depends on: title, pagination, search, filters...
+        :return: Key of the entry, None if the cache must be bypassed.
+        """
+        version = self.versions.catalog_etag()
+        if version is None:
+            self.bypasses += 1
+            return None
+        query = {
+            name: value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+            for name, value in params.items()
+        }
+        return f"{PAGE_KEY}:{version}:{orjson.dumps(query, option=orjson.OPT_SORT_KEYS).decode()}"
+
+    async def get(self, key: str, model: type[Model]) -> Model | None:
+        """
+        Retrieves a cached movie or page.
+        :param key: Key built with movie_key or page_key.
+        :param model: Schema to validate the cached value with.
+        :return: The value if found, otherwise None.
+        """
+        kind = key.split(":", 1)[0]
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        return model.model_validate_json(value)
+
+    async def set(self, key: str, value: BaseModel):
+        """
+        Stores a movie or a page.
+        :param key: Key built with movie_key or page_key before reading the value.
+        :param value: The value read from the database.
+        """
+        if self.versions.bumped_within(self.replication_lag):
+            self.lagging_stores += 1
+            return
+        await self.backend.set(key, to_json(value), ttl=self.ttl)
+
+    async def clear(self):
+        """Removes every entry and resets the counters."""
+        await self.backend.clear()
+        self.hits = dict.fromkeys(self.hits, 0)
+        self.misses = dict.fromkeys(self.misses, 0)
+        self.bypasses = 0
+        self.lagging_stores = 0
+
+    async def stats(self) -> dict:
+        """Hits, misses and hit ratio of the movies and of the pages, and usage of the backend."""
+        stats: dict = {
+            "bypasses": self.bypasses,
+            "lagging_stores": self.lagging_stores,
+            "storage": await self.backend.stats(),
+        }
+        for kind in (MOVIE_KEY, PAGE_KEY):
+            reads = self.hits[kind] + self.misses[kind]
+            stats[kind] = {
+                "hits": self.hits[kind],
+                "misses": self.misses[kind],
+                "hit_ratio": self.hits[kind] / reads if reads else None,
+            }
+        return stats
+
+
+def create_movie_cache() -> MovieCache:
+    """Creates the cache of the movies with the backend configured, in memory by default."""
+    return MovieCache(
+        backend=create_cache_backend(
+            url=MOVIE_CACHE_URL, max_entries=MOVIE_CACHE_MAX_ENTRIES, prefix="movie_cache:"
+        )
+    )
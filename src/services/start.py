@@ -1,5 +1,3 @@
-from httpx import AsyncClient
-
 from config import (
     MOVIES_SEARCH_TERM,
     REGULAR_USER_PASSWORD,
@@ -10,13 +8,11 @@ from config import (
     ADMIN_USER_IS_ADMIN,
 )
 from core.deps import SessionDep
-from core.security import Security
+from core.security import password_hasher
 from repositories.database.movie import MovieDatabaseRepository
 from repositories.database.user import UserDatabaseRepository
-from repositories.external.omdb import OmdbRepository
-from schemas.responses.omdb import MovieImdbResponse
-from schemas.shared.movie import MovieCreate
 from schemas.shared.user import UserData
+from services.ingest import IngestPipeline
 
 
 class StartService:
@@ -31,25 +27,13 @@ class StartService:
         """
         number_of_movies = await MovieDatabaseRepository.count(session=session)
         if number_of_movies == 0:
-            async with AsyncClient() as client:
-                OmdbRepository.set_client(client=client)
-                imdb_ids: list[str] = await OmdbRepository.get_movies_by_search(
-                    search_term=MOVIES_SEARCH_TERM
-                )
-                movies: list[MovieImdbResponse] = await OmdbRepository.get_movies_by_imdb_ids(
-                    imdb_ids=imdb_ids
-                )
-
-                movies_to_insert = [
-                    MovieCreate.model_validate(movie.model_dump()) for movie in movies
-                ]
-            # This should be managed ideally with a transaction.
-            await MovieDatabaseRepository.bulk_insert(session=session, movies=movies_to_insert)
+            # The movies are committed in batches while they are still being fetched.
+            await IngestPipeline(session=session).run(search_terms=[MOVIES_SEARCH_TERM])
             await UserDatabaseRepository.create(
                 session=session,
                 user=UserData(
                     username=REGULAR_USER_USERNAME,
-                    hashed_password=Security.get_password_hash(REGULAR_USER_PASSWORD),
+                    hashed_password=await password_hasher.hash(REGULAR_USER_PASSWORD),
                     is_admin=REGULAR_USER_IS_ADMIN,
                 ),
             )
@@ -57,7 +41,7 @@ class StartService:
                 session=session,
                 user=UserData(
                     username=ADMIN_USER_USERNAME,
-                    hashed_password=Security.get_password_hash(ADMIN_USER_PASSWORD),
+                    hashed_password=await password_hasher.hash(ADMIN_USER_PASSWORD),
                     is_admin=ADMIN_USER_IS_ADMIN,
                 ),
             )
@@ -1,8 +1,8 @@
 from fastapi import HTTPException, status
 
 from config import ACCESS_TOKEN_EXPIRE_TIME_DELTA
-from core.deps import SessionDep
-from core.security import Security
+from core.deps import SessionDep, principal_cache
+from core.security import Security, password_hasher
 from repositories.database.user import UserDatabaseRepository
 from repositories.database.models.user import User
 from schemas.requests.user_login import UserLogin
@@ -26,7 +26,7 @@ class UserService:
         )
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        credentials_are_correct = Security.verify_password(
+        credentials_are_correct = await password_hasher.verify(
             user_login.password, user.hashed_password
         )
         if not credentials_are_correct:
@@ -36,6 +36,21 @@ class UserService:
             )
         else:
             token = Security.create_access_token(
-                username=user.username, expires_delta=ACCESS_TOKEN_EXPIRE_TIME_DELTA
+                username=user.username,
+                expires_delta=ACCESS_TOKEN_EXPIRE_TIME_DELTA,
+                is_admin=user.is_admin,
             )
             return LoginResponse(token=token)
+
+    @staticmethod
+    async def revoke_tokens(session: SessionDep, username: str):
+        """
+        Revokes every token issued to a user until now, the user has to login again. Other
+        workers may accept the tokens until their cached user expires, see PRINCIPAL_CACHE_TTL.
+        :param session: A database session
+        :param username: username of the user
+        """
+        user_exists = await UserDatabaseRepository.revoke_tokens(session=session, username=username)
+        if not user_exists:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal_cache.delete(username)
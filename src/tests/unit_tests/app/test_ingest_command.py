@@ -0,0 +1,72 @@
+import pytest
+from httpx import AsyncClient
+
+from app.ingest import IngestCheckpoint, ingest, read_search_terms
+from tests.unit_tests.fixtures.client import mock_session
+from tests.unit_tests.fixtures.ingest import (
+    mock_movie_database_repository_bulk_insert,
+    mock_movie_database_repository_get_existing_imdb_ids,
+)
+from tests.unit_tests.fixtures.omdb_repository import (
+    omdb_client,
+    omdb_requests,
+    omdb_cache,
+    omdb_resilience,
+)
+
+
+@pytest.fixture(scope="function")
+def ingest_dependencies(
+    monkeypatch, mock_session, omdb_client, mock_movie_database_repository_get_existing_imdb_ids
+):
+    """Fixture to make the command use the fake OMDB client and a mock session"""
+
+    async def get_session():
+        yield mock_session
+
+    monkeypatch.setattr("app.ingest.get_session", get_session)
+    monkeypatch.setattr(
+        "app.ingest.OmdbRepository.create_client",
+        lambda: AsyncClient(transport=omdb_client._transport),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingest_resumes_after_quota_is_spent(
+    tmp_path,
+    ingest_dependencies,
+    omdb_requests,
+    omdb_cache,
+    mock_movie_database_repository_bulk_insert,
+):
+    """An interrupted run is resumed without fetching again the finished terms or movies."""
+    path = str(tmp_path / "checkpoint.jsonl")
+    await ingest(
+        search_terms=["Avengers"], checkpoint=IngestCheckpoint(path), max_pages=10, quota=13
+    )
+    checkpoint = IngestCheckpoint(path)
+    first_run_imdb_ids = set(checkpoint.ingested_imdb_ids)
+    assert checkpoint.completed_terms == set()
+    assert 0 < len(first_run_imdb_ids) < 25
+
+    omdb_cache.memory.clear()
+    omdb_requests.clear()
+    await ingest(
+        search_terms=["Avengers"], checkpoint=IngestCheckpoint(path), max_pages=10, quota=None
+    )
+    checkpoint = IngestCheckpoint(path)
+    assert checkpoint.completed_terms == {"Avengers"}
+    assert len(checkpoint.ingested_imdb_ids) == 25
+    fetched_imdb_ids = [r.url.params["i"] for r in omdb_requests if r.url.params.get("i")]
+    assert set(fetched_imdb_ids).isdisjoint(first_run_imdb_ids)
+
+
+def test_read_search_terms(tmp_path):
+    """Terms are read from arguments and file, skipping comments and duplicates."""
+    terms_file = tmp_path / "terms.txt"
+    terms_file.write_text("Batman\n# comment\n\nAvengers\nSpiderman\n")
+    assert read_search_terms(terms=["Avengers"], terms_file=str(terms_file)) == [
+        "Avengers",
+        "Batman",
+        "Spiderman",
+    ]
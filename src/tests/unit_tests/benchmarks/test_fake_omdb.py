@@ -0,0 +1,42 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.fake_omdb import create_app, generate_corpus
+from exceptions.omdb_repository_exceptions import OmdbRepositoryException
+from repositories.external.omdb import OmdbRepository
+from tests.unit_tests.fixtures.omdb_repository import omdb_cache, omdb_resilience
+
+
+@pytest.fixture(scope="function")
+async def fake_omdb(request):
+    """Fixture to point the repository to a fake OMDB, the test params are passed to create_app"""
+    corpus = generate_corpus(size=25, search_terms=["Avengers", "Batman"])
+    app = create_app(corpus=corpus, **getattr(request, "param", {}))
+    async with AsyncClient(transport=ASGITransport(app=app)) as client:
+        OmdbRepository.set_client(client=client)
+        yield app
+        OmdbRepository.set_client(client=None)
+
+
+@pytest.mark.asyncio
+async def test_fake_omdb_answers_every_query_shape(fake_omdb, omdb_cache):
+    """The search, imdb_id and title queries are parsed by the repository."""
+    imdb_ids = await OmdbRepository.get_movies_by_search(search_term="avengers")
+    assert imdb_ids == [f"tt{number:07d}" for number in range(0, 25, 2)]
+
+    movie = await OmdbRepository.get_movie_by_imdb_id(imdb_id=imdb_ids[0])
+    assert movie.imdb_id == imdb_ids[0]
+    assert (await OmdbRepository.get_movie_by_title(title=movie.title)).imdb_id == movie.imdb_id
+    with pytest.raises(OmdbRepositoryException):
+        await OmdbRepository.get_movie_by_imdb_id(imdb_id="tt_missing")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fake_omdb", [{"requests_per_second": 1}], indirect=True)
+async def test_fake_omdb_rate_limits(fake_omdb, omdb_cache):
+    """The requests over the rate limit are rejected, OMDB is unavailable once retries run out."""
+    await OmdbRepository.get_movie_by_imdb_id(imdb_id="tt0000000")
+    with pytest.raises(OmdbRepositoryException) as error:
+        await OmdbRepository.get_movie_by_imdb_id(imdb_id="tt0000001")
+    assert error.value.status_code == 503
+    assert error.value.detail == {"error": "status code 429"}
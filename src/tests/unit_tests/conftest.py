@@ -1,2 +1,17 @@
+import pytest
+
+from core.cache import MemoryCacheBackend
+from services.movie import MovieService
+from services.movie_cache import MovieCache
+
+
 def pytest_configure(config):
     config.option.asyncio_mode = "auto"
+
+
+@pytest.fixture(autouse=True)
+def empty_movie_cache(monkeypatch):
+    """Every test starts with an empty cache of the movie reads."""
+    monkeypatch.setattr(
+        MovieService, "cache", MovieCache(backend=MemoryCacheBackend(max_entries=100))
+    )
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from core.deps import get_current_user, principal_cache
+from core.security import Security
+from tests.unit_tests.fixtures.deps import mock_get_by_username
+
+EXPIRES_DELTA = timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_reads_the_user_once(mock_get_by_username):
+    """Concurrent and later requests of a user reuse the cached user."""
+    token = Security.create_access_token(
+        username="admin_user", expires_delta=EXPIRES_DELTA, is_admin=True
+    )
+
+    users = await asyncio.gather(*(get_current_user(token=token) for _ in range(3)))
+    users.append(await get_current_user(token=token))
+
+    mock_get_by_username.assert_awaited_once()
+    assert all(user.username == "admin_user" and user.is_admin for user in users)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_needs_the_admin_claim(mock_get_by_username):
+    """A token issued without the admin role doesn't grant it."""
+    token = Security.create_access_token(username="admin_user", expires_delta=EXPIRES_DELTA)
+
+    user = await get_current_user(token=token)
+
+    assert not user.is_admin
+    assert principal_cache.get("admin_user").is_admin
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_revoked_token(mock_get_by_username):
+    """Tokens issued before the revocation are rejected, the ones issued after are valid."""
+    revoked_token = Security.create_access_token(username="admin_user", expires_delta=EXPIRES_DELTA)
+    await asyncio.sleep(0.001)
+    mock_get_by_username.return_value = mock_get_by_username.return_value.model_copy(
+        update={"tokens_valid_after": datetime.now(timezone.utc)}
+    )
+    await asyncio.sleep(0.001)
+    new_token = Security.create_access_token(username="admin_user", expires_delta=EXPIRES_DELTA)
+
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(token=revoked_token)
+    assert error.value.status_code == 403
+    assert (await get_current_user(token=new_token)).username == "admin_user"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_invalid_token(mock_get_by_username):
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(token="not a token")
+
+    assert error.value.status_code == 403
+    mock_get_by_username.assert_not_awaited()
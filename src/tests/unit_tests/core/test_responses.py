@@ -0,0 +1,21 @@
+import orjson
+
+from benchmarks.responses import build_page
+from core.responses import PydanticJSONResponse
+
+
+def test_pydantic_json_response_matches_the_default_encoding():
+    """Dates, floats and the nested ratings are encoded like FastAPI does by default."""
+    page = build_page(page_size=3)
+
+    response = PydanticJSONResponse(content=page)
+
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == page.model_dump(mode="json")
+
+
+def test_pydantic_json_response_encodes_plain_content():
+    response = PydanticJSONResponse(content={"error": "Movie not found"}, status_code=404)
+
+    assert response.status_code == 404
+    assert orjson.loads(response.body) == {"error": "Movie not found"}
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.security import PasswordHasher, Security
+from exceptions.security_exceptions import PasswordHasherSaturatedException
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_runs_in_processes():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+
+    hashed_password = await hasher.hash("1234")
+
+    assert await hasher.verify("1234", hashed_password)
+    stats = hasher.stats()
+    assert stats["executor"] == "process"
+    assert stats["completed"] == 2
+    assert stats["pending"] == 0
+    assert stats["run_max"] >= stats["run_avg"] > 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_runs_in_threads():
+    hasher = PasswordHasher(workers=1, queue_size=1, executor="thread")
+
+    thread_name = await hasher._run(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("password-hasher")
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated(monkeypatch):
+    """Over the busy threads plus the queue the work is rejected at once with a 503."""
+    hasher = PasswordHasher(workers=1, queue_size=1, retry_after=2, executor="thread")
+    release = threading.Event()
+    monkeypatch.setattr(Security, "verify_password", lambda plain, hashed: release.wait(5))
+
+    accepted = [asyncio.create_task(hasher.verify("1234", "hash")) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(PasswordHasherSaturatedException) as error:
+        await hasher.verify("1234", "hash")
+    release.set()
+
+    assert await asyncio.gather(*accepted) == [True, True]
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "2"}
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
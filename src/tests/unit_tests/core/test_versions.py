@@ -0,0 +1,67 @@
+import pytest
+
+from core.versions import CatalogVersions, etag_matches
+from repositories.database.notifications import CatalogListener
+
+
+def test_bump_changes_only_the_etags_of_the_written_movies():
+    versions = CatalogVersions()
+    catalog_etag, movie_etag, other_etag = (
+        versions.catalog_etag(),
+        versions.movie_etag(movie_id=1),
+        versions.movie_etag(movie_id=2),
+    )
+
+    versions.bump(movie_ids=[1])
+
+    assert versions.catalog_etag() != catalog_etag
+    assert versions.movie_etag(movie_id=1) != movie_etag
+    assert versions.movie_etag(movie_id=2) == other_etag
+
+
+def test_bump_without_ids_changes_every_etag():
+    versions = CatalogVersions(max_movie_versions=2)
+    versions.bump(movie_ids=[1])
+    etags = [versions.movie_etag(movie_id=id) for id in (1, 2)]
+
+    # Over max_movie_versions the versions are all invalidated at once
+    versions.bump(movie_ids=[3, 4])
+
+    assert all(versions.movie_etag(movie_id=id) != etag for id, etag in zip((1, 2), etags))
+    assert versions.movies == {}
+
+
+def test_no_etags_while_out_of_sync():
+    versions = CatalogVersions()
+    versions.synced = False
+
+    assert versions.catalog_etag() is None
+    assert versions.movie_etag(movie_id=1) is None
+
+
+@pytest.mark.parametrize(
+    "if_none_match,expected",
+    [
+        ('W/"a.1"', True),
+        ('"a.1"', True),
+        ('W/"a.0", W/"a.1"', True),
+        ("*", False),
+        ('W/"a.2"', False),
+        (None, False),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, 'W/"a.1"') is expected
+
+
+def test_catalog_listener_bumps_the_notified_movies():
+    versions = CatalogVersions()
+    listener = CatalogListener(versions=versions)
+
+    listener.on_notification(None, 1, "catalog_changes", "3,4")
+    assert versions.catalog == 1
+    assert versions.movies == {3: 1, 4: 1}
+
+    listener.on_notification(None, 1, "catalog_changes", "*")
+    assert versions.catalog == 2
+    assert (versions.generation, versions.movies) == (1, {})
@@ -6,7 +6,7 @@ from httpx import AsyncClient, ASGITransport
 
 from app.main import app
 from core.deps import get_current_user
-from repositories.database.session_factory import get_session
+from repositories.database.session_factory import get_session, get_read_session
 from schemas.shared.user import UserData
 
 
@@ -20,6 +20,7 @@ def mock_session():
 def override_session_dependency(mock_session):
     """Fixture to override session dependency"""
     app.dependency_overrides[get_session] = lambda: mock_session
+    app.dependency_overrides[get_read_session] = lambda: mock_session
     yield
     app.dependency_overrides.clear()
 
@@ -51,14 +52,13 @@ def override_get_user_admin(fake_admin_user):
 
 
 @pytest.fixture(scope="function")
-async def fake_client_regular_user(monkeypatch, override_get_user_regular, override_session_dependency):
+async def fake_client_regular_user(
+    monkeypatch, override_get_user_regular, override_session_dependency
+):
     """Fixture to create a fake client for testing"""
     mock_populate_data = mock.AsyncMock()
     monkeypatch.setattr("app.main.populate_data", mock_populate_data)
-    async with AsyncClient(
-            transport=ASGITransport(app=app),
-            base_url="http://test"
-    ) as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
 
@@ -67,10 +67,7 @@ async def fake_client_admin_user(monkeypatch, override_get_user_admin, override_
     """Fixture to create a fake client for testing"""
     mock_populate_data = mock.AsyncMock()
     monkeypatch.setattr("app.main.populate_data", mock_populate_data)
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test"
-    ) as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
 
@@ -79,8 +76,5 @@ async def fake_client_without_user(monkeypatch, override_session_dependency):
     """Fixture to create a fake client for testing"""
     mock_populate_data = mock.AsyncMock()
     monkeypatch.setattr("app.main.populate_data", mock_populate_data)
-    async with AsyncClient(
-            transport=ASGITransport(app=app),
-            base_url="http://test"
-    ) as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
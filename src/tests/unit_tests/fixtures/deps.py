@@ -0,0 +1,23 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core import deps
+from schemas.shared.user import UserData
+
+
+@pytest.fixture(scope="function")
+def mock_get_by_username(monkeypatch):
+    """Users read from a fake primary, starting with an empty cache of users."""
+    deps.principal_cache.clear()
+
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = MagicMock()
+    mock = AsyncMock(
+        return_value=UserData(username="admin_user", hashed_password="hash", is_admin=True)
+    )
+    monkeypatch.setattr(deps, "SessionMaker", session_maker)
+    monkeypatch.setattr(deps.EngineManager, "get_engine", MagicMock())
+    monkeypatch.setattr("repositories.database.user.UserDatabaseRepository.get_by_username", mock)
+    yield mock
+    deps.principal_cache.clear()
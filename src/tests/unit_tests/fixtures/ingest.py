@@ -0,0 +1,29 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from schemas.shared.movie import BulkInsertResult
+
+
+@pytest.fixture(scope="function")
+def mock_movie_database_repository_bulk_insert(monkeypatch):
+    mock = AsyncMock(
+        side_effect=lambda session, movies: BulkInsertResult(
+            inserted=[movie.imdb_id for movie in movies]
+        )
+    )
+    monkeypatch.setattr(
+        "repositories.database.movie.MovieDatabaseRepository.bulk_insert",
+        mock,
+    )
+    return mock
+
+
+@pytest.fixture(scope="function")
+def mock_movie_database_repository_get_existing_imdb_ids(monkeypatch):
+    mock = AsyncMock(return_value=set())
+    monkeypatch.setattr(
+        "repositories.database.movie.MovieDatabaseRepository.get_existing_imdb_ids",
+        mock,
+    )
+    return mock
@@ -0,0 +1,49 @@
+import fnmatch
+import time
+
+import pytest
+
+
+class FakeRedis:
+    """Stand-in of redis.asyncio.Redis with the commands used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.values: dict[str, tuple[bytes, float]] = {}
+        self.available = True
+
+    def _check(self):
+        if not self.available:
+            raise ConnectionRefusedError("Connection refused")
+
+    async def get(self, name: str) -> bytes | None:
+        self._check()
+        value, expires_at = self.values.get(name, (None, 0))
+        return value if expires_at > time.monotonic() else None
+
+    async def set(self, name: str, value: bytes, px: int):
+        self._check()
+        self.values[name] = (value, time.monotonic() + px / 1000)
+
+    async def scan_iter(self, match: str):
+        self._check()
+        for name in list(self.values):
+            if fnmatch.fnmatch(name, match):
+                yield name
+
+    async def delete(self, *names: str):
+        self._check()
+        for name in names:
+            self.values.pop(name, None)
+
+    async def info(self, section: str) -> dict:
+        self._check()
+        return {"used_memory": sum(len(value) for value, _ in self.values.values()), "maxmemory": 0}
+
+    async def dbsize(self) -> int:
+        self._check()
+        return len(self.values)
+
+
+@pytest.fixture(scope="function")
+def fake_redis():
+    return FakeRedis()
@@ -1,9 +1,10 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from config import ORDER_TYPE_ASC, ORDER_BY_ID
-from repositories.database.movie import MovieDatabaseRepository
+from repositories.database.models.movie import Movie
+from repositories.database.models.rating import Rating
 from schemas.responses.movie import MoviesResponse
 from schemas.responses.omdb import MovieImdbResponse
 from schemas.shared.movie import MovieCreate, MovieGet
@@ -55,7 +56,7 @@ def mock_omdb_repository_get_movie_by_title(monkeypatch, mock_movie_imdb_respons
 
 @pytest.fixture(scope="function")
 def mock_movie_database_repository_create(monkeypatch, mock_movie_from_database):
-    mock = AsyncMock(return_value=mock_movie_from_database)
+    mock = AsyncMock(return_value=MovieGet.model_validate(mock_movie_from_database))
     monkeypatch.setattr(
         "repositories.database.movie.MovieDatabaseRepository.create",
         mock,
@@ -70,8 +71,8 @@ def mock_movie_to_create(mock_movie_imdb_response):
 
 @pytest.fixture(scope="function")
 def mock_movie_from_database(mock_movie_to_create):
-    movie = MovieDatabaseRepository._map_schema_to_model([mock_movie_to_create])[0]
-    movie.id = 1
+    movie = Movie(**mock_movie_to_create.model_dump(exclude={"ratings"}), id=1)
+    movie.ratings = [Rating(**rating.model_dump()) for rating in mock_movie_to_create.ratings]
     return movie
 
 
@@ -87,11 +88,36 @@ def mock_get_single_movie_movie_response(mock_movie_from_database):
 
 @pytest.fixture(scope="function")
 def mock_movie_database_repository_get_all_paginated(monkeypatch, mock_movie_from_database):
-    mock = AsyncMock(return_value=([mock_movie_from_database], 1))
+    mock = AsyncMock(return_value=[MovieGet.model_validate(mock_movie_from_database)])
     monkeypatch.setattr(
         "repositories.database.movie.MovieDatabaseRepository.get_all_paginated",
         mock,
     )
+    monkeypatch.setattr(
+        "repositories.database.movie.MovieDatabaseRepository.get_total",
+        AsyncMock(return_value=(1, False)),
+    )
+    return mock
+
+
+@pytest.fixture(scope="function")
+def mock_movie_database_repository_get_page_after(monkeypatch, mock_movie_from_database):
+    """Fixture with 3 movies in the database, ordered by (title, id)"""
+    movie = MovieGet.model_validate(mock_movie_from_database)
+    movies = [movie.model_copy(update={"id": id}) for id in range(1, 4)]
+
+    async def get_page_after(session, title, limit, after, filters=None):
+        return [movie for movie in movies if after is None or movie.id > after[1]][:limit]
+
+    mock = AsyncMock(side_effect=get_page_after)
+    monkeypatch.setattr(
+        "repositories.database.movie.MovieDatabaseRepository.get_page_after",
+        mock,
+    )
+    monkeypatch.setattr(
+        "repositories.database.movie.MovieDatabaseRepository.get_total",
+        AsyncMock(return_value=(len(movies), False)),
+    )
     return mock
 
 
@@ -110,7 +136,7 @@ def mock_get_movies_response(mock_movie_from_database):
 
 @pytest.fixture(scope="function")
 def mock_movie_database_repository_get(monkeypatch, mock_movie_from_database):
-    mock = AsyncMock(return_value=(mock_movie_from_database))
+    mock = AsyncMock(return_value=MovieGet.model_validate(mock_movie_from_database))
     monkeypatch.setattr(
         "repositories.database.movie.MovieDatabaseRepository.get",
         mock,
@@ -126,3 +152,14 @@ def mock_movie_database_repository_delete(monkeypatch):
         mock,
     )
     return mock
+
+
+@pytest.fixture(scope="function")
+def mock_get_session(monkeypatch):
+    """Fixture to return the session opened by the service, apart from the request one"""
+    session = MagicMock()
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    monkeypatch.setattr("services.movie.SessionMaker", session_maker)
+    monkeypatch.setattr("services.movie.EngineManager.get_engine", MagicMock())
+    return session
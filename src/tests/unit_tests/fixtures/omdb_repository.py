@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from repositories.external.omdb import OmdbRepository, RetryPolicy, CircuitBreaker
+from repositories.external.omdb_cache import OmdbCache
+
+
+def build_movie_body(imdb_id: str) -> dict:
+    return {
+        "Actors": "N/A",
+        "Awards": "N/A",
+        "BoxOffice": "N/A",
+        "Country": "Switzerland",
+        "DVD": "N/A",
+        "Director": "Christian Davi",
+        "Genre": "Short",
+        "Language": "German",
+        "Metascore": "N/A",
+        "Plot": "N/A",
+        "Poster": "N/A",
+        "Production": "N/A",
+        "Rated": "N/A",
+        "Ratings": [{"Source": "Internet Movie Database", "Value": "5.6/10"}],
+        "Released": "N/A",
+        "Response": "True",
+        "Runtime": "5 min",
+        "Title": "Spiderman",
+        "Type": "movie",
+        "Website": "N/A",
+        "Writer": "N/A",
+        "Year": "1990",
+        "imdbID": imdb_id,
+        "imdbRating": "5.6",
+        "imdbVotes": "97",
+    }
+
+
+def build_search_body(page: int, total_results: int) -> dict:
+    first = (page - 1) * 10
+    last = min(first + 10, total_results)
+    return {
+        "Search": [
+            {
+                "Title": f"Movie {number}",
+                "Year": "2000",
+                "imdbID": f"tt{number:07d}",
+                "Type": "movie",
+                "Poster": "N/A",
+            }
+            for number in range(first, last)
+        ],
+        "totalResults": str(total_results),
+        "Response": "True",
+    }
+
+
+@pytest.fixture(scope="function")
+def omdb_requests():
+    """Fixture to record the requests received by the fake OMDB transport"""
+    return []
+
+
+@pytest.fixture(scope="function")
+def omdb_client(omdb_requests):
+    """
+    Fixture to set a client whose transport answers like OMDB. The imdb_id "tt_missing" is not
+    found, "tt_error*" return a server error, "tt_bad_gateway" a server error with an HTML body,
+    "tt_garbled" a 200 with a body that isn't JSON, "tt_flaky" fails only the first time and
+    "tt_slow" is slow only the first time. Any search returns 25 results.
+    """
+
+    async def handler(request: Request) -> Response:
+        omdb_requests.append(request)
+        if request.url.params.get("s"):
+            page = int(request.url.params.get("page"))
+            return Response(200, json=build_search_body(page=page, total_results=25))
+        imdb_id = request.url.params.get("i") or request.url.params.get("t") or ""
+        attempts = sum(1 for r in omdb_requests if r.url.params.get("i") == imdb_id)
+        if imdb_id == "tt_flaky" and attempts == 1:
+            return Response(502, json={"Response": "False", "Error": "Bad gateway"})
+        if imdb_id == "tt_slow" and attempts == 1:
+            await asyncio.sleep(1)
+        if imdb_id == "tt_missing":
+            return Response(200, json={"Response": "False", "Error": "Movie not found!"})
+        if imdb_id == "tt_bad_gateway":
+            return Response(502, text="<html>Bad Gateway</html>")
+        if imdb_id == "tt_garbled":
+            return Response(200, text="<html>OK</html>")
+        if imdb_id.startswith("tt_error"):
+            return Response(503, json={"Response": "False", "Error": "Unavailable"})
+        return Response(200, json=build_movie_body(imdb_id))
+
+    client = AsyncClient(transport=MockTransport(handler))
+    OmdbRepository.set_client(client=client)
+    yield client
+    OmdbRepository.set_client(client=None)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def omdb_resilience():
+    """Fixture to set a fresh circuit breaker and no retries, tests can override them"""
+    previous_retry_policy, previous_breaker = OmdbRepository.retry_policy, OmdbRepository.breaker
+    OmdbRepository.set_resilience(retry_policy=RetryPolicy(max_retries=0), breaker=CircuitBreaker())
+    yield
+    OmdbRepository.set_resilience(retry_policy=previous_retry_policy, breaker=previous_breaker)
+
+
+@pytest.fixture(scope="function")
+def omdb_cache():
+    """Fixture to set an empty in-memory cache"""
+    cache = OmdbCache(disk_path=None)
+    previous_cache = OmdbRepository.cache
+    OmdbRepository.set_cache(cache=cache)
+    yield cache
+    OmdbRepository.set_cache(cache=previous_cache)
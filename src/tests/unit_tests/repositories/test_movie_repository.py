@@ -0,0 +1,276 @@
+from collections import namedtuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from config import COUNT_ESTIMATED
+from repositories.database.movie import MovieDatabaseRepository
+from schemas.shared.movie_filter import MovieFilter, MovieSort
+from schemas.shared.search_filter import SearchFilter
+from tests.unit_tests.fixtures.movie_service import mock_movie_imdb_response, mock_movie_to_create
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_inserted_updated_and_skipped(mock_movie_to_create):
+    """
+    The movies are written with one upsert and their ratings with one insert. Of the duplicates,
+    the last one is written and reported, the earlier ones are skipped.
+    """
+    movies = [
+        mock_movie_to_create.model_copy(update={"imdb_id": imdb_id, "title": title})
+        for imdb_id, title in [("tt1", "First"), ("tt2", "Second"), ("tt1", "Last"), ("tt3", "")]
+    ]
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock(side_effect=[[(1, "tt1", True), (2, "tt2", False)], None, None])
+
+    result = await MovieDatabaseRepository.bulk_insert(
+        session=session, movies=movies, update_existing=True
+    )
+
+    assert result.inserted == ["tt1"]
+    assert result.updated == ["tt2"]
+    assert result.skipped == ["tt1", "tt3"]
+    compiled_movie_statement = (
+        session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "Last" in compiled_movie_statement.params.values()
+    assert "First" not in compiled_movie_statement.params.values()
+    movie_statement, delete_statement, rating_statement = [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    ]
+    assert "ON CONFLICT (imdb_id) DO UPDATE" in movie_statement
+    assert "RETURNING movie.id, movie.imdb_id, xmax = 0 AS inserted" in movie_statement
+    assert delete_statement.startswith("DELETE FROM rating")
+    assert rating_statement.startswith("INSERT INTO rating")
+    assert "ON CONFLICT DO NOTHING" in rating_statement
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_total_caches_exact_counts_until_a_write():
+    """The exact count is queried once per filter until movies are written."""
+    MovieDatabaseRepository.invalidate_counts()
+    session = MagicMock()
+    session.scalar = AsyncMock(side_effect=[10, 2, 11])
+
+    assert await MovieDatabaseRepository.get_total(session=session, title=None) == (10, False)
+    assert await MovieDatabaseRepository.get_total(session=session, title=None) == (10, False)
+    assert await MovieDatabaseRepository.get_total(session=session, title="Up") == (2, False)
+    MovieDatabaseRepository.invalidate_counts()
+    assert await MovieDatabaseRepository.get_total(session=session, title=None) == (11, False)
+    assert session.scalar.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_total_doesnt_mix_up_titles_and_searches():
+    """A title that looks like a title and a search gets a count of its own."""
+    MovieDatabaseRepository.invalidate_counts()
+    session = MagicMock()
+    session.scalar = AsyncMock(side_effect=[1, 2])
+    search = SearchFilter(query="b", mode="fulltext")
+
+    title_total = await MovieDatabaseRepository.get_total(session=session, title="a|fulltext|b")
+    search_total = await MovieDatabaseRepository.get_total(
+        session=session, title="a", search=search
+    )
+    assert title_total == (1, False)
+    assert search_total == (2, False)
+    MovieDatabaseRepository.invalidate_counts()
+
+
+@pytest.mark.asyncio
+async def test_get_total_estimated():
+    """The estimate comes from the planner, an unanalyzed table falls back to the exact count."""
+    MovieDatabaseRepository.invalidate_counts()
+    session = MagicMock()
+    session.scalar = AsyncMock(side_effect=[5000, '[{"Plan": {"Plan Rows": 3}}]', -1, 7])
+
+    assert await MovieDatabaseRepository.get_total(
+        session=session, title=None, strategy=COUNT_ESTIMATED
+    ) == (5000, True)
+    assert await MovieDatabaseRepository.get_total(
+        session=session, title="Up", strategy=COUNT_ESTIMATED
+    ) == (3, True)
+    assert await MovieDatabaseRepository.get_total(
+        session=session, title=None, strategy=COUNT_ESTIMATED
+    ) == (7, False)
+    MovieDatabaseRepository.invalidate_counts()
+
+
+@pytest.mark.parametrize(
+    "mode, expected_condition, expected_order",
+    [
+        ("prefix", "lower(movie.title) LIKE %(lower_1)s ESCAPE '/'", "movie.title, movie.id"),
+        ("trigram", "movie.title %% %(title_1)s", "similarity(movie.title, %(similarity_1)s) DESC"),
+        ("fulltext", "movie.search_vector @@ websearch_to_tsquery(", "ts_rank(movie.search_vector"),
+    ],
+)
+def test_search_filters_use_the_indexed_expressions(mode, expected_condition, expected_order):
+    """Every search mode filters with the expression of its index and ranks the results."""
+    search = SearchFilter(query="  50% off_", mode=mode)
+    (condition,) = MovieDatabaseRepository._filters(title=None, search=search)
+    compiled = condition.compile(dialect=postgresql.dialect())
+    order = ", ".join(
+        str(expression.compile(dialect=postgresql.dialect()))
+        for expression in MovieDatabaseRepository._relevance(search=search)
+    )
+
+    assert expected_condition in str(compiled)
+    assert expected_order in order
+    if mode == "prefix":
+        assert compiled.params == {"lower_1": "50/% off/_%"}
+
+
+@pytest.mark.asyncio
+async def test_create_reads_the_movie_from_the_insert(mock_movie_to_create):
+    """The movie and its ratings come back from a single INSERT ... RETURNING statement."""
+    row = {
+        **mock_movie_to_create.model_dump(exclude={"ratings"}),
+        "id": 7,
+        "ratings": '[{"source": "Internet Movie Database", "value": "5.6/10"}]',
+    }
+    result = MagicMock()
+    result.one.return_value._asdict.return_value = row
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    movie = await MovieDatabaseRepository.create(session=session, movie=mock_movie_to_create)
+
+    assert movie.id == 7
+    assert movie.ratings == mock_movie_to_create.ratings
+    session.execute.assert_awaited_once()
+    statement = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("WITH new_movie AS \n(INSERT INTO movie")
+    assert "new_ratings AS \n(INSERT INTO rating" in statement
+    assert "ORDER BY new_ratings.id)" in statement
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_all_paginated_reads_movies_and_ratings_in_one_query(mock_movie_to_create):
+    """A page is a single query, the ratings come aggregated as JSON in every row."""
+    row = MagicMock()
+    row._asdict.return_value = {
+        **mock_movie_to_create.model_dump(exclude={"ratings"}),
+        "id": 3,
+        "ratings": '[{"source": "Internet Movie Database", "value": "5.6/10"}]',
+    }
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=[row])
+
+    movies = await MovieDatabaseRepository.get_all_paginated(
+        session=session, title=None, limit=10, offset=20
+    )
+
+    assert [(movie.id, movie.ratings) for movie in movies] == [(3, mock_movie_to_create.ratings)]
+    session.execute.assert_awaited_once()
+    statement = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "json_agg(json_build_object(" in statement
+    assert "ORDER BY rating.id" in statement
+    assert "ORDER BY movie.title, movie.id" in statement
+
+
+@pytest.mark.asyncio
+async def test_get_all_paginated_with_structured_filters_and_sort():
+    """Genres and people are semi-joins on their junction tables, the sort ends with the id."""
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=[])
+    filters = MovieFilter(
+        year_from=1990, year_to=1999, genre=" Drama ", actor="Tom Hanks", min_imdb_rating=7.5
+    )
+
+    await MovieDatabaseRepository.get_all_paginated(
+        session=session,
+        title=None,
+        limit=10,
+        offset=0,
+        filters=filters,
+        sort=MovieSort(order_by="imdb_rating", order_type="desc"),
+    )
+
+    compiled = session.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    statement = str(compiled)
+    assert "movie.year >= %(year_1)s AND movie.year <= %(year_2)s" in statement
+    assert "movie.imdb_rating >= %(imdb_rating_1)s" in statement
+    assert "movie.id IN (SELECT movie_genre.movie_id" in statement
+    assert "movie.id IN (SELECT movie_person.movie_id" in statement
+    assert "ORDER BY movie.imdb_rating DESC NULLS LAST, movie.id DESC" in statement
+    assert {"drama", "tom hanks", "actor"} <= set(compiled.params.values())
+
+
+@pytest.mark.parametrize(
+    "order_type,expected",
+    [
+        ("desc", "movie.metascore DESC NULLS LAST, movie.id DESC"),
+        ("asc", "movie.metascore ASC NULLS FIRST, movie.id ASC"),
+    ],
+)
+def test_order_by_nullable_columns_matches_their_index(order_type, expected):
+    """Both directions scan the (metascore DESC NULLS LAST, id DESC) index, forward or backward."""
+    sort = MovieSort(order_by="metascore", order_type=order_type)
+
+    order_by = MovieDatabaseRepository._order_by(sort)
+
+    compiled = [str(column.compile(dialect=postgresql.dialect())) for column in order_by]
+    assert ", ".join(compiled) == expected
+
+
+@pytest.mark.asyncio
+async def test_get_total_caches_counts_per_filter(monkeypatch):
+    MovieDatabaseRepository.invalidate_counts()
+    count = AsyncMock(side_effect=[10, 4])
+    monkeypatch.setattr(MovieDatabaseRepository, "count", count)
+
+    totals = [
+        await MovieDatabaseRepository.get_total(session=MagicMock(), title=None, filters=filters)
+        for filters in [None, MovieFilter(genre="drama"), MovieFilter(), MovieFilter(genre="drama")]
+    ]
+
+    assert totals == [(10, False), (4, False), (10, False), (4, False)]
+    assert count.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_backfill_numeric_columns_updates_a_batch():
+    """Every movie of the batch and its ratings are updated with one executemany each."""
+    MovieRow = namedtuple("MovieRow", ["id", "runtime", "box_office"])
+    movies = [MovieRow(1, "142 min", "$1,000"), MovieRow(2, "N/A", None)]
+    ratings = [(10, "8.0/10"), (11, "94%")]
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock(
+        side_effect=[
+            MagicMock(all=MagicMock(return_value=movies)),
+            None,
+            MagicMock(all=MagicMock(return_value=ratings)),
+            None,
+        ]
+    )
+
+    last_id = await MovieDatabaseRepository.backfill_numeric_columns(
+        session=session, after_id=0, limit=2
+    )
+
+    assert last_id == 2
+    _, movie_update, _, rating_update = session.execute.await_args_list
+    assert movie_update.args[1] == [
+        {"id": 1, "runtime_minutes": 142, "box_office_cents": 100000},
+        {"id": 2, "runtime_minutes": None, "box_office_cents": None},
+    ]
+    assert rating_update.args[1] == [{"id": 10, "score": 80.0}, {"id": 11, "score": 94.0}]
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backfill_numeric_columns_without_more_movies():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+
+    assert (
+        await MovieDatabaseRepository.backfill_numeric_columns(session=session, after_id=2, limit=2)
+        is None
+    )
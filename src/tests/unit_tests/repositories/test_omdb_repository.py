@@ -0,0 +1,221 @@
+import asyncio
+import time
+
+import pytest
+
+from exceptions.omdb_repository_exceptions import (
+    OmdbRepositoryNotFoundException,
+    OmdbRepositoryUnavailableException,
+)
+from repositories.external.omdb import (
+    OmdbRepository,
+    RequestScheduler,
+    TokenBucket,
+    RetryPolicy,
+    CircuitBreaker,
+)
+from repositories.external.omdb_cache import OmdbCache
+from tests.unit_tests.fixtures.omdb_repository import (
+    omdb_client,
+    omdb_requests,
+    omdb_cache,
+    omdb_resilience,
+)
+
+
+@pytest.mark.asyncio
+async def test_get_movies_by_imdb_ids_isolates_failures(omdb_client, omdb_requests, omdb_cache):
+    """A failed movie is reported without aborting the rest of the batch."""
+    imdb_ids = ["tt0000001", "tt_missing", "tt0000002", "tt_error"]
+    response = await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=imdb_ids)
+
+    assert [movie.imdb_id for movie in response.movies] == ["tt0000001", "tt0000002"]
+    assert {failure.imdb_id: failure.status_code for failure in response.failures} == {
+        "tt_missing": 404,
+        "tt_error": 503,
+    }
+    assert len(omdb_requests) == len(imdb_ids)
+    assert all(request.url.params.get("apikey") is not None for request in omdb_requests)
+
+
+@pytest.mark.asyncio
+async def test_get_movies_by_imdb_ids_non_json_bodies(omdb_client, omdb_cache):
+    """Bodies that aren't JSON fail only their own movie."""
+    imdb_ids = ["tt0000001", "tt_bad_gateway", "tt_garbled"]
+    response = await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=imdb_ids)
+
+    assert [movie.imdb_id for movie in response.movies] == ["tt0000001"]
+    assert {failure.imdb_id: failure.status_code for failure in response.failures} == {
+        "tt_bad_gateway": 503,
+        "tt_garbled": 500,
+    }
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency():
+    """No more requests than the concurrency cap are in flight at the same time."""
+    scheduler = RequestScheduler(max_concurrency=2, requests_per_second=0)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request():
+        nonlocal in_flight, max_in_flight
+        async with scheduler.slot():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*[request() for _ in range(10)])
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """Once the burst is consumed the tokens are handed out at the configured rate."""
+    bucket = TokenBucket(rate=100, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_get_movie_by_title_is_cached(omdb_client, omdb_requests, omdb_cache):
+    """Repeated lookups of the same title are served from the cache."""
+    first = await OmdbRepository.get_movie_by_title(title="tt0000001")
+    second = await OmdbRepository.get_movie_by_title(title="tt0000001")
+
+    assert first == second
+    assert len(omdb_requests) == 1
+    assert omdb_cache.memory.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_movie_not_found_is_cached(omdb_client, omdb_requests, omdb_cache):
+    """Not found responses are cached and raise the same exception again."""
+    for _ in range(2):
+        with pytest.raises(OmdbRepositoryNotFoundException):
+            await OmdbRepository.get_movie_by_title(title="tt_missing")
+    assert len(omdb_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(omdb_client, omdb_requests, omdb_cache):
+    """Server errors are not cached, the next lookup goes to OMDB again."""
+    for _ in range(2):
+        response = await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=["tt_error"])
+        assert len(response.failures) == 1
+    assert len(omdb_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_survives_restarts(tmp_path):
+    """Entries stored on disk are found by a new cache using the same file."""
+    path = str(tmp_path / "omdb_cache.sqlite")
+    key = OmdbCache.build_key(query_type="imdb_id", params={"i": "tt0000001"})
+    await OmdbCache(disk_path=path).set(key, {"Response": "True", "Title": "Spiderman"})
+
+    restarted_cache = OmdbCache(disk_path=path)
+    assert await restarted_cache.get(key) == {"Response": "True", "Title": "Spiderman"}
+    assert restarted_cache.stats()["disk"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_lookups_are_coalesced(omdb_client, omdb_requests):
+    """Identical lookups in flight at the same time share one request even without cache."""
+    previous_cache = OmdbRepository.cache
+    OmdbRepository.set_cache(cache=None)
+    try:
+        movies = await asyncio.gather(
+            *[OmdbRepository.get_movie_by_title(title="tt0000001") for _ in range(5)]
+        )
+    finally:
+        OmdbRepository.set_cache(cache=previous_cache)
+    assert len({movie.imdb_id for movie in movies}) == 1
+    assert len(omdb_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(omdb_client, omdb_requests, omdb_cache):
+    """A transient failure is retried and the retry succeeds."""
+    OmdbRepository.set_resilience(
+        retry_policy=RetryPolicy(max_retries=2, backoff_base=0.001), breaker=CircuitBreaker()
+    )
+    response = await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=["tt_flaky"])
+
+    assert [movie.imdb_id for movie in response.movies] == ["tt_flaky"]
+    assert len(omdb_requests) == 2
+    assert OmdbRepository.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retried_request_counts_as_one_failure(omdb_client, omdb_requests, omdb_cache):
+    """The attempts of a request that fails after its retries open the breaker only once."""
+    OmdbRepository.set_resilience(
+        retry_policy=RetryPolicy(max_retries=2, backoff_base=0.001),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+    with pytest.raises(OmdbRepositoryUnavailableException):
+        await OmdbRepository.get_movie_by_title(title="tt_error")
+
+    assert len(omdb_requests) == 3
+    assert OmdbRepository.breaker.consecutive_failures == 1
+    assert OmdbRepository.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast(omdb_client, omdb_requests, omdb_cache):
+    """Once the breaker opens the requests fail without reaching OMDB."""
+    OmdbRepository.set_resilience(
+        retry_policy=RetryPolicy(max_retries=0),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+    await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=["tt_error", "tt_error_2"])
+    assert OmdbRepository.status()["circuit_breaker"]["state"] == CircuitBreaker.OPEN
+
+    with pytest.raises(OmdbRepositoryUnavailableException):
+        await OmdbRepository.get_movie_by_title(title="tt0000001")
+    assert len(omdb_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_serves_stale_cache(omdb_client, omdb_requests, omdb_cache):
+    """While the breaker is open expired cached responses are served."""
+    omdb_cache.ttl = 0.001
+    movie = await OmdbRepository.get_movie_by_title(title="tt0000001")
+    await asyncio.sleep(0.01)
+    OmdbRepository.breaker.record_failure()
+    OmdbRepository.breaker.failure_threshold = 1
+    OmdbRepository.breaker.record_failure()
+
+    assert await OmdbRepository.get_movie_by_title(title="tt0000001") == movie
+    assert len(omdb_requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open_trial_closes_it():
+    """After the reset timeout a successful trial closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    await asyncio.sleep(0.02)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_hedged(omdb_client, omdb_requests, omdb_cache):
+    """A duplicate request is sent when the first one is slow, and the fastest wins."""
+    OmdbRepository.set_resilience(
+        retry_policy=RetryPolicy(max_retries=0, hedge_delay=0.01), breaker=CircuitBreaker()
+    )
+    start = time.monotonic()
+    response = await OmdbRepository.get_movies_by_imdb_ids(imdb_ids=["tt_slow"])
+
+    assert [movie.imdb_id for movie in response.movies] == ["tt_slow"]
+    assert len(omdb_requests) == 2
+    assert time.monotonic() - start < 0.5
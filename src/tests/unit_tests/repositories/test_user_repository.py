@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from repositories.database.user import UserDatabaseRepository
+
+
+@pytest.mark.asyncio
+async def test_revoke_tokens_uses_the_clock_of_the_tokens():
+    """The revocation time is compared with iat, so both come from the clock of the app."""
+    revoked_after = datetime.now(timezone.utc)
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=1))
+    )
+
+    assert await UserDatabaseRepository.revoke_tokens(session=session, username="demo_user")
+
+    statement = session.execute.await_args.args[0]
+    tokens_valid_after = statement.compile().params["tokens_valid_after"]
+    assert revoked_after <= tokens_valid_after <= datetime.now(timezone.utc)
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import status
+
+from tests.unit_tests.fixtures.client import (
+    override_get_user_admin,
+    override_get_user_regular,
+    override_session_dependency,
+    mock_session,
+    fake_regular_user,
+    fake_admin_user,
+    fake_client_admin_user,
+    fake_client_regular_user,
+    fake_client_without_user,
+)
+
+STATUS_PATHS = ["/omdb", "/database", "/cache", "/passwords"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", STATUS_PATHS)
+async def test_status_admin_user(fake_client_admin_user, path):
+    """Admin users are authorized to read the status of the dependencies."""
+    response = await fake_client_admin_user.get(path)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", STATUS_PATHS)
+async def test_status_forbidden_user(fake_client_regular_user, path):
+    """A regular user is not authorized to read the status of the dependencies."""
+    response = await fake_client_regular_user.get(path)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", STATUS_PATHS)
+async def test_status_without_user(fake_client_without_user, path):
+    """Unauthenticated users cant read the status of the dependencies."""
+    response = await fake_client_without_user.get(path)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
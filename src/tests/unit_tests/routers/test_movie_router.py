@@ -1,6 +1,12 @@
+import math
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi import status
 
+from core.versions import catalog_versions
+from exceptions.movie_exceptions import MovieAlreadyExistsException
+from schemas.shared.movie_filter import MovieFilter, MovieSort
 from schemas.shared.pagination_filter import Pagination
 from tests.unit_tests.fixtures.client import (
     override_get_user_admin,
@@ -23,8 +29,11 @@ from tests.unit_tests.fixtures.movie_router import (
     mock_insert_movie_by_title,
 )
 
+
 @pytest.mark.asyncio
-async def test_delete_movie_ok(fake_client_admin_user, mock_session, mock_delete_movie, mock_movie_id):
+async def test_delete_movie_ok(
+    fake_client_admin_user, mock_session, mock_delete_movie, mock_movie_id
+):
     """Admin users are authorized to use this endpoint."""
     response = await fake_client_admin_user.delete(f"/api/v1/movies/{mock_movie_id}")
     mock_delete_movie.assert_awaited_once_with(session=mock_session, id=mock_movie_id)
@@ -32,7 +41,9 @@ async def test_delete_movie_ok(fake_client_admin_user, mock_session, mock_delete
 
 
 @pytest.mark.asyncio
-async def test_delete_movie_forbidden_user(fake_client_regular_user, mock_delete_movie, mock_movie_id):
+async def test_delete_movie_forbidden_user(
+    fake_client_regular_user, mock_delete_movie, mock_movie_id
+):
     """A regular user is not authorized to use this endpoint."""
     response = await fake_client_regular_user.delete(f"/api/v1/movies/{mock_movie_id}")
     mock_delete_movie.assert_not_awaited()
@@ -62,6 +73,70 @@ async def test_get_single_movie(
     assert response.json() == mock_single_movie_response.model_dump(mode="json")
 
 
+@pytest.mark.asyncio
+async def test_get_single_movie_not_modified(
+    fake_client_regular_user, mock_get_single_movie, mock_movie_id
+):
+    """A client with the current ETag gets a 304 without reading the movie, until it changes."""
+    response = await fake_client_regular_user.get(f"/api/v1/movies/{mock_movie_id}")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    headers = {"If-None-Match": etag}
+    response = await fake_client_regular_user.get(
+        f"/api/v1/movies/{mock_movie_id}", headers=headers
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    mock_get_single_movie.assert_awaited_once()
+
+    catalog_versions.bump(movie_ids=[mock_movie_id])
+    response = await fake_client_regular_user.get(
+        f"/api/v1/movies/{mock_movie_id}", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_movies_not_modified(fake_client_regular_user, mock_get_movies):
+    response = await fake_client_regular_user.get("/api/v1/movies")
+    headers = {"If-None-Match": response.headers["ETag"]}
+
+    response = await fake_client_regular_user.get("/api/v1/movies", headers=headers)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    mock_get_movies.assert_awaited_once()
+
+    catalog_versions.bump(movie_ids=[])
+    response = await fake_client_regular_user.get("/api/v1/movies", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_no_etag_while_the_replicas_may_lag(
+    monkeypatch, fake_client_regular_user, mock_get_movies, mock_get_single_movie, mock_movie_id
+):
+    """
+    Right after a write a replica may serve the previous version, so it isn't sent with an ETag
+    the client would keep revalidating, and a previous ETag isn't answered with a 304.
+    """
+    monkeypatch.setattr("core.deps.REPLICATION_LAG", 60)
+    monkeypatch.setattr(catalog_versions, "bumped_at", -math.inf)
+    response = await fake_client_regular_user.get(f"/api/v1/movies/{mock_movie_id}")
+    headers = {"If-None-Match": response.headers["ETag"]}
+
+    catalog_versions.bump(movie_ids=[mock_movie_id])
+    for path in ["/api/v1/movies", f"/api/v1/movies/{mock_movie_id}"]:
+        response = await fake_client_regular_user.get(path, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response.headers
+
+    monkeypatch.setattr(catalog_versions, "bumped_at", catalog_versions.bumped_at - 60)
+    response = await fake_client_regular_user.get(f"/api/v1/movies/{mock_movie_id}")
+    assert "ETag" in response.headers
+
+
 @pytest.mark.asyncio
 async def test_get_single_movie_without_user(
     fake_client_without_user, mock_get_single_movie, mock_movie_id
@@ -105,12 +180,72 @@ async def test_get_movies(
         params["page_size"] = page_size
     response = await fake_client_regular_user.get(f"/api/v1/movies", params=params)
     mock_get_movies.assert_awaited_once_with(
-        session=mock_session, title=title, pagination=expected_pagination
+        session=mock_session,
+        title=title,
+        pagination=expected_pagination,
+        search=None,
+        filters=None,
+        sort=None,
     )
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == mock_get_movies_response.model_dump(mode="json")
 
 
+@pytest.mark.asyncio
+async def test_get_movies_with_filters_and_sort(
+    fake_client_regular_user, mock_session, mock_get_movies
+):
+    params = {
+        "year_from": 2000,
+        "genre": "Sci-Fi",
+        "director": "Jane Doe",
+        "min_metascore": 60,
+        "order_by": "metascore",
+        "order_type": "desc",
+    }
+    response = await fake_client_regular_user.get("/api/v1/movies", params=params)
+    mock_get_movies.assert_awaited_once_with(
+        session=mock_session,
+        title=None,
+        pagination=Pagination(page=1, page_size=10),
+        search=None,
+        filters=MovieFilter(year_from=2000, genre="sci-fi", director="jane doe", min_metascore=60),
+        sort=MovieSort(order_by="metascore", order_type="desc"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_get_movies_with_invalid_sort(fake_client_regular_user, mock_get_movies):
+    params = {"order_by": "plot"}
+    response = await fake_client_regular_user.get("/api/v1/movies", params=params)
+    mock_get_movies.assert_not_awaited()
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("facet", ["genre", "director", "actor"])
+@pytest.mark.parametrize("value", ["   ", "x" * 201])
+@pytest.mark.asyncio
+async def test_get_movies_with_invalid_facet(
+    fake_client_regular_user, mock_get_movies, facet, value
+):
+    """Blank or too long genres and people are rejected as any other invalid parameter."""
+    params = {facet: value}
+    response = await fake_client_regular_user.get("/api/v1/movies", params=params)
+    mock_get_movies.assert_not_awaited()
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("search", ["   ", "x" * 201])
+@pytest.mark.asyncio
+async def test_get_movies_with_invalid_search(fake_client_regular_user, mock_get_movies, search):
+    """Blank or too long terms are rejected as any other invalid parameter."""
+    params = {"search": search}
+    response = await fake_client_regular_user.get("/api/v1/movies", params=params)
+    mock_get_movies.assert_not_awaited()
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.asyncio
 async def test_get_movies_without_user(fake_client_without_user, mock_get_movies):
     """Unauthenticated users cant access this endpoint"""
@@ -122,18 +257,38 @@ async def test_get_movies_without_user(fake_client_without_user, mock_get_movies
 
 @pytest.mark.asyncio
 async def test_insert_movie_by_title(
-    fake_client_regular_user, mock_insert_movie_by_title, mock_single_movie_response, mock_session
+    monkeypatch, fake_client_regular_user, mock_insert_movie_by_title, mock_single_movie_response
 ):
-    """Any authenticated user can access this endpoint"""
+    """Any authenticated user can access this endpoint, its next reads go to the primary."""
+    mock_mark_write = MagicMock()
+    monkeypatch.setattr("routers.movie.replica_router.mark_write", mock_mark_write)
     body = {"title": "The Avengers"}
     response = await fake_client_regular_user.post(f"/api/v1/movies", json=body)
-    mock_insert_movie_by_title.assert_awaited_once_with(session=mock_session, title=body["title"])
+    mock_insert_movie_by_title.assert_awaited_once_with(title=body["title"])
+    mock_mark_write.assert_called_once_with("127.0.0.1")
     assert response.status_code == status.HTTP_201_CREATED
     assert response.json() == mock_single_movie_response.model_dump(mode="json")
 
 
 @pytest.mark.asyncio
-async def test_insert_movie_by_title_without_user(fake_client_without_user, mock_insert_movie_by_title):
+async def test_insert_movie_by_title_failed_reads_from_the_primary(
+    monkeypatch, fake_client_regular_user, mock_insert_movie_by_title
+):
+    """A failed insert may have waited for a shared one that wrote, its next reads go to the primary."""
+    mock_mark_write = MagicMock()
+    monkeypatch.setattr("routers.movie.replica_router.mark_write", mock_mark_write)
+    mock_insert_movie_by_title.side_effect = MovieAlreadyExistsException(
+        detail={"title": "Avengers"}
+    )
+    response = await fake_client_regular_user.post("/api/v1/movies", json={"title": "Avengers"})
+    mock_mark_write.assert_called_once_with("127.0.0.1")
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+async def test_insert_movie_by_title_without_user(
+    fake_client_without_user, mock_insert_movie_by_title
+):
     """Unauthenticated users cant access this endpoint"""
     params = {}
     response = await fake_client_without_user.post(f"/api/v1/movies", params=params)
@@ -0,0 +1,115 @@
+import pytest
+from pydantic import ValidationError
+
+from schemas.responses.omdb import (
+    MovieImdbResponse,
+    parse_runtime,
+    parse_box_office,
+    parse_rating_score,
+)
+from schemas.shared.movie import MovieCreate
+from tests.unit_tests.fixtures.omdb_repository import build_movie_body
+
+
+def with_changes(**changes) -> dict:
+    body = build_movie_body("tt4154796")
+    body.update(changes)
+    return body
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        build_movie_body("tt0100669"),
+        with_changes(Released="26 Apr 2019", Metascore="78", imdbVotes="1,339,749"),
+        with_changes(Released="4 May 2012", imdbRating="8.4", BoxOffice="$858,373,000"),
+        with_changes(Released="04 may 2012"),
+        with_changes(Released="", Metascore="", imdbRating=""),
+        with_changes(Ratings=[], Rated=None, Plot="N/A"),
+        with_changes(Response="True", totalSeasons="3"),
+    ],
+)
+def test_from_omdb_matches_model_validate(body):
+    """The fast path builds exactly the same model as the validators."""
+    fast = MovieImdbResponse.from_omdb(body)
+    validated = MovieImdbResponse.model_validate(body)
+    assert fast == validated
+    assert fast.model_dump() == validated.model_dump()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"Response": "False", "Error": "Movie not found!"},
+        with_changes(Year="N/A"),
+        with_changes(Year="2012–2015"),
+        with_changes(Released="31 Feb 2012"),
+        with_changes(Title=None),
+        with_changes(Ratings=[{"Source": "Metacritic"}]),
+    ],
+)
+def test_from_omdb_raises_like_model_validate(body):
+    """Invalid payloads raise the same validation error."""
+    with pytest.raises(ValidationError) as validated_error:
+        MovieImdbResponse.model_validate(body)
+    with pytest.raises(ValidationError) as fast_error:
+        MovieImdbResponse.from_omdb(body)
+    assert [(error["type"], error["loc"], error["msg"]) for error in fast_error.value.errors()] == [
+        (error["type"], error["loc"], error["msg"]) for error in validated_error.value.errors()
+    ]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("142 min", 142),
+        ("1 h 30 min", 90),
+        ("2h", 120),
+        ("1,200 min", 1200),
+        ("N/A", None),
+        (None, None),
+    ],
+)
+def test_parse_runtime(value, expected):
+    assert parse_runtime(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("$623,357,910", 62335791000),
+        ("$12.50", 1250),
+        ("€1,000", None),
+        ("$", None),
+        (None, None),
+    ],
+)
+def test_parse_box_office(value, expected):
+    assert parse_box_office(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("8.0/10", 80.0),
+        ("94%", 94.0),
+        ("69/100", 69.0),
+        ("7/0", None),
+        ("12/10", None),
+        ("N/A", None),
+    ],
+)
+def test_parse_rating_score(value, expected):
+    assert parse_rating_score(value) == expected
+
+
+def test_movie_create_parses_the_numeric_columns():
+    """The movies stored from OMDB carry the parsed values of their text columns."""
+    body = with_changes(Runtime="181 min", BoxOffice="$858,373,000")
+    movie = MovieCreate.model_validate(MovieImdbResponse.from_omdb(body).model_dump())
+
+    assert movie.runtime_minutes == 181
+    assert movie.box_office_cents == 85837300000
+    assert [rating.score for rating in movie.ratings] == [
+        parse_rating_score(rating["Value"]) for rating in body["Ratings"]
+    ]
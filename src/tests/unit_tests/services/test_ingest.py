@@ -0,0 +1,68 @@
+import pytest
+
+from services.ingest import IngestPipeline
+from tests.unit_tests.fixtures.client import mock_session
+from tests.unit_tests.fixtures.ingest import (
+    mock_movie_database_repository_bulk_insert,
+    mock_movie_database_repository_get_existing_imdb_ids,
+)
+from tests.unit_tests.fixtures.omdb_repository import (
+    omdb_client,
+    omdb_requests,
+    omdb_cache,
+    omdb_resilience,
+)
+
+
+@pytest.mark.asyncio
+async def test_ingest_pipeline_writes_in_batches(
+    mock_session,
+    omdb_client,
+    omdb_cache,
+    mock_movie_database_repository_bulk_insert,
+    mock_movie_database_repository_get_existing_imdb_ids,
+):
+    """Every search result is fetched and written in batches of the configured size."""
+    report = await IngestPipeline(session=mock_session, fetch_workers=3, batch_size=10).run(
+        search_terms=["Avengers"]
+    )
+
+    batches = [
+        call.kwargs["movies"] for call in mock_movie_database_repository_bulk_insert.await_args_list
+    ]
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert sorted(movie.imdb_id for batch in batches for movie in batch) == [
+        f"tt{number:07d}" for number in range(25)
+    ]
+    assert [stage.items for stage in report.stages] == [25, 25, 25, 25]
+    assert report.inserted == 25
+    assert report.failures == []
+
+
+@pytest.mark.asyncio
+async def test_ingest_pipeline_skips_duplicated_and_stored_movies(
+    mock_session,
+    omdb_client,
+    omdb_requests,
+    omdb_cache,
+    mock_movie_database_repository_bulk_insert,
+    mock_movie_database_repository_get_existing_imdb_ids,
+):
+    """Only the movies that are neither duplicated nor stored are fetched from OMDB."""
+    stored = {f"tt{number:07d}" for number in range(20)}
+    mock_movie_database_repository_get_existing_imdb_ids.side_effect = lambda session, imdb_ids: (
+        stored.intersection(imdb_ids)
+    )
+
+    report = await IngestPipeline(session=mock_session, fetch_workers=3).run(
+        search_terms=["Avengers", "Avengers"]
+    )
+
+    detail_requests = [
+        request.url.params["i"] for request in omdb_requests if "i" in request.url.params
+    ]
+    assert sorted(detail_requests) == [f"tt{number:07d}" for number in range(20, 25)]
+    assert report.inserted == 5
+    assert report.skipped == 45
+    # One query per search page with new imdb_ids
+    assert mock_movie_database_repository_get_existing_imdb_ids.await_count == 3
@@ -0,0 +1,144 @@
+import pytest
+
+from core.cache import MemoryCacheBackend, RedisCacheBackend
+from core.versions import CatalogVersions
+from schemas.responses.movie import MoviesResponse
+from schemas.shared.movie import MovieGet
+from schemas.shared.pagination_filter import Pagination
+from services.movie import MovieService
+from services.movie_cache import MovieCache
+from tests.unit_tests.fixtures.client import mock_session
+from tests.unit_tests.fixtures.movie_cache import fake_redis
+from tests.unit_tests.fixtures.movie_service import (
+    mock_movie_imdb_response,
+    mock_movie_to_create,
+    mock_movie_from_database,
+    mock_movie_database_repository_get,
+    mock_movie_database_repository_get_all_paginated,
+    mock_get_movies_response,
+)
+
+
+@pytest.fixture(scope="function")
+def versions(monkeypatch):
+    """Cache of the movie service keyed by versions of its own."""
+    versions = CatalogVersions()
+    monkeypatch.setattr(
+        MovieService,
+        "cache",
+        MovieCache(backend=MemoryCacheBackend(max_entries=100), versions=versions),
+    )
+    return versions
+
+
+@pytest.mark.asyncio
+async def test_get_single_movie_is_cached_until_the_movie_changes(
+    mock_session, mock_movie_database_repository_get, versions
+):
+    """Only a write to the movie itself invalidates it."""
+    first = await MovieService.get_single_movie(session=mock_session, id=1)
+    second = await MovieService.get_single_movie(session=mock_session, id=1)
+    assert first == second
+    assert mock_movie_database_repository_get.await_count == 1
+
+    versions.bump(movie_ids=[])
+    await MovieService.get_single_movie(session=mock_session, id=1)
+    assert mock_movie_database_repository_get.await_count == 1
+
+    versions.bump(movie_ids=[1])
+    await MovieService.get_single_movie(session=mock_session, id=1)
+    assert mock_movie_database_repository_get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_movies_is_cached_until_the_catalog_changes(
+    mock_session,
+    mock_movie_database_repository_get_all_paginated,
+    mock_get_movies_response,
+    versions,
+):
+    pagination = Pagination(page=1, page_size=10)
+
+    for _ in range(2):
+        response = await MovieService.get_movies(
+            session=mock_session, title="Batman", pagination=pagination
+        )
+        assert response == mock_get_movies_response
+    assert mock_movie_database_repository_get_all_paginated.await_count == 1
+
+    await MovieService.get_movies(
+        session=mock_session, title="Batman", pagination=Pagination(page=2, page_size=10)
+    )
+    assert mock_movie_database_repository_get_all_paginated.await_count == 2
+
+    versions.bump(movie_ids=[])
+    await MovieService.get_movies(session=mock_session, title="Batman", pagination=pagination)
+    assert mock_movie_database_repository_get_all_paginated.await_count == 3
+
+    stats = await MovieService.cache.stats()
+    assert stats["movies"] == {"hits": 1, "misses": 3, "hit_ratio": 0.25}
+    assert stats["storage"]["entries"] == 3
+    assert stats["storage"]["memory_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bypassed_while_the_versions_are_out_of_date(
+    mock_session, mock_movie_database_repository_get, versions
+):
+    versions.synced = False
+
+    await MovieService.get_single_movie(session=mock_session, id=1)
+    await MovieService.get_single_movie(session=mock_session, id=1)
+
+    assert mock_movie_database_repository_get.await_count == 2
+    assert MovieService.cache.bypasses == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_backend(fake_redis, mock_movie_from_database):
+    cache = MovieCache(
+        backend=RedisCacheBackend(client=fake_redis, prefix="test:"), versions=CatalogVersions()
+    )
+    movie = MovieGet.model_validate(mock_movie_from_database)
+    key = cache.movie_key(movie.id)
+
+    await cache.set(key, movie)
+
+    assert await cache.get(key, MovieGet) == movie
+    assert await cache.get(cache.page_key(title=None), MoviesResponse) is None
+    assert all(name.startswith("test:") for name in fake_redis.values)
+    stats = await cache.stats()
+    assert stats["movie"]["hit_ratio"] == 1
+    assert stats["storage"]["entries"] == 1
+    await cache.clear()
+    assert not fake_redis.values
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_unavailable(fake_redis):
+    """An unavailable server makes every read a miss instead of failing the request."""
+    backend = RedisCacheBackend(client=fake_redis, prefix="test:")
+    fake_redis.available = False
+
+    await backend.set("key", b"value", ttl=60)
+    await backend.clear()
+
+    assert await backend.get("key") is None
+    assert backend.failures == 3
+
+
+@pytest.mark.asyncio
+async def test_reads_right_after_a_write_are_not_stored(mock_movie_from_database):
+    """A replica may still return the data of before the write, it's not stored."""
+    versions = CatalogVersions()
+    cache = MovieCache(
+        backend=MemoryCacheBackend(max_entries=10), versions=versions, replication_lag=60
+    )
+    movie = MovieGet.model_validate(mock_movie_from_database)
+    versions.bump(movie_ids=[movie.id])
+    key = cache.movie_key(movie.id)
+
+    await cache.set(key, movie)
+
+    assert await cache.get(key, MovieGet) is None
+    assert (await cache.stats())["lagging_stores"] == 1
@@ -1,8 +1,12 @@
+import asyncio
+
 import pytest
 from sqlalchemy.exc import IntegrityError
 
 from config import IMDB_ID_UNIQUE_CONSTRAINT
 from exceptions.movie_exceptions import MovieNotFoundException, MovieAlreadyExistsException
+from exceptions.pagination_exceptions import InvalidCursorException
+from schemas.shared.movie_filter import MovieFilter, MovieSort
 from schemas.shared.pagination_filter import Pagination
 from services.movie import MovieService
 from tests.unit_tests.fixtures.client import mock_session
@@ -14,16 +18,18 @@ from tests.unit_tests.fixtures.movie_service import (
     mock_movie_imdb_response,
     mock_movie_from_database,
     mock_movie_database_repository_get_all_paginated,
+    mock_movie_database_repository_get_page_after,
     mock_get_movies_response,
     mock_movie_database_repository_get,
     mock_get_single_movie_movie_response,
     mock_movie_database_repository_delete,
+    mock_get_session,
 )
 
 
 @pytest.mark.asyncio
 async def test_insert_movie_by_title(
-    mock_session,
+    mock_get_session,
     mock_omdb_repository_get_movie_by_title,
     mock_movie_database_repository_create,
     mock_movie_to_create,
@@ -31,30 +37,30 @@ async def test_insert_movie_by_title(
 ):
     """Checks that this service method works like intended."""
     title = "Batman"
-    response = await MovieService.insert_movie_by_title(session=mock_session, title=title)
+    response = await MovieService.insert_movie_by_title(title=title)
     mock_omdb_repository_get_movie_by_title.assert_awaited_once_with(title=title)
     mock_movie_database_repository_create.assert_awaited_once_with(
-        session=mock_session, movie=mock_movie_to_create
+        session=mock_get_session, movie=mock_movie_to_create
     )
     assert response == mock_insert_by_title_response
 
 
 @pytest.mark.asyncio
 async def test_insert_movie_by_title_movie_not_found(
-    mock_session, mock_omdb_repository_get_movie_by_title, mock_movie_database_repository_create
+    mock_omdb_repository_get_movie_by_title, mock_movie_database_repository_create
 ):
     """Checks that MovieNotFoundException is raised when omdb_repository returns nothing.."""
     title = "Batman"
     mock_omdb_repository_get_movie_by_title.return_value = None
     with pytest.raises(MovieNotFoundException):
-        _ = await MovieService.insert_movie_by_title(session=mock_session, title=title)
+        _ = await MovieService.insert_movie_by_title(title=title)
     mock_omdb_repository_get_movie_by_title.assert_awaited_once_with(title=title)
     mock_movie_database_repository_create.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_insert_movie_by_title_already_exists(
-    mock_session,
+    mock_get_session,
     mock_omdb_repository_get_movie_by_title,
     mock_movie_database_repository_create,
     mock_movie_to_create,
@@ -68,11 +74,33 @@ async def test_insert_movie_by_title_already_exists(
         orig=Exception(IMDB_ID_UNIQUE_CONSTRAINT),
     )
     with pytest.raises(MovieAlreadyExistsException):
-        _ = await MovieService.insert_movie_by_title(session=mock_session, title=title)
+        _ = await MovieService.insert_movie_by_title(title=title)
     mock_omdb_repository_get_movie_by_title.assert_awaited_once_with(title=title)
     mock_movie_database_repository_create.assert_awaited_once_with(
-        session=mock_session, movie=mock_movie_to_create
+        session=mock_get_session, movie=mock_movie_to_create
+    )
+
+
+@pytest.mark.asyncio
+async def test_insert_movie_by_title_concurrent_inserts_are_coalesced(
+    mock_get_session,
+    mock_omdb_repository_get_movie_by_title,
+    mock_movie_database_repository_create,
+    mock_insert_by_title_response,
+):
+    """Concurrent inserts of the same movie share one database insert."""
+
+    async def slow_create(session, movie):
+        await asyncio.sleep(0.01)
+        return mock_insert_by_title_response
+
+    mock_movie_database_repository_create.side_effect = slow_create
+    title = "Batman"
+    responses = await asyncio.gather(
+        *[MovieService.insert_movie_by_title(title=title) for _ in range(3)]
     )
+    mock_movie_database_repository_create.assert_awaited_once()
+    assert responses == [mock_insert_by_title_response] * 3
 
 
 @pytest.mark.asyncio
@@ -87,12 +115,83 @@ async def test_get_movies(
     )
     limit, offset = MovieService._calculate_limit_offset(pagination=pagination)
     mock_movie_database_repository_get_all_paginated.assert_awaited_once_with(
-        session=mock_session, title=title, limit=limit, offset=offset
+        session=mock_session,
+        title=title,
+        limit=limit,
+        offset=offset,
+        search=None,
+        filters=None,
+        sort=None,
     )
 
     assert response == mock_get_movies_response
 
 
+@pytest.mark.asyncio
+async def test_get_movies_with_cursor(mock_session, mock_movie_database_repository_get_page_after):
+    """Following next_cursor walks through every movie once."""
+    ids: list[int] = []
+    cursor = ""
+    while cursor is not None:
+        pagination = Pagination(page=None, page_size=2, cursor=cursor)
+        response = await MovieService.get_movies(
+            session=mock_session, title=None, pagination=pagination
+        )
+        ids.extend(movie.id for movie in response.movies)
+        cursor = response.next_cursor
+        assert response.total == 3
+
+    assert ids == [1, 2, 3]
+    assert mock_movie_database_repository_get_page_after.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_movies_with_filters_and_sort(
+    mock_session, mock_movie_database_repository_get_all_paginated
+):
+    """The sort is reported in the response, only the title order gets a cursor."""
+    filters = MovieFilter(genre="drama")
+    sort = MovieSort(order_by="year", order_type="desc")
+    pagination = Pagination(page=1, page_size=1)
+
+    response = await MovieService.get_movies(
+        session=mock_session, title=None, pagination=pagination, filters=filters, sort=sort
+    )
+
+    mock_movie_database_repository_get_all_paginated.assert_awaited_once_with(
+        session=mock_session,
+        title=None,
+        limit=1,
+        offset=0,
+        search=None,
+        filters=filters,
+        sort=sort,
+    )
+    assert (response.order_by, response.order_type) == ("year", "desc")
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_movies_with_cursor_and_sort(mock_session):
+    """Cursors only follow the ascending order of titles."""
+    with pytest.raises(InvalidCursorException):
+        pagination = Pagination(page=None, page_size=2, cursor="")
+        await MovieService.get_movies(
+            session=mock_session,
+            title=None,
+            pagination=pagination,
+            sort=MovieSort(order_by="imdb_rating", order_type="desc"),
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_movies_with_invalid_cursor(mock_session):
+    """A cursor not given by the API is rejected."""
+    with pytest.raises(InvalidCursorException):
+        pagination = Pagination(page=None, page_size=2, cursor="bad")
+        await MovieService.get_movies(session=mock_session, title=None, pagination=pagination)
+
+
 @pytest.mark.asyncio
 async def test_get_single_movie(
     mock_session, mock_movie_database_repository_get, mock_get_single_movie_movie_response
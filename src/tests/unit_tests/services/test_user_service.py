@@ -0,0 +1,37 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from core.deps import principal_cache
+from schemas.shared.user import UserData
+from services.user import UserService
+from tests.unit_tests.fixtures.client import mock_session
+
+
+@pytest.mark.asyncio
+async def test_revoke_tokens_forgets_the_cached_user(mock_session, monkeypatch):
+    revoke_tokens = AsyncMock(return_value=True)
+    monkeypatch.setattr(
+        "repositories.database.user.UserDatabaseRepository.revoke_tokens", revoke_tokens
+    )
+    user = UserData(username="demo_user", hashed_password="hash", is_admin=False)
+    principal_cache.set("demo_user", user, ttl=60)
+
+    await UserService.revoke_tokens(session=mock_session, username="demo_user")
+
+    revoke_tokens.assert_awaited_once_with(session=mock_session, username="demo_user")
+    assert principal_cache.get("demo_user") is None
+
+
+@pytest.mark.asyncio
+async def test_revoke_tokens_user_not_found(mock_session, monkeypatch):
+    monkeypatch.setattr(
+        "repositories.database.user.UserDatabaseRepository.revoke_tokens",
+        AsyncMock(return_value=False),
+    )
+
+    with pytest.raises(HTTPException) as error:
+        await UserService.revoke_tokens(session=mock_session, username="unknown")
+
+    assert error.value.status_code == 404